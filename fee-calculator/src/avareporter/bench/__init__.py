@@ -0,0 +1,21 @@
+from avareporter.bench.chain import FakeBridgeChain, FakeResource, build_chain, build_bridge_pair
+from avareporter.bench.server import FakeRPCServer, FakeRPCProcess, RPCStats
+from avareporter.bench.suite import BenchmarkResult, measure, monitor_state, run_size, run_benchmarks, \
+    format_results, DEFAULT_SIZES
+
+__all__ = [
+    'FakeBridgeChain',
+    'FakeResource',
+    'build_chain',
+    'build_bridge_pair',
+    'FakeRPCServer',
+    'FakeRPCProcess',
+    'RPCStats',
+    'BenchmarkResult',
+    'measure',
+    'monitor_state',
+    'run_size',
+    'run_benchmarks',
+    'format_results',
+    'DEFAULT_SIZES',
+]
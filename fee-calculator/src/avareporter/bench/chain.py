@@ -0,0 +1,336 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from eth_abi import decode_abi, encode_abi
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector, to_checksum_address
+from hexbytes import HexBytes
+from web3 import Web3
+
+from avareporter.abis import bridge_abi, erc20_abi, handler_abi, multicall_abi
+
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+ZERO_BYTES32 = b'\x00' * 32
+ZERO_BYTES32_HEX = HexBytes(ZERO_BYTES32).hex()
+
+# Proposal statuses, as stored by the bridge contract
+ACTIVE = 1
+PASSED = 2
+EXECUTED = 3
+
+
+def _address(label: str) -> str:
+    return to_checksum_address(Web3.keccak(text=label)[-20:])
+
+
+def _abi_types(params: List[dict]) -> List[str]:
+    types = []
+    for param in params:
+        if param['type'].startswith('tuple'):
+            types.append(f"({','.join(_abi_types(param['components']))}){param['type'][5:]}")
+        else:
+            types.append(param['type'])
+    return types
+
+
+def _event_topic(abi: List[dict], name: str) -> str:
+    event = next(e for e in abi if e.get('type') == 'event' and e['name'] == name)
+    return HexBytes(event_abi_to_log_topic(event)).hex()
+
+
+def _int_topic(value: int) -> str:
+    return HexBytes(value.to_bytes(32, 'big')).hex()
+
+
+DEPOSIT_TOPIC = _event_topic(bridge_abi, 'Deposit')
+PROPOSAL_EVENT_TOPIC = _event_topic(bridge_abi, 'ProposalEvent')
+PROPOSAL_VOTE_TOPIC = _event_topic(bridge_abi, 'ProposalVote')
+
+
+@dataclass
+class FakeResource:
+    """
+    A bridged ERC20 token. The token is native to (locked on) the chain with ``native_chain_id`` and minted on the
+    other one
+    """
+    resource_id: bytes
+    native_chain_id: int
+    name: str
+    symbol: str
+    decimals: int = 18
+
+
+def default_resources(count: int, native_chain_id: int = 1) -> List[FakeResource]:
+    return [
+        FakeResource(resource_id=Web3.keccak(text=f'resource:{i}'), native_chain_id=native_chain_id,
+                     name=f'Token {i}', symbol=f'TK{i}')
+        for i in range(count)
+    ]
+
+
+class FakeBridgeChain:
+    """
+    The synthetic state of a bridge deployment on one chain, computed from deposit nonces instead of stored, so a
+    chain with 100k deposits per direction costs no more memory than one with a thousand.
+
+    Deposit ``n`` (nonces start at 1) of either direction is made in block ``start_block + n`` of its origin chain,
+    and its proposal is voted on and updated in the same block number of the destination chain. The last ``pending``
+    proposals are alternately active and passed, every older one is executed. Token balances and supplies add up
+    once the pending deposits are counted as in flight, so the imbalance check has nothing to report
+
+    Parameters
+    ----------
+    chain_id
+        The bridge chain ID of this chain
+    other_chain_id
+        The bridge chain ID of the other chain
+    outgoing
+        The number of deposits made on this chain towards the other one
+    incoming
+        The number of deposits made on the other chain towards this one
+    resources
+        The bridged tokens, deposits cycle through them
+    start_block
+        The block the bridge was deployed in
+    pending
+        The number of proposals of each direction that are not executed yet
+    """
+
+    def __init__(self, chain_id: int, other_chain_id: int, outgoing: int, incoming: int,
+                 resources: List[FakeResource], start_block: int = 1000, pending: int = 10):
+        self.chain_id = chain_id
+        self.other_chain_id = other_chain_id
+        self.outgoing = outgoing
+        self.incoming = incoming
+        self.resources = resources
+        self.start_block = start_block
+        self.pending = pending
+
+        self.block_number = start_block + max(outgoing, incoming) + 10
+
+        self.bridge_address = _address(f'bridge:{chain_id}')
+        self.handler_address = _address(f'handler:{chain_id}')
+        self.multicall_address = _address(f'multicall:{chain_id}')
+        self.relayer_address = _address('relayer')
+        self.recipient_address = _address('recipient')
+        self.tokens = {_address(f'token:{chain_id}:{r.resource_id.hex()}'): r for r in resources}
+        self._token_by_resource = {r.resource_id: address for address, r in self.tokens.items()}
+
+        self._balances, self._supplies = self._token_amounts()
+
+        self._functions: Dict[Tuple[str, bytes], Tuple[dict, Callable]] = {}
+        self._register(self.bridge_address, bridge_abi, {
+            '_depositCounts': self._deposit_counts,
+            '_depositRecords': self._deposit_record,
+            'getProposal': self._get_proposal,
+            '_resourceIDToHandlerAddress': lambda resource_id: self.handler_address
+            if resource_id in self._token_by_resource else ZERO_ADDRESS,
+        })
+        self._register(self.handler_address, handler_abi, {
+            '_resourceIDToTokenContractAddress': lambda resource_id: self._token_by_resource.get(resource_id,
+                                                                                                 ZERO_ADDRESS),
+        })
+        for address in self.tokens:
+            self._register(address, erc20_abi, {
+                'name': lambda address=address: self.tokens[address].name,
+                'symbol': lambda address=address: self.tokens[address].symbol,
+                'decimals': lambda address=address: self.tokens[address].decimals,
+                'totalSupply': lambda address=address: self._supplies[address],
+                'balanceOf': lambda owner, address=address: self._balances[address] if owner == self.handler_address
+                else 0,
+            })
+        self._register(self.multicall_address, multicall_abi, {
+            'aggregate': self._aggregate,
+        })
+
+    def _register(self, address: str, abi: List[dict], implementations: Dict[str, Callable]):
+        for function in abi:
+            if function.get('type') == 'function' and function['name'] in implementations:
+                selector = function_abi_to_4byte_selector(function)
+                self._functions[(address.lower(), selector)] = (function, implementations[function['name']])
+
+    # Deposits
+
+    def deposit_amount(self, nonce: int) -> int:
+        return (nonce % 97 + 1) * 10 ** 18
+
+    def deposit_resource(self, nonce: int) -> FakeResource:
+        return self.resources[nonce % len(self.resources)]
+
+    def deposit_data(self, nonce: int) -> bytes:
+        # ERC20 deposit data: the amount, the recipient length and the recipient
+        return self.deposit_amount(nonce).to_bytes(32, 'big') + (20).to_bytes(32, 'big') + \
+            HexBytes(self.recipient_address)
+
+    def proposal_status(self, nonce: int, count: int) -> int:
+        if nonce <= count - self.pending:
+            return EXECUTED
+        return ACTIVE if nonce % 2 == 0 else PASSED
+
+    def _token_amounts(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        base = 10 ** 24
+        balances = {address: 0 for address in self.tokens}
+        supplies = {address: base for address in self.tokens}
+
+        locked = {address: base for address in self.tokens}
+        for nonce in range(1, self.outgoing + 1):
+            locked[self._token_by_resource[self.deposit_resource(nonce).resource_id]] += self.deposit_amount(nonce)
+        for nonce in range(1, self.incoming + 1):
+            if self.proposal_status(nonce, self.incoming) == EXECUTED:
+                locked[self._token_by_resource[self.deposit_resource(nonce).resource_id]] -= \
+                    self.deposit_amount(nonce)
+
+        for address, resource in self.tokens.items():
+            if resource.native_chain_id == self.chain_id:
+                # Outgoing deposits are locked in the handler, executed incoming ones are released from it
+                balances[address] = locked[address]
+            else:
+                # Executed incoming deposits are minted, outgoing ones are burned
+                supplies[address] = 2 * base - locked[address]
+
+        return balances, supplies
+
+    # Contract calls
+
+    def _deposit_counts(self, destination_chain_id: int) -> int:
+        return self.outgoing if destination_chain_id == self.other_chain_id else 0
+
+    def _deposit_record(self, nonce: int, destination_chain_id: int) -> bytes:
+        if destination_chain_id != self.other_chain_id or not 1 <= nonce <= self.outgoing:
+            return b''
+        return self.deposit_data(nonce)
+
+    def _get_proposal(self, origin_chain_id: int, nonce: int, data_hash: bytes) -> tuple:
+        if origin_chain_id != self.other_chain_id or not 1 <= nonce <= self.incoming:
+            return ZERO_BYTES32, ZERO_BYTES32, [], [], 0, 0
+
+        return (self.deposit_resource(nonce).resource_id, data_hash, [self.relayer_address], [],
+                self.proposal_status(nonce, self.incoming), self.start_block + nonce)
+
+    def _aggregate(self, calls: List[Tuple[str, bytes]]) -> tuple:
+        return self.block_number, [self.call(target, data) for target, data in calls]
+
+    def call(self, to: str, data: bytes) -> bytes:
+        """
+        Execute an ``eth_call`` against the synthetic state
+
+        Raises
+        ------
+        ValueError
+            When the target has no such function
+        """
+        data = HexBytes(data)
+        entry = self._functions.get((to.lower(), bytes(data[:4])))
+        if entry is None:
+            raise ValueError({'code': -32000, 'message': 'execution reverted'})
+
+        function, implementation = entry
+        args = decode_abi(_abi_types(function['inputs']), bytes(data[4:]))
+        args = [to_checksum_address(a) if isinstance(a, str) and a.startswith('0x') else a for a in args]
+
+        result = implementation(*args)
+        output_types = _abi_types(function['outputs'])
+        if len(output_types) == 1:
+            result = (result,)
+
+        return encode_abi(output_types, result)
+
+    # Blocks and logs
+
+    def block_hash(self, number: int) -> str:
+        return Web3.keccak(text=f'block:{self.chain_id}:{number}').hex()
+
+    def get_block(self, number: int) -> Optional[dict]:
+        if not 0 <= number <= self.block_number:
+            return None
+
+        return {
+            'number': hex(number),
+            'hash': self.block_hash(number),
+            'parentHash': self.block_hash(number - 1) if number > 0 else ZERO_BYTES32_HEX,
+            'timestamp': hex(1600000000 + number * 2),
+            'gasLimit': hex(8000000),
+            'gasUsed': hex(0),
+            'miner': ZERO_ADDRESS,
+            'difficulty': '0x0',
+            'extraData': '0x',
+            'transactions': [],
+            'uncles': [],
+        }
+
+    def _log(self, number: int, index: int, topics: List[str], data: bytes) -> dict:
+        return {
+            'address': self.bridge_address,
+            'topics': topics,
+            'data': HexBytes(data).hex(),
+            'blockNumber': hex(number),
+            'blockHash': self.block_hash(number),
+            'transactionHash': Web3.keccak(text=f'tx:{self.chain_id}:{number}:{index}').hex(),
+            'transactionIndex': hex(index),
+            'logIndex': hex(index),
+            'removed': False,
+        }
+
+    def _block_logs(self, number: int) -> List[dict]:
+        logs = []
+        nonce = number - self.start_block
+
+        if 1 <= nonce <= self.outgoing:
+            logs.append(self._log(number, len(logs), [
+                DEPOSIT_TOPIC,
+                _int_topic(self.other_chain_id),
+                HexBytes(self.deposit_resource(nonce).resource_id).hex(),
+                _int_topic(nonce),
+            ], b''))
+
+        if 1 <= nonce <= self.incoming:
+            resource_id = self.deposit_resource(nonce).resource_id
+            status = self.proposal_status(nonce, self.incoming)
+            logs.append(self._log(number, len(logs), [
+                PROPOSAL_VOTE_TOPIC, _int_topic(self.other_chain_id), _int_topic(nonce), _int_topic(status),
+            ], resource_id))
+            for event_status in range(ACTIVE, status + 1):
+                logs.append(self._log(number, len(logs), [
+                    PROPOSAL_EVENT_TOPIC, _int_topic(self.other_chain_id), _int_topic(nonce),
+                    _int_topic(event_status),
+                ], resource_id + ZERO_BYTES32))
+
+        return logs
+
+    def get_logs(self, from_block: int, to_block: int, address: Any = None,
+                 topics: Optional[List[Any]] = None) -> List[dict]:
+        """
+        The logs of ``[from_block, to_block]`` matching an ``eth_getLogs`` address and topics filter
+        """
+        if address is not None:
+            addresses = [address] if isinstance(address, str) else address
+            if self.bridge_address.lower() not in (a.lower() for a in addresses):
+                return []
+
+        # Only the blocks with a deposit or a proposal have logs
+        from_block = max(from_block, self.start_block + 1)
+        to_block = min(to_block, self.start_block + max(self.outgoing, self.incoming))
+
+        filters = [None if t is None else {t.lower()} if isinstance(t, str) else {x.lower() for x in t}
+                   for t in (topics or [])]
+
+        return [log for number in range(from_block, to_block + 1) for log in self._block_logs(number)
+                if all(f is None or (i < len(log['topics']) and log['topics'][i] in f)
+                       for i, f in enumerate(filters))]
+
+
+def build_chain(chain_id: int, deposits: int, resources: int = 3, pending: int = 10, eth_chain_id: int = 1,
+                ava_chain_id: int = 2) -> FakeBridgeChain:
+    """
+    One side of a consistent Ethereum / Avalanche pair of fake bridge chains with ``deposits`` deposits in each
+    direction. Tokens are native to Ethereum
+    """
+    tokens = default_resources(resources, native_chain_id=eth_chain_id)
+    other_chain_id = ava_chain_id if chain_id == eth_chain_id else eth_chain_id
+
+    return FakeBridgeChain(chain_id, other_chain_id, deposits, deposits, tokens, pending=pending)
+
+
+def build_bridge_pair(deposits: int, resources: int = 3, pending: int = 10, eth_chain_id: int = 1,
+                      ava_chain_id: int = 2) -> Tuple[FakeBridgeChain, FakeBridgeChain]:
+    return (build_chain(eth_chain_id, deposits, resources, pending, eth_chain_id, ava_chain_id),
+            build_chain(ava_chain_id, deposits, resources, pending, eth_chain_id, ava_chain_id))
@@ -0,0 +1,290 @@
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from hexbytes import HexBytes
+
+from avareporter.bench.chain import FakeBridgeChain
+
+
+class _TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens < 1:
+                return False
+
+            self.tokens -= 1
+            return True
+
+
+class RPCStats:
+    """
+    What a fake endpoint served: HTTP requests, JSON-RPC calls by method (``eth_call`` by contract function name)
+    and requests refused by the rate limit
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.rate_limited = 0
+            self.calls: Counter = Counter()
+
+    def record(self, methods: List[str]):
+        with self._lock:
+            self.requests += 1
+            self.calls.update(methods)
+
+    def record_rate_limited(self):
+        with self._lock:
+            self.rate_limited += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'rate_limited': self.rate_limited,
+                'calls': dict(self.calls),
+            }
+
+
+def _block_number(chain: FakeBridgeChain, block: Any) -> int:
+    if block in (None, 'latest', 'pending', 'safe', 'finalized'):
+        return chain.block_number
+    if block == 'earliest':
+        return 0
+    return int(block, 16)
+
+
+class FakeRPCServer:
+    """
+    A local JSON-RPC endpoint serving a ``FakeBridgeChain``, with an optional per-request latency and rate limit.
+    Single and batched requests are supported, ``eth_call`` reaches the bridge, handler, token and Multicall
+    contracts of the chain. Two extra methods, ``fake_stats`` and ``fake_resetStats``, read and reset the served
+    request counts and are not counted themselves
+
+    Parameters
+    ----------
+    chain
+        The synthetic chain state
+    latency
+        Seconds every HTTP request is delayed by
+    rate_limit
+        Requests per second, requests above it are answered with HTTP 429
+    log_range_limit
+        The widest block range ``eth_getLogs`` accepts, wider ranges get a "block range too large" error
+    host
+        The interface to listen on
+    port
+        The port to listen on, 0 picks a free one
+    """
+
+    def __init__(self, chain: FakeBridgeChain, latency: float = 0.0, rate_limit: Optional[float] = None,
+                 log_range_limit: Optional[int] = None, host: str = '127.0.0.1', port: int = 0):
+        self.chain = chain
+        self.latency = latency
+        self.log_range_limit = log_range_limit
+        self.stats = RPCStats()
+        self._bucket = _TokenBucket(rate_limit) if rate_limit else None
+
+        self._methods: Dict[str, Callable] = {
+            'eth_chainId': lambda: hex(chain.chain_id),
+            'net_version': lambda: str(chain.chain_id),
+            'eth_blockNumber': lambda: hex(chain.block_number),
+            'eth_getBlockByNumber': lambda block, full=False: chain.get_block(_block_number(chain, block)),
+            'eth_call': self._eth_call,
+            'eth_getLogs': self._eth_get_logs,
+            'fake_stats': self.stats.as_dict,
+            'fake_resetStats': self.stats.reset,
+        }
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'FakeRPCServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'FakeRPCServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _eth_call(self, transaction: dict, block: Any = 'latest') -> str:
+        return HexBytes(self.chain.call(transaction['to'], HexBytes(transaction.get('data', '0x')))).hex()
+
+    def _eth_get_logs(self, log_filter: dict) -> List[dict]:
+        from_block = _block_number(self.chain, log_filter.get('fromBlock'))
+        to_block = _block_number(self.chain, log_filter.get('toBlock'))
+
+        if self.log_range_limit is not None and to_block - from_block + 1 > self.log_range_limit:
+            raise ValueError({'code': -32005, 'message': f'block range too large, the limit is '
+                                                         f'{self.log_range_limit} blocks'})
+
+        return self.chain.get_logs(from_block, to_block, log_filter.get('address'), log_filter.get('topics'))
+
+    def _method_name(self, request: dict) -> str:
+        if request.get('method') != 'eth_call':
+            return request.get('method', '')
+
+        try:
+            data = HexBytes(request['params'][0]['data'])
+            function, _ = self.chain._functions[(request['params'][0]['to'].lower(), bytes(data[:4]))]
+            return f"eth_call:{function['name']}"
+        except (KeyError, IndexError, ValueError):
+            return 'eth_call'
+
+    def _dispatch(self, request: dict) -> dict:
+        response = {'jsonrpc': '2.0', 'id': request.get('id')}
+
+        method = self._methods.get(request.get('method'))
+        if method is None:
+            response['error'] = {'code': -32601, 'message': f"the method {request.get('method')} does not exist"}
+            return response
+
+        try:
+            response['result'] = method(*request.get('params', []))
+        except ValueError as e:
+            error = e.args[0] if len(e.args) > 0 and isinstance(e.args[0], dict) else {'code': -32000,
+                                                                                         'message': str(e)}
+            response['error'] = error
+
+        return response
+
+    def handle(self, body: bytes) -> Optional[bytes]:
+        """
+        Answer the body of a JSON-RPC HTTP request, None when the request is refused by the rate limit
+        """
+        payload = json.loads(body)
+        calls = payload if isinstance(payload, list) else [payload]
+
+        methods = [c.get('method', '') for c in calls]
+        if not all(m.startswith('fake_') for m in methods):
+            if self._bucket is not None and not self._bucket.take():
+                self.stats.record_rate_limited()
+                return None
+
+            self.stats.record([self._method_name(c) for c in calls])
+
+            if self.latency > 0:
+                time.sleep(self.latency)
+
+        responses = [self._dispatch(c) for c in calls]
+
+        return json.dumps(responses if isinstance(payload, list) else responses[0]).encode('utf-8')
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately, Nagle's algorithm would hold the body back on keep-alive
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                response = server.handle(body)
+
+                if response is None:
+                    response = b'Too Many Requests'
+                    self.send_response(429)
+                else:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+
+                self.send_header('Content-Length', str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, format, *args):
+                logging.getLogger('fake_rpc').debug(format % args)
+
+        return Handler
+
+
+def _serve(chain_factory: Callable[[], FakeBridgeChain], server_kwargs: dict, urls: multiprocessing.Queue):
+    server = FakeRPCServer(chain_factory(), **server_kwargs)
+    urls.put(server.url)
+    server.serve_forever()
+
+
+class FakeRPCProcess:
+    """
+    Runs a ``FakeRPCServer`` in a child process, so the CPU time and memory spent serving requests do not show up
+    in measurements of the client. The served request counts are read through ``fake_stats``
+
+    Parameters
+    ----------
+    chain_factory
+        Builds the chain in the child process, must be picklable
+    server_kwargs
+        The ``FakeRPCServer`` options
+    """
+
+    def __init__(self, chain_factory: Callable[[], FakeBridgeChain], **server_kwargs):
+        self._urls = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve, args=(chain_factory, server_kwargs, self._urls),
+                                                daemon=True)
+        self.url: Optional[str] = None
+
+    def start(self) -> 'FakeRPCProcess':
+        self._process.start()
+        self.url = self._urls.get(timeout=60)
+        return self
+
+    def stop(self):
+        self._process.terminate()
+        self._process.join()
+
+    def __enter__(self) -> 'FakeRPCProcess':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _call(self, method: str) -> Any:
+        response = requests.post(self.url, json={'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': []})
+        response.raise_for_status()
+        return response.json().get('result')
+
+    def stats(self) -> dict:
+        return self._call('fake_stats')
+
+    def reset_stats(self):
+        self._call('fake_resetStats')
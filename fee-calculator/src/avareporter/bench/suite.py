@@ -0,0 +1,226 @@
+import configparser
+import gc
+import logging
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional
+
+from web3 import Web3
+
+from avareporter.abis import bridge_abi
+from avareporter.bench.chain import FakeBridgeChain, build_chain
+from avareporter.bench.server import FakeRPCProcess
+from avareporter.models import TransactionRecord
+from avareporter.rpc import LogScanner, connect, set_rate_limit
+from avareporter.storage import DepositIndex
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    deposits: int
+    wall_time: float
+    peak_memory: Optional[int]
+    rpc_requests: int
+    rpc_calls: Dict[str, Dict[str, int]]
+    rate_limited: int = 0
+    alerts: int = 0
+    error: Optional[str] = None
+
+    def as_dict(self):
+        return asdict(self)
+
+
+class _AlertCounter(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        self.count += 1
+
+
+def measure(name: str, deposits: int, func: Callable[[], None], endpoints: Dict[str, FakeRPCProcess],
+            trace_memory: bool = True) -> BenchmarkResult:
+    """
+    Run ``func`` once and report its wall time, peak Python memory, the requests every fake endpoint served and
+    the alerts it logged. Exceptions are recorded in the result instead of raised
+    """
+    for endpoint in endpoints.values():
+        endpoint.reset_stats()
+
+    # Alerts are counted instead of printed, a benchmark run would otherwise bury the results
+    alert_logger = logging.getLogger('alert')
+    alerts = _AlertCounter()
+    alert_logger.addHandler(alerts)
+    propagate, alert_logger.propagate = alert_logger.propagate, False
+
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+
+    error = None
+    start = time.perf_counter()
+    try:
+        func()
+    except Exception as e:
+        error = repr(e)
+    finally:
+        wall_time = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        tracemalloc.stop()
+
+        alert_logger.removeHandler(alerts)
+        alert_logger.propagate = propagate
+
+    stats = {name: endpoint.stats() for name, endpoint in endpoints.items()}
+
+    return BenchmarkResult(
+        name=name,
+        deposits=deposits,
+        wall_time=wall_time,
+        peak_memory=peak_memory,
+        rpc_requests=sum(s['requests'] for s in stats.values()),
+        rpc_calls={name: s['calls'] for name, s in stats.items()},
+        rate_limited=sum(s['rate_limited'] for s in stats.values()),
+        alerts=alerts.count,
+        error=error,
+    )
+
+
+def monitor_state(eth: FakeBridgeChain, ava: FakeBridgeChain, eth_url: str, ava_url: str,
+                  options: Optional[Dict[str, str]] = None, use_multicall: bool = False):
+    """
+    A fresh monitor ``State`` pointed at a pair of fake bridge endpoints, as ``monitor.execute`` would build it
+    """
+    # The scripts package registers the bench script, which imports this module
+    from avareporter.scripts.monitor import Bridge, MonitorState, ProposalSet, State
+
+    config = configparser.ConfigParser()
+    config['monitor'] = {
+        'eth_bridge_start_block': str(eth.start_block),
+        'ava_bridge_start_block': str(ava.start_block),
+        **(options or {}),
+    }
+
+    def bridge(chain: FakeBridgeChain, url: str) -> Bridge:
+        web3 = connect(url)
+
+        return Bridge(
+            contract=web3.eth.contract(address=chain.bridge_address, abi=bridge_abi),
+            chain_id=chain.chain_id,
+            handler=chain.handler_address,
+            multicall_address=chain.multicall_address if use_multicall else None,
+        )
+
+    monitor = MonitorState(active_proposals={
+        str(eth.chain_id): ProposalSet(),
+        str(ava.chain_id): ProposalSet(),
+    }, passed_proposals={
+        str(eth.chain_id): ProposalSet(),
+        str(ava.chain_id): ProposalSet(),
+    }, resource_ids=set())
+
+    scanner = LogScanner(
+        chunk_size=int(config['monitor'].get('log_chunk_size', 2000)),
+        max_chunk_size=int(config['monitor'].get('log_max_chunk_size', 100000)),
+    )
+
+    return State(monitor=monitor, eth_bridge=bridge(eth, eth_url), ava_bridge=bridge(ava, ava_url), config=config,
+                 deposits=DepositIndex(':memory:'), scanner=scanner)
+
+
+def synthetic_transactions(count: int, senders: List[str], receiver: str) -> Iterator[TransactionRecord]:
+    """
+    ``count`` transactions sent to ``receiver`` by ``senders`` in turn, generated as they are consumed
+    """
+    for i in range(count):
+        yield TransactionRecord(
+            hash=f'0x{i:064x}',
+            block_number=1000 + i // 10,
+            transaction_index=i % 10,
+            from_address=senders[i % len(senders)],
+            to_address=receiver,
+            value=0,
+            gas_limit=200000,
+            gas_used=50000 + i % 1000,
+            input='0x',
+        )
+
+
+def run_size(deposits: int, latency: float = 0.0, rate_limit: Optional[float] = None,
+             log_range_limit: Optional[int] = None, use_multicall: bool = False,
+             options: Optional[Dict[str, str]] = None, trace_memory: bool = True,
+             client_rate_limit: Optional[float] = None) -> List[BenchmarkResult]:
+    """
+    Benchmark the monitor and fee calculator against a fake bridge pair with ``deposits`` deposits in each direction.
+    ``client_rate_limit`` paces the requests of the monitor like its ``*_requests_per_second`` options. The whole
+    deposit backlog is fetched in one loop unless ``options`` sets ``max_nonces_per_loop``
+    """
+    from avareporter.scripts.fee_calculator import fee_calculate
+    from avareporter.scripts.monitor import check_for_imbalances, find_all_new_proposals, sync_deposit_index
+
+    server_kwargs = dict(latency=latency, rate_limit=rate_limit, log_range_limit=log_range_limit)
+
+    eth_factory = partial(build_chain, 1, deposits)
+    ava_factory = partial(build_chain, 2, deposits)
+
+    with FakeRPCProcess(eth_factory, **server_kwargs) as eth_endpoint, \
+            FakeRPCProcess(ava_factory, **server_kwargs) as ava_endpoint:
+        endpoints = {'eth': eth_endpoint, 'ava': ava_endpoint}
+
+        if client_rate_limit is not None:
+            for endpoint in endpoints.values():
+                set_rate_limit(endpoint.url, client_rate_limit)
+
+        state = monitor_state(eth_factory(), ava_factory(), eth_endpoint.url, ava_endpoint.url,
+                              {'max_nonces_per_loop': '0', **(options or {})}, use_multicall)
+
+        run = partial(measure, deposits=deposits, endpoints=endpoints, trace_memory=trace_memory)
+
+        results = [
+            run('sync_deposit_index', func=lambda: sync_deposit_index(state)),
+            run('find_all_new_proposals', func=lambda: find_all_new_proposals(state)),
+            run('check_for_imbalances', func=lambda: check_for_imbalances(state)),
+            # Resource metadata is cached by now, this is the cost of every later loop
+            run('check_for_imbalances (warm)', func=lambda: check_for_imbalances(state)),
+        ]
+
+        state.deposits.close()
+        state.resources.close()
+
+        relayers = [Web3.keccak(text=f'relayer:{i}')[-20:].hex() for i in range(5)]
+        multisig = Web3.keccak(text='multisig')[-20:].hex()
+        bridge = Web3.keccak(text='bridge')[-20:].hex()
+
+        results.append(run('fee_calculate', func=lambda: fee_calculate(
+            relayers, [], synthetic_transactions(deposits, relayers, multisig),
+            synthetic_transactions(deposits * len(relayers), relayers, bridge))))
+
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, **kwargs) -> List[BenchmarkResult]:
+    """
+    ``run_size`` for every size, see ``run_size`` for the options
+    """
+    return [result for size in sizes for result in run_size(size, **kwargs)]
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    lines = [f"{'benchmark':<30} {'deposits':>9} {'wall (s)':>10} {'peak (MiB)':>11} {'requests':>9} "
+             f"{'calls':>9} {'429s':>6} {'alerts':>7}"]
+
+    for r in results:
+        calls = sum(sum(c.values()) for c in r.rpc_calls.values())
+        peak = f'{r.peak_memory / 2 ** 20:.1f}' if r.peak_memory is not None else '-'
+        lines.append(f'{r.name:<30} {r.deposits:>9} {r.wall_time:>10.3f} {peak:>11} {r.rpc_requests:>9} '
+                     f'{calls:>9} {r.rate_limited:>6} {r.alerts:>7}')
+        if r.error is not None:
+            lines.append(f'    failed: {r.error}')
+
+    return '\n'.join(lines)
@@ -1,34 +1,257 @@
-from typing import Optional
+import threading
+import time
+from typing import Optional, List, Iterator
 
-import requests
-from avareporter.etherscan.models import EthereumSource, EtherscanResult, EtherscanAccountTransactionsResult, EtherscanContractResult
+from avareporter.etherscan.cache import TransactionCache, missing_ranges
+from avareporter.models import TransactionRecord
+from avareporter.utils.http import shared_session
+from avareporter.etherscan.models import EthereumSource, EtherscanResult, EtherscanAccountTransactionsResult, EtherscanContractResult, EthTransaction
+
+DEFAULT_API_KEY = 'UF9IAYD4IHATIXQ3IAW1BMEJX3YSK83SZJ'
+API_URL = 'https://api.etherscan.io/api'
+
+# Etherscan never returns more than this many rows for a single txlist query, no matter the page size
+MAX_RESULTS = 10000
+
+# Blocks this close to the head may still get transactions indexed late, so they are never recorded in the cache
+DEFAULT_CACHE_CONFIRMATIONS = 100
+
+_request_lock = threading.Lock()
+_last_request = 0.0
 
 
 def get_contract_source(address: str, api_key: str) -> EtherscanContractResult:
     url = "https://api.etherscan.io/api?module=contract&action=getsourcecode&address={}&apikey={}".format(address, api_key)
 
-    resp = requests.get(url)
+    resp = shared_session().get(url)
     data = resp.json()
 
     return EtherscanContractResult(**data)
 
 
-def get_transactions_by_account(address: str, api_key: str = 'UF9IAYD4IHATIXQ3IAW1BMEJX3YSK83SZJ',
+def get_transactions_by_account(address: str, api_key: str = DEFAULT_API_KEY,
                                 start_block: int = 0, end_block: int = 99999999999999999999,
                                 sort: str = 'asc') -> EtherscanAccountTransactionsResult:
     url = "https://api.etherscan.io/api?module=account&action=txlist&address={}&startblock={}&endblock={}&sort={}&apikey={}".format(address, start_block, end_block, sort, api_key)
 
-    resp = requests.get(url)
+    resp = shared_session().get(url)
     data = resp.json()
 
     return EtherscanAccountTransactionsResult(**data)
 
 
+def _rate_limited_get(params: dict, rate_limit: float, max_retries: int = 5) -> dict:
+    global _last_request
+
+    for attempt in range(max_retries + 1):
+        with _request_lock:
+            wait = _last_request + 1 / rate_limit - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            _last_request = time.monotonic()
+
+        resp = shared_session().get(API_URL, params=params)
+        data = resp.json()
+
+        if data['status'] == '1' or data['message'].startswith('No transactions found'):
+            return data
+
+        if 'rate limit' in str(data['result']).lower() and attempt < max_retries:
+            time.sleep(2 ** attempt)
+            continue
+
+        raise RuntimeError(f"Etherscan request failed: {data['message']} ({data['result']})")
+
+
+def _iter_txlist(address: str, start_block: int, end_block: int, api_key: str, rate_limit: float,
+                 page_size: int) -> Iterator[List[dict]]:
+    page_size = min(page_size, MAX_RESULTS)
+    cursor = start_block
+    while cursor <= end_block:
+        window = []
+        page = 1
+        while True:
+            data = _rate_limited_get({
+                'module': 'account',
+                'action': 'txlist',
+                'address': address,
+                'startblock': cursor,
+                'endblock': end_block,
+                'page': page,
+                'offset': page_size,
+                'sort': 'asc',
+                'apikey': api_key,
+            }, rate_limit)
+
+            page_rows = data['result'] if data['status'] == '1' else []
+            window.extend(page_rows)
+
+            if len(page_rows) < page_size or (page + 1) * page_size > MAX_RESULTS:
+                break
+            page += 1
+
+        if len(page_rows) < page_size:
+            yield window
+            break
+
+        # The query hit the result cap. Continue from the last block returned, dropping its rows since that
+        # block may have been cut in the middle
+        last_block = int(window[-1]['blockNumber'])
+        if last_block == cursor:
+            raise RuntimeError(f'Block {cursor} has more than {MAX_RESULTS} transactions for {address}')
+
+        yield [r for r in window if int(r['blockNumber']) < last_block]
+        cursor = last_block
+
+
+def _iter_cached(cache: TransactionCache, address: str, start_block: int, end_block: int,
+                 page_size: int) -> Iterator[List[dict]]:
+    page = []
+    for row in cache.iter_rows(address, start_block, end_block):
+        page.append(row)
+        if len(page) >= page_size:
+            yield page
+            page = []
+
+    if len(page) > 0:
+        yield page
+
+
+def _iter_fetched(address: str, start_block: int, end_block: int, api_key: str, rate_limit: float,
+                  page_size: int, cache: Optional[TransactionCache]) -> Iterator[List[dict]]:
+    if cache is None:
+        yield from _iter_txlist(address, start_block, end_block, api_key, rate_limit, page_size)
+        return
+
+    # The range is only recorded in the cache once it was read completely
+    with cache.range_writer(address, start_block, end_block) as writer:
+        for rows in _iter_txlist(address, start_block, end_block, api_key, rate_limit, page_size):
+            writer.write(rows)
+            yield rows
+        writer.commit()
+
+
+def _iter_rows(address: str, start_block: int, end_block: int, api_key: str, rate_limit: float, page_size: int,
+               cache: Optional[TransactionCache], confirmed_block: Optional[int]) -> Iterator[List[dict]]:
+    if confirmed_block is None:
+        confirmed_block = end_block
+    cache_end_block = min(end_block, confirmed_block)
+
+    cached = cache.ranges(address) if cache is not None else []
+
+    segments = [(s, e, True) for s, e in cached if e >= start_block and s <= cache_end_block]
+    segments.extend((s, e, False) for s, e in missing_ranges(cached, start_block, cache_end_block))
+    segments.sort()
+
+    for segment_start, segment_end, is_cached in segments:
+        segment_start = max(segment_start, start_block)
+        segment_end = min(segment_end, cache_end_block)
+
+        if is_cached:
+            pages = _iter_cached(cache, address, segment_start, segment_end, page_size)
+        else:
+            pages = _iter_fetched(address, segment_start, segment_end, api_key, rate_limit, page_size, cache)
+
+        for rows in pages:
+            if len(rows) > 0:
+                yield rows
+
+    # The unconfirmed tail is requested on every run and never cached, so transactions Etherscan indexes late are
+    # still picked up
+    if cache_end_block < end_block:
+        tail_start = max(start_block, cache_end_block + 1)
+        for rows in _iter_txlist(address, tail_start, end_block, api_key, rate_limit, page_size):
+            if len(rows) > 0:
+                yield rows
+
+
+def iter_transactions_by_account(address: str, start_block: int, end_block: int,
+                                 api_key: str = DEFAULT_API_KEY, rate_limit: float = 5,
+                                 page_size: int = MAX_RESULTS,
+                                 cache: Optional[TransactionCache] = None,
+                                 confirmed_block: Optional[int] = None) -> Iterator[List[EthTransaction]]:
+    """
+    Stream every transaction of ``address`` between ``start_block`` and ``end_block`` (inclusive) one page at a
+    time, so the whole history never has to be held in memory. Unlike ``get_transactions_by_account`` the range is
+    paged through, so it is not truncated at Etherscan's 10,000 result cap. When a cache is given, blocks that were
+    already downloaded for this address are read back from disk and only the rest is requested. Blocks after
+    ``confirmed_block`` are always requested and never written to the cache
+
+    Parameters
+    ----------
+    address
+        The account to list transactions for
+    start_block
+        The first block of the range
+    end_block
+        The last block of the range
+    api_key
+        The Etherscan API key
+    rate_limit
+        The maximum number of requests per second, shared by every call in this process
+    page_size
+        The number of rows requested per page
+    cache
+        The on-disk cache to read from and update
+    confirmed_block
+        The last block that is final enough to be cached, defaults to ``end_block``
+
+    Returns
+    -------
+    Iterator[List[EthTransaction]]
+        Pages of transactions, in ascending block order
+    """
+    for rows in _iter_rows(address, start_block, end_block, api_key, rate_limit, page_size, cache,
+                           confirmed_block):
+        yield [EthTransaction(**row) for row in rows]
+
+
+def iter_transaction_records_by_account(address: str, start_block: int, end_block: int,
+                                        api_key: str = DEFAULT_API_KEY, rate_limit: float = 5,
+                                        page_size: int = MAX_RESULTS,
+                                        cache: Optional[TransactionCache] = None,
+                                        confirmed_block: Optional[int] = None) -> Iterator[List[TransactionRecord]]:
+    """
+    Same as ``iter_transactions_by_account`` but yields unvalidated ``TransactionRecord`` pages, which are much
+    cheaper to build and hold when the rows are only aggregated
+    """
+    for rows in _iter_rows(address, start_block, end_block, api_key, rate_limit, page_size, cache,
+                           confirmed_block):
+        yield [TransactionRecord.from_etherscan(row) for row in rows]
+
+
+def get_all_transactions_by_account(address: str, start_block: int, end_block: int,
+                                    api_key: str = DEFAULT_API_KEY, rate_limit: float = 5,
+                                    page_size: int = MAX_RESULTS,
+                                    cache: Optional[TransactionCache] = None,
+                                    confirmed_block: Optional[int] = None) -> List[EthTransaction]:
+    """
+    Same as ``iter_transactions_by_account`` but returns every transaction in a single list
+
+    Returns
+    -------
+    List[EthTransaction]
+        The transactions ordered by block number and transaction index
+    """
+    transactions = [t for page in iter_transactions_by_account(address, start_block, end_block, api_key,
+                                                               rate_limit, page_size, cache, confirmed_block)
+                    for t in page]
+    transactions.sort(key=lambda t: (int(t.block_number), t.transactionIndex))
+
+    return transactions
+
+
 __all__ = [
+    'DEFAULT_CACHE_CONFIRMATIONS',
     'EtherscanAccountTransactionsResult',
     'EtherscanContractResult',
     'EthereumSource',
     'EtherscanResult',
+    'EthTransaction',
+    'TransactionCache',
     'get_transactions_by_account',
+    'get_all_transactions_by_account',
+    'iter_transactions_by_account',
+    'iter_transaction_records_by_account',
     'get_contract_source'
-]
\ No newline at end of file
+]
@@ -0,0 +1,122 @@
+import json
+import os
+from pathlib import Path
+from typing import List, Tuple, Iterator, Iterable
+
+BlockRange = Tuple[int, int]
+
+
+def merge_ranges(ranges: List[BlockRange]) -> List[BlockRange]:
+    """
+    Merge overlapping or adjacent (inclusive) block ranges
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if len(merged) > 0 and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(cached: List[BlockRange], start_block: int, end_block: int) -> List[BlockRange]:
+    """
+    The parts of [start_block, end_block] not covered by the ``cached`` ranges
+    """
+    missing = []
+    cursor = start_block
+    for start, end in merge_ranges(cached):
+        if end < cursor:
+            continue
+        if start > end_block:
+            break
+        if start > cursor:
+            missing.append((cursor, start - 1))
+        cursor = max(cursor, end + 1)
+
+    if cursor <= end_block:
+        missing.append((cursor, end_block))
+
+    return missing
+
+
+class RangeWriter:
+    """
+    Streams the rows of one block range to a temporary file. The range only becomes part of the cache once
+    ``commit`` is called, a writer that is closed without committing leaves the cache untouched
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._temp_path = path.with_suffix('.tmp')
+        self._file = open(str(self._temp_path.absolute()), mode='w')
+
+    def write(self, rows: Iterable[dict]):
+        for row in rows:
+            self._file.write(json.dumps(row))
+            self._file.write('\n')
+
+    def commit(self):
+        self._file.close()
+        os.replace(str(self._temp_path.absolute()), str(self.path.absolute()))
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            self._temp_path.unlink()
+
+    def __enter__(self) -> 'RangeWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TransactionCache:
+    """
+    An on-disk cache of the raw Etherscan txlist rows of each address. Every completely downloaded block range is
+    stored as its own JSON lines file named after the range, inside a directory per address, so rows can be
+    streamed back without loading the whole history and a range is never recorded as done before all of its rows
+    were written
+    """
+
+    def __init__(self, directory: str = '.etherscan_cache'):
+        self.directory = Path(directory)
+
+    def _address_directory(self, address: str) -> Path:
+        return self.directory / address.lower()
+
+    def _files(self, address: str) -> List[Tuple[BlockRange, Path]]:
+        directory = self._address_directory(address)
+        if not directory.exists():
+            return []
+
+        files = []
+        for path in directory.glob('*.jsonl'):
+            start, end = path.stem.split('-')
+            files.append(((int(start), int(end)), path))
+
+        return sorted(files)
+
+    def ranges(self, address: str) -> List[BlockRange]:
+        return merge_ranges([block_range for block_range, _ in self._files(address)])
+
+    def iter_rows(self, address: str, start_block: int, end_block: int) -> Iterator[dict]:
+        """
+        Stream the cached rows of ``address`` between ``start_block`` and ``end_block`` (inclusive)
+        """
+        for (start, end), path in self._files(address):
+            if end < start_block or start > end_block:
+                continue
+
+            with open(str(path.absolute()), mode='r') as f:
+                for line in f:
+                    row = json.loads(line)
+                    if start_block <= int(row['blockNumber']) <= end_block:
+                        yield row
+
+    def range_writer(self, address: str, start_block: int, end_block: int) -> RangeWriter:
+        directory = self._address_directory(address)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        return RangeWriter(directory / f'{start_block}-{end_block}.jsonl')
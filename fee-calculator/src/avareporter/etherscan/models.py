@@ -73,7 +73,7 @@ class EthTransaction(Transaction):
 
     @property
     def to_address(self) -> Optional[str]:
-        return self.to.lower()
+        return self.to.lower() if self.to is not None else ''
 
 
 class EtherscanContractResult(EtherscanResult):
@@ -1,4 +1,4 @@
-import requests
+from avareporter.utils.http import shared_session
 
 
 def send_query(url: str, query: str):
@@ -8,14 +8,17 @@ def send_query(url: str, query: str):
         "operationName": None
     }
 
-    resp = requests.post(url, data)
+    resp = shared_session().post(url, data)
 
     return resp.json()
 
 
-from avareporter.graphql.cchain_explorer import get_all_transactions_by_address
+from avareporter.graphql.cchain_explorer import get_all_transactions_by_address, iter_transactions_by_address, \
+    iter_transaction_records_by_address
 
 __all__ = [
     'send_query',
-    'get_all_transactions_by_address'
+    'get_all_transactions_by_address',
+    'iter_transactions_by_address',
+    'iter_transaction_records_by_address'
 ]
\ No newline at end of file
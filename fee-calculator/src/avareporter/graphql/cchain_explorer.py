@@ -1,38 +1,114 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import requests
 
 from avareporter.graphql import send_query
 from avareporter.graphql.models import AvaTransaction
+from avareporter.models import TransactionRecord, _to_int
+from avareporter.utils.http import shared_session
+from avareporter.utils.ranges import AdaptiveRangeFetcher
 
 
-def get_all_transactions_by_address(address: str, explorer_url: str = 'https://explorerapi.avax.network',
-                                    start_block: int = -1, end_block: Optional[int] = None) -> List[AvaTransaction]:
-    if start_block > 0 and end_block is not None:
-        cursor = start_block
-        count = end_block - start_block
+def _should_split(e: Exception) -> bool:
+    # The explorer answers ranges it cannot serve without a Transactions field, or times out on them
+    if isinstance(e, (KeyError, requests.exceptions.Timeout)):
+        return True
+
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response is not None and e.response.status_code >= 500
+
+    return False
+
 
-        results = []
-        while cursor < end_block:
-            current_start = cursor
-            current_end = current_start + count
+def _iter_rows(address: str, explorer_url: str, start_block: int, end_block: int, window_size: Optional[int],
+               max_workers: int, session: Optional[requests.Session]) -> Iterator[List[dict]]:
+    if session is None:
+        session = shared_session()
 
-            try:
-                tx = get_all_transactions_by_address_unhandled(address, explorer_url, current_start, current_end)
-                results.extend(tx)
+    # Try the whole range at once unless told otherwise, windows are split only when the explorer refuses them
+    if window_size is None:
+        window_size = end_block - start_block + 1
 
-                cursor += count
-            except KeyError:
-                count /= 2
+    def fetch_window(window_start: int, window_end: int) -> List[dict]:
+        # Ask for one extra block so the window is fully covered whether blockEnd is inclusive or not
+        return _fetch_rows(address, explorer_url, window_start, window_end + 1, session=session)
+
+    fetcher = AdaptiveRangeFetcher(
+        fetch_window,
+        _should_split,
+        chunk_size=window_size,
+        max_workers=max_workers
+    )
+
+    # Windows come back in block order, so a transaction can only be repeated by the window right after the one
+    # it was first seen in, only the hashes of the previous window are remembered
+    previous_hashes = set()
+    for window_start, window_end, rows in fetcher.scan(start_block, end_block):
+        window = []
+        hashes = set()
+        for row in rows:
+            # Only keep the window's own blocks, the extra block requested belongs to the next window
+            if not window_start <= _to_int(row['block']) <= window_end:
+                continue
+            if row['hash'] in previous_hashes or row['hash'] in hashes:
                 continue
 
-        return results
+            hashes.add(row['hash'])
+            window.append(row)
+
+        previous_hashes = hashes
+        yield window
+
+
+def iter_transactions_by_address(address: str, start_block: int, end_block: int,
+                                 explorer_url: str = 'https://explorerapi.avax.network',
+                                 window_size: Optional[int] = None, max_workers: int = 4,
+                                 session: Optional[requests.Session] = None) -> Iterator[List[AvaTransaction]]:
+    """
+    Stream the transactions of ``address`` between ``start_block`` and ``end_block`` (inclusive), one block window
+    at a time and in block order. Windows the explorer cannot serve are split and retried
+
+    Returns
+    -------
+    Iterator[List[AvaTransaction]]
+        The transactions of each window
+    """
+    for rows in _iter_rows(address, explorer_url, start_block, end_block, window_size, max_workers, session):
+        yield [AvaTransaction(**row) for row in rows]
+
+
+def iter_transaction_records_by_address(address: str, start_block: int, end_block: int,
+                                        explorer_url: str = 'https://explorerapi.avax.network',
+                                        window_size: Optional[int] = None, max_workers: int = 4,
+                                        session: Optional[requests.Session] = None) -> Iterator[List[TransactionRecord]]:
+    """
+    Same as ``iter_transactions_by_address`` but yields unvalidated ``TransactionRecord`` pages
+    """
+    for rows in _iter_rows(address, explorer_url, start_block, end_block, window_size, max_workers, session):
+        yield [TransactionRecord.from_explorer(row) for row in rows]
+
+
+def get_all_transactions_by_address(address: str, explorer_url: str = 'https://explorerapi.avax.network',
+                                    start_block: int = -1, end_block: Optional[int] = None,
+                                    window_size: Optional[int] = None, max_workers: int = 4,
+                                    session: Optional[requests.Session] = None) -> List[AvaTransaction]:
+    if start_block > 0 and end_block is not None:
+        return [t for page in iter_transactions_by_address(address, start_block, end_block, explorer_url,
+                                                           window_size, max_workers, session)
+                for t in page]
     else:
         return get_all_transactions_by_address_unhandled(address, explorer_url, start_block, end_block)
 
 
 def get_all_transactions_by_address_unhandled(address: str, explorer_url: str = 'https://explorerapi.avax.network',
-                                    start_block: int = -1, end_block: Optional[int] = None) -> List[AvaTransaction]:
+                                    start_block: int = -1, end_block: Optional[int] = None,
+                                    session: Optional[requests.Session] = None) -> List[AvaTransaction]:
+    return list(map(lambda t: AvaTransaction(**t), _fetch_rows(address, explorer_url, start_block, end_block,
+                                                               session)))
+
+
+def _fetch_rows(address: str, explorer_url: str, start_block: int, end_block: Optional[int],
+                session: Optional[requests.Session] = None) -> List[dict]:
     url = "{}/v2/ctransactions?address={}".format(explorer_url, address)
 
     if start_block > 0:
@@ -41,7 +117,7 @@ def get_all_transactions_by_address_unhandled(address: str, explorer_url: str =
     if end_block is not None:
         url += "&blockEnd={}".format(end_block)
 
-    resp = requests.get(url)
+    resp = (session or shared_session()).get(url)
     data = resp.json()
 
-    return list(map(lambda t: AvaTransaction(**t), data['Transactions']))
\ No newline at end of file
+    return data['Transactions']
@@ -0,0 +1,272 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if len(names) == 0:
+        return ''
+    return '{' + ','.join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type = ''
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f'{self.name} expects the labels {self.label_names}, got {tuple(labels)}')
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        raise NotImplementedError()
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        lines.extend(f'{name}{labels} {_format_value(value)}' for name, labels, value in self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """
+    A value that only goes up, e.g. a number of requests
+    """
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield self.name, _format_labels(self.label_names, key), value
+
+
+class Gauge(Counter):
+    """
+    A value that can go up and down, e.g. a backlog
+    """
+    type = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """
+    The distribution of observed values, e.g. durations, in cumulative buckets
+    """
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: the count of each bucket (not cumulative, the last one is +Inf), the sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration of the ``with`` block, also when it raises
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+
+        bucket_label_names = self.label_names + ('le',)
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield (f'{self.name}_bucket', _format_labels(bucket_label_names, key + (_format_value(bound),)),
+                       cumulative)
+            yield f'{self.name}_sum', _format_labels(self.label_names, key), total
+            yield f'{self.name}_count', _format_labels(self.label_names, key), cumulative
+
+
+class Registry:
+    """
+    A set of metrics rendered together in the Prometheus text format
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'A metric named {metric.name} is already registered')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(m.render() for m in metrics) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram('avareporter_monitor_stage_seconds',
+                                   'Time spent in each stage of the monitor loop', ['stage'])
+RPC_REQUESTS = REGISTRY.counter('avareporter_rpc_requests_total',
+                                'JSON-RPC calls sent, batched calls are counted one by one', ['endpoint', 'method'])
+RPC_ERRORS = REGISTRY.counter('avareporter_rpc_errors_total',
+                              'JSON-RPC calls that failed or returned an error', ['endpoint', 'method'])
+RATE_LIMIT_RETRIES = REGISTRY.counter('avareporter_rate_limit_retries_total',
+                                      'Requests retried after the provider answered with its rate limit', ['endpoint'])
+HEDGED_REQUESTS = REGISTRY.counter('avareporter_rpc_hedged_requests_total',
+                                   'Requests also sent to a second endpoint after the p95 latency of the first',
+                                   ['endpoint'])
+ENDPOINT_STALE = REGISTRY.gauge('avareporter_rpc_endpoint_stale',
+                                '1 while an endpoint trails the block height of the other endpoints of its chain',
+                                ['endpoint'])
+ENDPOINT_BLOCK = REGISTRY.gauge('avareporter_rpc_endpoint_block',
+                                'The block height an endpoint last reported', ['endpoint'])
+DEPOSITS_ON_CHAIN = REGISTRY.gauge('avareporter_deposits_on_chain',
+                                   'The deposit count reported by the origin bridge', ['origin', 'destination'])
+DEPOSITS_PROCESSED = REGISTRY.gauge('avareporter_deposits_processed',
+                                    'The deposit count the monitor has handled', ['origin', 'destination'])
+DEPOSIT_BACKLOG = REGISTRY.gauge('avareporter_deposit_backlog',
+                                 'Deposits made on chain that the monitor has not handled yet',
+                                 ['origin', 'destination'])
+
+
+def endpoint_label(endpoint_uri: Optional[str]) -> str:
+    """
+    The host (and port) of an RPC endpoint. Paths and credentials often hold API keys and are left out
+    """
+    if endpoint_uri is None:
+        return 'unknown'
+
+    parsed = urlparse(endpoint_uri)
+    host = parsed.hostname or endpoint_uri
+    return f'{host}:{parsed.port}' if parsed.port else host
+
+
+def time_stage(stage: str):
+    return STAGE_SECONDS.time(stage=stage)
+
+
+def set_deposit_counts(origin: str, destination: str, on_chain: Optional[int] = None,
+                       processed: Optional[int] = None):
+    """
+    Update the deposit gauges of one direction, the backlog is derived from the last known values of both
+    """
+    if on_chain is not None:
+        DEPOSITS_ON_CHAIN.set(on_chain, origin=origin, destination=destination)
+    if processed is not None:
+        DEPOSITS_PROCESSED.set(processed, origin=origin, destination=destination)
+
+    DEPOSIT_BACKLOG.set(DEPOSITS_ON_CHAIN.get(origin=origin, destination=destination) -
+                        DEPOSITS_PROCESSED.get(origin=origin, destination=destination),
+                        origin=origin, destination=destination)
+
+
+class MetricsServer:
+    """
+    Serve a registry on ``/metrics`` from a background thread
+
+    Parameters
+    ----------
+    port
+        The port to listen on
+    host
+        The interface to listen on, only local by default
+    registry
+        The metrics to serve
+    """
+
+    def __init__(self, port: int, host: str = '127.0.0.1', registry: Registry = REGISTRY):
+        self.registry = registry
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+
+                body = server.registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def start(self) -> 'MetricsServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
@@ -33,3 +33,69 @@ class Transaction(BaseModel):
     @property
     def to_address(self) -> Optional[str]:
         raise NotImplemented()
+
+
+def _to_int(value) -> int:
+    if isinstance(value, str) and value[:2] in ('0x', '0X'):
+        return int(value, 16)
+    return int(value)
+
+
+class TransactionRecord:
+    """
+    A compact, unvalidated transaction used when large numbers of rows are processed. Addresses are lowercased and
+    numbers converted to ints once when the record is built, instead of on every access as with the ``Transaction``
+    models, which are kept for validated output
+    """
+
+    __slots__ = ('hash', 'block_number', 'transaction_index', 'from_address', 'to_address', 'value', 'gas_limit',
+                 'gas_used', 'input')
+
+    def __init__(self, hash: str, block_number: int, transaction_index: int, from_address: str, to_address: str,
+                 value: int, gas_limit: int, gas_used: int, input: str):
+        self.hash = hash
+        self.block_number = block_number
+        self.transaction_index = transaction_index
+        self.from_address = from_address
+        self.to_address = to_address
+        self.value = value
+        self.gas_limit = gas_limit
+        self.gas_used = gas_used
+        self.input = input
+
+    @classmethod
+    def from_etherscan(cls, row: dict) -> 'TransactionRecord':
+        """
+        Build a record from a raw Etherscan txlist row, with the same meaning as the ``EthTransaction`` properties
+        """
+        return cls(
+            row['hash'],
+            int(row['blockNumber']),
+            int(row['transactionIndex']),
+            row['from'].lower(),
+            (row.get('to') or '').lower(),
+            int(row['value']),
+            int(row['gas']),
+            int(row['gasUsed']),
+            row['input']
+        )
+
+    @classmethod
+    def from_explorer(cls, row: dict) -> 'TransactionRecord':
+        """
+        Build a record from a raw C-Chain explorer row, with the same meaning as the ``AvaTransaction`` properties
+        """
+        return cls(
+            row['hash'],
+            _to_int(row['block']),
+            0,
+            row['fromAddr'].lower(),
+            (row.get('toAddr') or '').lower(),
+            _to_int(row['value']),
+            _to_int(row['blockGasLimit']),
+            _to_int(row['blockGasUsed']),
+            row.get('input') or ''
+        )
+
+    def __repr__(self):
+        return f'TransactionRecord(hash={self.hash!r}, block_number={self.block_number})'
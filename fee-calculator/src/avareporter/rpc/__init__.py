@@ -0,0 +1,39 @@
+from avareporter.rpc.provider import PooledHTTPProvider, FailoverHTTPProvider, EndpointHealth, post_json_rpc, \
+    connect, endpoint_list
+from avareporter.rpc.batch import batch_call, decode_function_result, DEFAULT_BATCH_SIZE
+from avareporter.rpc.limits import set_concurrency_limit, endpoint_slot, concurrency_limit_middleware
+from avareporter.rpc.metrics import metrics_middleware
+from avareporter.rpc.throttle import TokenBucket, RetryPolicy, set_rate_limit, rate_limits, set_retry_policy, \
+    retry_policy, throttled_request, rate_limit_middleware
+from avareporter.rpc.logs import LogScanner, is_range_error
+from avareporter.rpc.cursor import BlockCursor
+from avareporter.rpc.subscriptions import subscribe, format_log
+
+__all__ = [
+    'PooledHTTPProvider',
+    'FailoverHTTPProvider',
+    'EndpointHealth',
+    'post_json_rpc',
+    'connect',
+    'endpoint_list',
+    'batch_call',
+    'decode_function_result',
+    'DEFAULT_BATCH_SIZE',
+    'set_concurrency_limit',
+    'endpoint_slot',
+    'concurrency_limit_middleware',
+    'metrics_middleware',
+    'TokenBucket',
+    'RetryPolicy',
+    'set_rate_limit',
+    'rate_limits',
+    'set_retry_policy',
+    'retry_policy',
+    'throttled_request',
+    'rate_limit_middleware',
+    'LogScanner',
+    'is_range_error',
+    'BlockCursor',
+    'subscribe',
+    'format_log',
+]
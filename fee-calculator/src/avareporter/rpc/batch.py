@@ -0,0 +1,163 @@
+import itertools
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.contract import Contract, ContractFunction
+from web3.types import BlockIdentifier
+
+from avareporter.metrics import RPC_ERRORS, endpoint_label
+from avareporter.rpc.provider import post_json_rpc
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def _chunks(items: Sequence[Any], size: int) -> List[Sequence[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _block_param(block_identifier: BlockIdentifier) -> Any:
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    return block_identifier
+
+
+def decode_function_result(web3: Web3, function: ContractFunction, return_data: bytes) -> Any:
+    """
+    Decode the raw return data of an eth_call the same way ``ContractFunction.call()`` does, so batched results are
+    interchangeable with the ones returned by web3
+
+    Parameters
+    ----------
+    web3
+        The Web3 instance whose codec should be used
+    function
+        The bound contract function that produced the return data
+    return_data
+        The raw bytes returned by the node
+
+    Returns
+    -------
+    Any
+        The decoded (and address normalized) value
+    """
+    output_types = get_abi_output_types(function.abi)
+    output_data = web3.codec.decode_abi(output_types, return_data)
+
+    normalized_data = map_abi_data(itertools.chain(BASE_RETURN_NORMALIZERS, function._return_data_normalizers),
+                                   output_types, output_data)
+
+    if len(normalized_data) == 1:
+        return normalized_data[0]
+    return normalized_data
+
+
+def _call_params(function: ContractFunction, block_identifier: BlockIdentifier) -> List[Any]:
+    return [{
+        'to': function.address,
+        'data': function._encode_transaction_data(),
+    }, _block_param(block_identifier)]
+
+
+def _send_batch(web3: Web3, payload: List[dict]) -> List[dict]:
+    provider = web3.provider
+    method = payload[0]['method']
+    data = json.dumps(payload).encode('utf-8')
+    request_kwargs = dict(provider.get_request_kwargs())
+
+    def send(endpoint_uri: str) -> Tuple[str, Any]:
+        return endpoint_uri, json.loads(post_json_rpc(endpoint_uri, data, request_kwargs, method, len(payload)))
+
+    # Providers spread over several endpoints pick the one the batch goes to
+    route = getattr(provider, 'route', None)
+    endpoint_uri, response = route(send) if route is not None else send(provider.endpoint_uri)
+    endpoint = endpoint_label(endpoint_uri)
+
+    if isinstance(response, dict):
+        # Some nodes answer a batch with a single error object instead of an array
+        RPC_ERRORS.inc(len(payload), endpoint=endpoint, method=method)
+        raise ValueError(response.get('error', response))
+
+    by_id = {r['id']: r for r in response}
+    results = []
+    for request in payload:
+        r = by_id.get(request['id'])
+        if r is None:
+            raise ValueError(f"Missing response for batched request {request['id']}")
+        if 'error' in r:
+            RPC_ERRORS.inc(endpoint=endpoint, method=method)
+            raise ValueError(r['error'])
+        results.append(r['result'])
+
+    return results
+
+
+def _json_rpc_batch(web3: Web3, functions: Sequence[ContractFunction],
+                    block_identifier: BlockIdentifier, batch_size: int) -> List[Any]:
+    results = []
+    for chunk in _chunks(functions, batch_size):
+        payload = [{
+            'jsonrpc': '2.0',
+            'method': 'eth_call',
+            'params': _call_params(function, block_identifier),
+            'id': i,
+        } for i, function in enumerate(chunk)]
+
+        raw_results = _send_batch(web3, payload)
+
+        results.extend(decode_function_result(web3, function, HexBytes(raw))
+                       for function, raw in zip(chunk, raw_results))
+
+    return results
+
+
+def _multicall(web3: Web3, multicall: Contract, functions: Sequence[ContractFunction],
+               block_identifier: BlockIdentifier, batch_size: int) -> List[Any]:
+    results = []
+    for chunk in _chunks(functions, batch_size):
+        calls = [(to_checksum_address(function.address), HexBytes(function._encode_transaction_data()))
+                 for function in chunk]
+
+        _, return_data = multicall.functions.aggregate(calls).call(block_identifier=block_identifier)
+
+        results.extend(decode_function_result(web3, function, raw) for function, raw in zip(chunk, return_data))
+
+    return results
+
+
+def batch_call(web3: Web3, functions: Sequence[ContractFunction], block_identifier: BlockIdentifier = 'latest',
+               multicall: Optional[Contract] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> List[Any]:
+    """
+    Execute many read-only contract calls with as few HTTP round trips as possible. When a Multicall contract is
+    given, the calls are aggregated on-chain, otherwise they are sent as JSON-RPC batch arrays. Either way the
+    results are decoded exactly like ``ContractFunction.call()`` and returned in the same order as ``functions``
+
+    Parameters
+    ----------
+    web3
+        The Web3 instance to send the calls through. Must be backed by an HTTP provider
+    functions
+        The bound contract functions to call, e.g. ``contract.functions.getProposal(1, 2, hash)``
+    block_identifier
+        The block every call is executed against
+    multicall
+        An optional Multicall contract on the same chain to aggregate the calls through
+    batch_size
+        The maximum number of calls sent in a single request
+
+    Returns
+    -------
+    List[Any]
+        The decoded result of each call
+    """
+    if len(functions) == 0:
+        return []
+
+    if multicall is not None:
+        return _multicall(web3, multicall, functions, block_identifier, batch_size)
+
+    return _json_rpc_batch(web3, functions, block_identifier, batch_size)
@@ -0,0 +1,109 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+# The number of processed blocks whose hash is remembered to detect reorgs
+DEFAULT_TAIL_SIZE = 64
+
+
+@dataclass
+class BlockCursor:
+    """
+    The last block an event scan fully processed on one chain, along with the hashes of the last processed blocks
+    so a reorg of already scanned blocks can be detected and rescanned. ``block`` is 0 until the first scan
+
+    Parameters
+    ----------
+    block
+        The last processed block
+    hashes
+        The hash of recently processed blocks, by block number
+    tail_size
+        The number of hashes kept
+    """
+    block: int = 0
+    hashes: Dict[int, str] = field(default_factory=dict)
+    tail_size: int = DEFAULT_TAIL_SIZE
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BlockCursor':
+        return cls(block=data['block'], hashes={int(n): h for n, h in data.get('hashes', {}).items()})
+
+    def as_dict(self) -> dict:
+        return {
+            'block': self.block,
+            'hashes': {str(n): h for n, h in self.hashes.items()},
+        }
+
+    def advance(self, block: int, block_hash: str):
+        """
+        Mark every block up to ``block`` as processed
+        """
+        if block < self.block:
+            return
+
+        self.block = block
+        self.hashes[block] = HexBytes(block_hash).hex()
+
+        for number in sorted(self.hashes)[:-self.tail_size]:
+            del self.hashes[number]
+
+    def advance_to(self, web3: Web3, block: int):
+        """
+        Same as ``advance``, reading the hash of ``block`` from the chain
+        """
+        self.advance(block, web3.eth.get_block(block)['hash'])
+
+    def rewind(self, web3: Web3) -> bool:
+        """
+        Compare the remembered hashes with the chain and move the cursor back to the newest block that was not
+        reorganized, so the replaced blocks are scanned again
+
+        Returns
+        -------
+        bool
+            Whether a reorg was detected
+        """
+        logger = logging.getLogger('BlockCursor')
+
+        if len(self.hashes) == 0:
+            return False
+
+        for number in sorted(self.hashes, reverse=True):
+            if HexBytes(web3.eth.get_block(number)['hash']).hex() == self.hashes[number]:
+                if number == self.block:
+                    return False
+
+                logger.warning(f'Reorg detected after block {number}, rescanning from block {number + 1}')
+                self.block = number
+                return True
+
+            del self.hashes[number]
+
+        # Deeper than the remembered tail, rescan the whole tail
+        self.block = max(0, number - 1)
+        logger.warning(f'Reorg deeper than the remembered blocks detected, rescanning from block {number}')
+        return True
+
+    def next_range(self, web3: Web3, confirmations: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        The range of blocks to scan next: from the block after the cursor (after rewinding past any reorg) up to
+        ``confirmations`` blocks behind the head. A cursor that never advanced starts at that block
+
+        Returns
+        -------
+        Optional[Tuple[int, int]]
+            The first and last block of the range (both inclusive), None when there is nothing new to scan
+        """
+        self.rewind(web3)
+
+        to_block = web3.eth.block_number - confirmations
+        from_block = self.block + 1 if self.block > 0 else to_block
+
+        if to_block < from_block or to_block < 0:
+            return None
+
+        return from_block, to_block
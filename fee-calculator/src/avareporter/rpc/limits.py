@@ -0,0 +1,38 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Callable, Any
+
+from web3 import Web3
+from web3.types import RPCEndpoint, RPCResponse
+
+_limits: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def set_concurrency_limit(endpoint_uri: str, limit: int):
+    """
+    Bound the number of requests that may be in flight to ``endpoint_uri`` at the same time, across every thread
+    and every Web3 instance of this process
+    """
+    _limits[endpoint_uri] = threading.BoundedSemaphore(limit)
+
+
+@contextmanager
+def endpoint_slot(endpoint_uri: Optional[str]):
+    semaphore = _limits.get(endpoint_uri) if endpoint_uri is not None else None
+    if semaphore is None:
+        yield
+        return
+
+    with semaphore:
+        yield
+
+
+def concurrency_limit_middleware(make_request: Callable[[RPCEndpoint, Any], Any],
+                                 web3: Web3) -> Callable[[RPCEndpoint, Any], RPCResponse]:
+    endpoint_uri = getattr(web3.provider, 'endpoint_uri', None)
+
+    def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+        with endpoint_slot(endpoint_uri):
+            return make_request(method, params)
+
+    return middleware
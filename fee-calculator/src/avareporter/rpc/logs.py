@@ -0,0 +1,111 @@
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+import requests
+from web3.contract import ContractEvent
+from web3.types import EventData
+
+from avareporter.utils.ranges import AdaptiveRangeFetcher
+
+# Substrings of the error messages providers return when a getLogs range has too many results or is too wide
+RANGE_ERROR_MESSAGES = (
+    'block range',
+    'range too large',
+    'range is too large',
+    'range too wide',
+    'query returned more than',
+    'too many results',
+    'too many logs',
+    'log response size exceeded',
+    'response size exceeded',
+    'query timeout exceeded',
+)
+
+
+def is_range_error(e: Exception) -> bool:
+    """
+    Whether the exception raised by a getLogs call means the block range should be split and retried
+    """
+    if isinstance(e, requests.exceptions.Timeout):
+        return True
+
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response is not None and e.response.status_code in (413, 502, 503, 504)
+
+    if isinstance(e, ValueError) and len(e.args) > 0:
+        error = e.args[0]
+        message = error.get('message', '') if isinstance(error, dict) else str(error)
+        message = message.lower()
+        return any(m in message for m in RANGE_ERROR_MESSAGES)
+
+    return False
+
+
+class LogScanner:
+    """
+    Fetch event logs over large block ranges by walking the range in windows. A window that fails with a
+    "too many results" style error or a timeout is split in half and retried, successful windows grow the window
+    size again. Several windows can be fetched concurrently, results are always returned in block order
+
+    Parameters
+    ----------
+    chunk_size
+        The initial number of blocks requested per getLogs call
+    min_chunk_size
+        The window size below which a failing window is no longer split and the error is raised
+    max_chunk_size
+        The largest window size the scanner will grow to
+    growth
+        The factor the window size grows by after a fully successful round
+    max_workers
+        The number of windows fetched concurrently
+    """
+
+    def __init__(self, chunk_size: int = 2000, min_chunk_size: int = 1, max_chunk_size: int = 100000,
+                 growth: float = 2.0, max_workers: int = 1):
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.growth = growth
+        self.max_workers = max_workers
+
+    def _fetch(self, event: Type[ContractEvent], from_block: int, to_block: int,
+               argument_filters: Optional[Dict[str, Any]] = None) -> List[EventData]:
+        return event.getLogs(fromBlock=from_block, toBlock=to_block, argument_filters=argument_filters)
+
+    def scan(self, event: Type[ContractEvent], from_block: int, to_block: Union[int, str] = 'latest',
+             argument_filters: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[int, int, List[EventData]]]:
+        """
+        Scan ``event`` logs between ``from_block`` and ``to_block`` (both inclusive)
+
+        Returns
+        -------
+        Iterator[Tuple[int, int, List[EventData]]]
+            One (window start, window end, events) tuple per scanned window, in block order. Every block of the
+            range is covered by exactly one window
+        """
+        if to_block == 'latest':
+            to_block = event.web3.eth.block_number
+
+        fetcher = AdaptiveRangeFetcher(
+            partial(self._fetch, event, argument_filters=argument_filters),
+            is_range_error,
+            chunk_size=self.chunk_size,
+            min_chunk_size=self.min_chunk_size,
+            max_chunk_size=self.max_chunk_size,
+            growth=self.growth,
+            max_workers=self.max_workers
+        )
+
+        try:
+            yield from fetcher.scan(from_block, to_block)
+        finally:
+            # Remember the window size that worked for the next scan
+            self.chunk_size = fetcher.chunk_size
+
+    def get_logs(self, event: Type[ContractEvent], from_block: int, to_block: Union[int, str] = 'latest',
+                 argument_filters: Optional[Dict[str, Any]] = None) -> List[EventData]:
+        """
+        Same as ``scan`` but returns every event of the range in a single list
+        """
+        return [e for _, _, events in self.scan(event, from_block, to_block, argument_filters) for e in events]
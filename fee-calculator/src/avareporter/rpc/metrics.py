@@ -0,0 +1,29 @@
+from typing import Any, Callable
+
+from web3 import Web3
+from web3.types import RPCEndpoint, RPCResponse
+
+from avareporter.metrics import RPC_ERRORS, RPC_REQUESTS, endpoint_label
+
+
+def metrics_middleware(make_request: Callable[[RPCEndpoint, Any], Any],
+                       web3: Web3) -> Callable[[RPCEndpoint, Any], RPCResponse]:
+    """
+    Count the requests sent through a Web3 instance and the ones that failed, per endpoint and method
+    """
+    endpoint = endpoint_label(getattr(web3.provider, 'endpoint_uri', None))
+
+    def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+        RPC_REQUESTS.inc(endpoint=endpoint, method=method)
+        try:
+            response = make_request(method, params)
+        except Exception:
+            RPC_ERRORS.inc(endpoint=endpoint, method=method)
+            raise
+
+        if 'error' in response:
+            RPC_ERRORS.inc(endpoint=endpoint, method=method)
+
+        return response
+
+    return middleware
@@ -0,0 +1,347 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import requests
+from web3 import Web3
+from web3.types import RPCEndpoint, RPCResponse
+
+from avareporter.metrics import ENDPOINT_BLOCK, ENDPOINT_STALE, HEDGED_REQUESTS, RPC_ERRORS, RPC_REQUESTS, \
+    endpoint_label
+from avareporter.rpc.limits import concurrency_limit_middleware, endpoint_slot
+from avareporter.rpc.metrics import metrics_middleware
+from avareporter.rpc.throttle import rate_limit_middleware, throttled_request
+from avareporter.utils import http
+
+T = TypeVar('T')
+
+# Transport failures after which a request is sent to the next endpoint. JSON-RPC errors are answers, not failures
+FAILOVER_ERRORS = (requests.exceptions.RequestException,)
+
+# Seconds of request outcomes the error rate of an endpoint is computed over
+HEALTH_WINDOW = 60.0
+# Latencies kept per endpoint for the mean and p95
+LATENCY_SAMPLES = 100
+# Seconds of latency added to the score of an endpoint whose recent requests all failed
+ERROR_PENALTY = 10.0
+# Latencies needed before requests are hedged after the p95 of an endpoint
+MIN_HEDGE_SAMPLES = 20
+# Seconds a block height check waits for an endpoint, a slow endpoint is reported without a height
+HEIGHT_CHECK_TIMEOUT = 5.0
+
+
+def post_json_rpc(endpoint_uri: str, data: bytes, request_kwargs: Dict[str, Any], method: str,
+                  count: int = 1) -> bytes:
+    """
+    POST an encoded JSON-RPC request (or batch of ``count`` requests) to ``endpoint_uri`` through the shared session,
+    within the endpoint's concurrency limit and rate limit, counting it in the RPC metrics
+    """
+    endpoint = endpoint_label(endpoint_uri)
+
+    def send() -> bytes:
+        RPC_REQUESTS.inc(count, endpoint=endpoint, method=method)
+        try:
+            with endpoint_slot(endpoint_uri):
+                return http.post(endpoint_uri, data, **request_kwargs)
+        except Exception:
+            RPC_ERRORS.inc(count, endpoint=endpoint, method=method)
+            raise
+
+    return throttled_request(endpoint_uri, send)
+
+
+class PooledHTTPProvider(Web3.HTTPProvider):
+    """
+    An HTTP provider sending every request through the process-wide pooled session. The stock provider keeps a
+    session per thread, so every worker thread opens its own connections to the endpoint. The stock retry middleware
+    is left out, it resends refused requests straight away, retries go through the ``RetryPolicy`` of
+    ``throttled_request`` instead
+    """
+    _middlewares = ()
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.logger.debug("Making request HTTP. URI: %s, Method: %s", self.endpoint_uri, method)
+        raw_response = http.post(self.endpoint_uri, self.encode_rpc_request(method, params),
+                                 **self.get_request_kwargs())
+        response = self.decode_rpc_response(raw_response)
+        self.logger.debug("Getting response HTTP. URI: %s, Method: %s, Response: %s",
+                          self.endpoint_uri, method, response)
+        return response
+
+
+class EndpointHealth:
+    """
+    Recent latencies and failures of one endpoint, and the block height it last reported
+    """
+
+    def __init__(self, endpoint_uri: str):
+        self.endpoint_uri = endpoint_uri
+        self.block_number: Optional[int] = None
+        self.stale = False
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        now = time.monotonic()
+        with self._lock:
+            if ok:
+                self._latencies.append(latency)
+            self._outcomes.append((now, ok))
+            while self._outcomes[0][0] < now - HEALTH_WINDOW:
+                self._outcomes.popleft()
+
+    @property
+    def error_rate(self) -> float:
+        now = time.monotonic()
+        with self._lock:
+            recent = [ok for at, ok in self._outcomes if at >= now - HEALTH_WINDOW]
+        if len(recent) == 0:
+            return 0.0
+        return recent.count(False) / len(recent)
+
+    @property
+    def mean_latency(self) -> float:
+        with self._lock:
+            return sum(self._latencies) / len(self._latencies) if len(self._latencies) > 0 else 0.0
+
+    @property
+    def p95_latency(self) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < MIN_HEDGE_SAMPLES:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[int(len(latencies) * 0.95) - 1]
+
+    def score(self) -> float:
+        """
+        Lower is better: the mean latency plus a penalty growing with the recent error rate. Endpoints without
+        samples score 0 so they are tried
+        """
+        return self.mean_latency + ERROR_PENALTY * self.error_rate
+
+
+class FailoverHTTPProvider(PooledHTTPProvider):
+    """
+    An HTTP provider spreading over several endpoints of the same chain. Each request goes to the healthiest
+    endpoint (lowest latency and error rate) and moves on to the next one when the transport fails. Endpoints whose
+    block height lags behind the others are only used when no other endpoint answers. Optionally, a request still
+    unanswered after the p95 latency of its endpoint is sent to the next endpoint as well, and the first answer wins
+
+    Every endpoint is throttled, concurrency limited and counted on its own, do not add the rate limit,
+    concurrency limit or metrics middlewares to it
+
+    Parameters
+    ----------
+    endpoint_uris
+        The endpoints, in order of preference until latencies are known
+    hedge
+        Whether to hedge slow requests
+    max_block_lag
+        The number of blocks an endpoint may trail the highest reported block before it is considered stale
+    height_check_interval
+        Seconds between two block height checks. The checks run on a background thread and query the endpoints in
+        parallel, requests are never held up by them
+    request_kwargs
+        Passed to ``requests`` for every request
+    """
+
+    def __init__(self, endpoint_uris: Sequence[str], hedge: bool = False, max_block_lag: int = 5,
+                 height_check_interval: float = 30.0, request_kwargs: Optional[Any] = None):
+        if len(endpoint_uris) == 0:
+            raise ValueError('FailoverHTTPProvider needs at least one endpoint')
+
+        super().__init__(endpoint_uris[0], request_kwargs)
+
+        self.endpoint_uris = list(endpoint_uris)
+        self.hedge = hedge
+        self.max_block_lag = max_block_lag
+        self.height_check_interval = height_check_interval
+        self.health = {endpoint_uri: EndpointHealth(endpoint_uri) for endpoint_uri in self.endpoint_uris}
+
+        self._heights_checked = 0.0
+        self._height_lock = threading.Lock()
+        self._hedge_executor = ThreadPoolExecutor(thread_name_prefix='hedge') if hedge else None
+
+    @property
+    def options(self) -> dict:
+        """
+        The arguments to build the same provider with, e.g. in another process
+        """
+        return {
+            'endpoint_uris': self.endpoint_uris,
+            'hedge': self.hedge,
+            'max_block_lag': self.max_block_lag,
+            'height_check_interval': self.height_check_interval,
+        }
+
+    def __str__(self) -> str:
+        return "RPC connection {0}".format(', '.join(self.endpoint_uris))
+
+    def _schedule_height_check(self):
+        # A single background check at a time, requests route with the last known heights meanwhile
+        if time.monotonic() - self._heights_checked < self.height_check_interval or \
+                not self._height_lock.acquire(blocking=False):
+            return
+
+        threading.Thread(target=self._check_heights, name='height-check', daemon=True).start()
+
+    def _check_height(self, endpoint_uri: str, data: bytes, kwargs: Dict[str, Any]):
+        logger = logging.getLogger('FailoverHTTPProvider')
+
+        health = self.health[endpoint_uri]
+        start = time.perf_counter()
+        try:
+            response = self.decode_rpc_response(post_json_rpc(endpoint_uri, data, kwargs, 'eth_blockNumber'))
+            health.block_number = int(response['result'], 16)
+            health.record(time.perf_counter() - start, True)
+        except (KeyError, ValueError) + FAILOVER_ERRORS as e:
+            health.block_number = None
+            health.record(time.perf_counter() - start, False)
+            logger.warning(f'Block height check of {endpoint_label(endpoint_uri)} failed: {e}')
+
+    def _check_heights(self):
+        logger = logging.getLogger('FailoverHTTPProvider')
+
+        try:
+            data = self.encode_rpc_request(RPCEndpoint('eth_blockNumber'), [])
+            kwargs = {**self.get_request_kwargs(), 'timeout': HEIGHT_CHECK_TIMEOUT}
+
+            with ThreadPoolExecutor(max_workers=len(self.endpoint_uris), thread_name_prefix='height-check') as pool:
+                for endpoint_uri in self.endpoint_uris:
+                    pool.submit(self._check_height, endpoint_uri, data, kwargs)
+
+            heights = [h.block_number for h in self.health.values() if h.block_number is not None]
+            highest = max(heights) if len(heights) > 0 else None
+
+            for endpoint_uri, health in self.health.items():
+                stale = highest is not None and (health.block_number is None or
+                                                 highest - health.block_number > self.max_block_lag)
+                if stale and not health.stale:
+                    logger.warning(f'{endpoint_label(endpoint_uri)} is behind the other endpoints '
+                                   f'(block {health.block_number}, highest {highest}), routing around it')
+                health.stale = stale
+
+                ENDPOINT_STALE.set(int(stale), endpoint=endpoint_label(endpoint_uri))
+                if health.block_number is not None:
+                    ENDPOINT_BLOCK.set(health.block_number, endpoint=endpoint_label(endpoint_uri))
+
+            self._heights_checked = time.monotonic()
+        finally:
+            self._height_lock.release()
+
+    def ranked_endpoints(self) -> List[str]:
+        """
+        The endpoints from best to worst, stale endpoints last
+        """
+        if len(self.endpoint_uris) > 1:
+            self._schedule_height_check()
+
+        return sorted(self.endpoint_uris, key=lambda uri: (self.health[uri].stale, self.health[uri].score()))
+
+    def _timed(self, endpoint_uri: str, send: Callable[[str], T]) -> T:
+        health = self.health[endpoint_uri]
+        start = time.perf_counter()
+        try:
+            result = send(endpoint_uri)
+        except FAILOVER_ERRORS:
+            health.record(time.perf_counter() - start, False)
+            raise
+
+        health.record(time.perf_counter() - start, True)
+        return result
+
+    def _hedged(self, primary: str, secondary: str, send: Callable[[str], T]) -> T:
+        futures: List[Future] = [self._hedge_executor.submit(self._timed, primary, send)]
+        done, _ = wait(futures, timeout=self.health[primary].p95_latency)
+
+        if len(done) == 0:
+            HEDGED_REQUESTS.inc(endpoint=endpoint_label(primary))
+            futures.append(self._hedge_executor.submit(self._timed, secondary, send))
+
+        error: Optional[BaseException] = None
+        pending = set(futures)
+        while len(pending) > 0:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower request is left to finish in the background, its latency is still recorded
+                    return future.result()
+                error = future.exception()
+
+        raise error
+
+    def route(self, send: Callable[[str], T]) -> T:
+        """
+        Call ``send`` with the best endpoint, then with the next ones while the transport fails. The last failure
+        is raised when every endpoint failed
+        """
+        logger = logging.getLogger('FailoverHTTPProvider')
+
+        endpoints = self.ranked_endpoints()
+
+        error: Optional[BaseException] = None
+        i = 0
+        while i < len(endpoints):
+            endpoint_uri = endpoints[i]
+            try:
+                if self.hedge and i + 1 < len(endpoints) and self.health[endpoint_uri].p95_latency is not None:
+                    # The hedge went to the next endpoint, do not try it again on failure
+                    i += 1
+                    return self._hedged(endpoint_uri, endpoints[i], send)
+
+                return self._timed(endpoint_uri, send)
+            except FAILOVER_ERRORS as e:
+                error = e
+                logger.warning(f'Request to {endpoint_label(endpoint_uri)} failed, trying the next endpoint: {e}')
+            i += 1
+
+        raise error
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        data = self.encode_rpc_request(method, params)
+        kwargs = self.get_request_kwargs()
+
+        def send(endpoint_uri: str) -> RPCResponse:
+            response = self.decode_rpc_response(post_json_rpc(endpoint_uri, data, kwargs, method))
+            if 'error' in response:
+                RPC_ERRORS.inc(endpoint=endpoint_label(endpoint_uri), method=method)
+            return response
+
+        return self.route(send)
+
+
+def endpoint_list(endpoint_uris: str) -> List[str]:
+    """
+    The endpoints of a comma separated config value
+    """
+    return [uri.strip() for uri in endpoint_uris.split(',') if uri.strip() != '']
+
+
+def connect(endpoint_uris: Union[str, Sequence[str]], hedge: bool = False, max_block_lag: int = 5,
+            height_check_interval: float = 30.0) -> Web3:
+    """
+    A Web3 instance for one chain: a ``PooledHTTPProvider`` behind the concurrency limit, metrics and rate limit
+    middlewares for a single endpoint, or a ``FailoverHTTPProvider`` for several (see its parameters)
+
+    Parameters
+    ----------
+    endpoint_uris
+        One endpoint, a comma separated list or a sequence of endpoints
+    """
+    if isinstance(endpoint_uris, str):
+        endpoint_uris = endpoint_list(endpoint_uris)
+
+    if len(endpoint_uris) > 1:
+        return Web3(FailoverHTTPProvider(endpoint_uris, hedge=hedge, max_block_lag=max_block_lag,
+                                         height_check_interval=height_check_interval))
+
+    web3 = Web3(PooledHTTPProvider(endpoint_uris[0]))
+    web3.middleware_onion.add(concurrency_limit_middleware)
+    web3.middleware_onion.add(metrics_middleware)
+    web3.middleware_onion.add(rate_limit_middleware)
+
+    return web3
@@ -0,0 +1,110 @@
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import websockets
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+# Called with the index of the subscription (in the order given to ``subscribe``) and the notification result
+NotificationHandler = Callable[[int, Any], Awaitable[None]]
+
+
+def format_log(raw_log: dict) -> AttributeDict:
+    """
+    Convert a log received through ``eth_subscribe`` (hex encoded JSON) into the format returned by ``getLogs``, so
+    it can be decoded with ``ContractEvent.processLog``
+    """
+    log = dict(raw_log)
+    for key in ('blockNumber', 'logIndex', 'transactionIndex'):
+        if isinstance(log.get(key), str):
+            log[key] = int(log[key], 16)
+    for key in ('blockHash', 'transactionHash'):
+        if log.get(key) is not None:
+            log[key] = HexBytes(log[key])
+    log['topics'] = [HexBytes(topic) for topic in log.get('topics', [])]
+
+    return AttributeDict(log)
+
+
+async def subscribe(uri: str, subscriptions: List[list], on_notification: NotificationHandler,
+                    on_connect: Optional[Callable[[], Awaitable[None]]] = None, reconnect_delay: float = 1.0,
+                    max_reconnect_delay: float = 60.0):
+    """
+    Keep a set of ``eth_subscribe`` subscriptions open on a WebSocket endpoint, reconnecting with an exponential
+    backoff whenever the connection drops. Runs until cancelled
+
+    Parameters
+    ----------
+    uri
+        The WebSocket endpoint
+    subscriptions
+        The ``eth_subscribe`` params of each subscription, e.g. ``['newHeads']``
+    on_notification
+        Called for every notification, notifications are handled one at a time in the order they arrive
+    on_connect
+        Called once all subscriptions are active after each (re)connection, before any notification is handled.
+        Anything that happened while disconnected has to be backfilled here
+    reconnect_delay
+        The delay before the first reconnection attempt
+    max_reconnect_delay
+        The longest delay between reconnection attempts
+    """
+    logger = logging.getLogger('subscriptions')
+
+    ids = itertools.count(1)
+    delay = reconnect_delay
+
+    while True:
+        try:
+            async with websockets.connect(uri, max_size=None) as ws:
+                subscription_ids: Dict[str, int] = {}
+                # Notifications of earlier subscriptions may arrive before the next answer, keep them for later
+                pending = []
+                for index, params in enumerate(subscriptions):
+                    request_id = next(ids)
+                    await ws.send(json.dumps({
+                        'jsonrpc': '2.0',
+                        'id': request_id,
+                        'method': 'eth_subscribe',
+                        'params': params,
+                    }))
+
+                    while True:
+                        message = json.loads(await ws.recv())
+                        if message.get('id') == request_id:
+                            break
+                        pending.append(message)
+
+                    if 'error' in message:
+                        raise ValueError(message['error'])
+                    subscription_ids[message['result']] = index
+
+                logger.debug(f'Subscribed to {len(subscriptions)} streams on {uri}')
+                delay = reconnect_delay
+
+                if on_connect is not None:
+                    await on_connect()
+
+                async def dispatch(message: dict):
+                    params = message.get('params')
+                    if message.get('method') != 'eth_subscription' or params is None:
+                        return
+                    index = subscription_ids.get(params['subscription'])
+                    if index is not None:
+                        await on_notification(index, params['result'])
+
+                for message in pending:
+                    await dispatch(message)
+
+                async for raw_message in ws:
+                    await dispatch(json.loads(raw_message))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f'Subscription connection to {uri} lost ({e!r}), reconnecting in {delay} seconds')
+
+        await asyncio.sleep(delay)
+        delay = min(max_reconnect_delay, delay * 2)
@@ -0,0 +1,200 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import requests
+from web3 import Web3
+from web3.types import RPCEndpoint, RPCResponse
+
+from avareporter.metrics import RATE_LIMIT_RETRIES, endpoint_label
+
+T = TypeVar('T')
+
+# HTTP status codes meaning the provider refused the request because of its rate limit
+RATE_LIMIT_STATUS_CODES = (429,)
+
+
+class TokenBucket:
+    """
+    Paces requests to ``rate`` per second with bursts of up to ``burst`` requests. Callers reserve a token and sleep
+    until it is due, so concurrent callers are spread evenly over time instead of all retrying at once
+
+    Parameters
+    ----------
+    rate
+        Tokens added per second
+    burst
+        The largest number of tokens that can be saved up, ``rate`` (one second worth) by default
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError('The rate of a token bucket must be positive')
+
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Take a token, sleeping until one is available
+
+        Returns
+        -------
+        float
+            The number of seconds slept
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            # Tokens can go negative, later callers then queue up behind this one
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+    def defer(self, seconds: float):
+        """
+        Hand out no new token for ``seconds``, used when the provider asked every client to slow down
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How requests refused by a rate limit are retried: exponential backoff with full jitter, or the delay of the
+    ``Retry-After`` header when the provider sends one
+
+    Parameters
+    ----------
+    max_retries
+        The number of retries before the error is raised
+    base_delay
+        The delay ceiling of the first retry, doubled on every retry
+    max_delay
+        The largest delay between two attempts
+    """
+    max_retries: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            # A little jitter on top, so clients told the same Retry-After do not come back in lockstep
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_policy = RetryPolicy()
+
+
+def set_rate_limit(endpoint_uri: str, rate: float, burst: Optional[float] = None):
+    """
+    Pace the requests sent to ``endpoint_uri`` to ``rate`` per second, across every thread and every Web3 instance
+    of this process
+    """
+    _buckets[endpoint_uri] = TokenBucket(rate, burst)
+
+
+def rate_limits() -> Dict[str, Tuple[float, float]]:
+    """
+    The rate and burst of every endpoint with a rate limit, to configure child processes with
+    """
+    return {endpoint_uri: (bucket.rate, bucket.burst) for endpoint_uri, bucket in _buckets.items()}
+
+
+def set_retry_policy(policy: RetryPolicy):
+    global _policy
+    _policy = policy
+
+
+def retry_policy() -> RetryPolicy:
+    return _policy
+
+
+def _retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    value = response.headers.get('Retry-After') if response is not None else None
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def throttled_request(endpoint_uri: Optional[str], send: Callable[[], T]) -> T:
+    """
+    Call ``send`` once a token of the endpoint's bucket is available, retrying it with backoff when the provider
+    answers with a rate limit error. The error is raised once the retries of the retry policy are used up
+
+    Parameters
+    ----------
+    endpoint_uri
+        The endpoint ``send`` talks to
+    send
+        Sends the request, raising ``requests.exceptions.HTTPError`` on error statuses
+    """
+    logger = logging.getLogger('throttle')
+
+    bucket = _buckets.get(endpoint_uri) if endpoint_uri is not None else None
+    policy = _policy
+
+    attempt = 0
+    while True:
+        if bucket is not None:
+            bucket.acquire()
+
+        try:
+            return send()
+        except requests.exceptions.HTTPError as e:
+            response = e.response
+            if response is None or response.status_code not in RATE_LIMIT_STATUS_CODES or \
+                    attempt >= policy.max_retries:
+                raise
+
+            delay = policy.delay(attempt, _retry_after(response))
+            attempt += 1
+
+            RATE_LIMIT_RETRIES.inc(endpoint=endpoint_label(endpoint_uri))
+            logger.debug(f'Rate limited by {endpoint_label(endpoint_uri)}, retry {attempt} in {delay:.2f}s')
+
+            if bucket is not None:
+                bucket.defer(delay)
+            time.sleep(delay)
+
+
+def rate_limit_middleware(make_request: Callable[[RPCEndpoint, Any], Any],
+                          web3: Web3) -> Callable[[RPCEndpoint, Any], RPCResponse]:
+    """
+    Send every request of a Web3 instance through ``throttled_request``. Add it after (outside of)
+    ``concurrency_limit_middleware``, so no concurrency slot is held while waiting for a token or a retry
+    """
+    endpoint_uri = getattr(web3.provider, 'endpoint_uri', None)
+
+    def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+        return throttled_request(endpoint_uri, lambda: make_request(method, params))
+
+    return middleware
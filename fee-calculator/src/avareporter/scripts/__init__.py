@@ -1,3 +1,4 @@
 from avareporter.scripts.fee_calculator import *
 from avareporter.scripts.balance_history import *
 from avareporter.scripts.monitor import *
+from avareporter.scripts.bench import *
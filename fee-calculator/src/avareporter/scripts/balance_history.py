@@ -6,6 +6,7 @@ from avareporter.cli import script
 from avareporter.abis import multisig, bridge_abi, erc20_abi, handler_abi
 from web3 import Web3
 import avareporter.etherscan as es
+from avareporter.rpc import LogScanner, connect
 import json
 
 # temp because cant read file
@@ -50,22 +51,20 @@ def execute():
     output_json = bool(config['bridge_data']['output_json'])
     output_stdout = bool(config['bridge_data']['output_stdout'])
 
-    eth_web3 = Web3(Web3.HTTPProvider(eth_rpc_url))
-    ava_web3 = Web3(Web3.HTTPProvider(ava_rpc_url))
+    eth_web3 = connect(eth_rpc_url)
+    ava_web3 = connect(ava_rpc_url)
 
     usdt = eth_web3.eth.contract(address=Web3.toChecksumAddress('0xdac17f958d2ee523a2206206994597c13d831ec7'), abi=erc20_abi)
     eth_bridge = eth_web3.eth.contract(address=Web3.toChecksumAddress(eth_bridge_address), abi=bridge_abi)
     eth_handler = eth_web3.eth.contract(address=Web3.toChecksumAddress('0x6147F5a1a4eEa5C529e2F375Bd86f8F58F8Bc990'), abi=handler_abi)
 
-    transfer_event_filter = usdt.events.Transfer.createFilter(fromBlock=11688193, toBlock='latest', argument_filters={
+    scanner = LogScanner(chunk_size=5000, max_workers=4)
+
+    raw_transfer_events = scanner.get_logs(usdt.events.Transfer, 11688193, 'latest', argument_filters={
         'to': Web3.toChecksumAddress('0xdAC7Bb7Ce4fF441A235F08408e632FA1D799A147')
     })
 
-    deposit_event_filter = eth_bridge.events.Deposit.createFilter(fromBlock=11688193, toBlock='latest')
-
-    raw_transfer_events = transfer_event_filter.get_all_entries()
-
-    raw_deposit_events = deposit_event_filter.get_all_entries()
+    raw_deposit_events = scanner.get_logs(eth_bridge.events.Deposit, 11688193, 'latest')
 
     resource_id_cache = {}
     deposit_cache = {}
@@ -115,8 +114,9 @@ def execute():
     print("Total USDT Transferred")
     print((total_value / 1e6))
 
+    eth_head = eth_web3.eth.blockNumber
     if eth_end_block == 'latest':
-        eth_end_block = eth_web3.eth.blockNumber
+        eth_end_block = eth_head
     else:
         eth_end_block = int(eth_end_block)
 
@@ -125,12 +125,11 @@ def execute():
     else:
         ava_end_block = int(ava_end_block)
 
-    print("Grabbing all Ethereum Multisig transactions via Etherscan")
-    eth_multisig_transactions = es.get_transactions_by_account(eth_multisig_address, start_block=eth_start_block,
-                                                               end_block=eth_end_block).result
-
-    print("Filtering for exec transaction calls")
-    exec_transactions = list(filter(lambda t: t.input.startswith('0x6a761202'), eth_multisig_transactions))
+    print("Grabbing all Ethereum Multisig exec transaction calls via Etherscan")
+    pages = es.iter_transaction_records_by_account(eth_multisig_address, start_block=eth_start_block,
+                                                   end_block=eth_end_block, cache=es.TransactionCache(),
+                                                   confirmed_block=eth_head - es.DEFAULT_CACHE_CONFIRMATIONS)
+    exec_transactions = [t for page in pages for t in page if t.input.startswith('0x6a761202')]
 
     eth_multisig_contract = eth_web3.eth.contract(address=eth_multisig_address, abi=multisig)
     eth_bridge_contract = eth_web3.eth.contract(address=eth_bridge_address, abi=bridge_abi)
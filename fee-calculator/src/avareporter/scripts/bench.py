@@ -0,0 +1,84 @@
+import argparse
+import json
+import logging
+
+from avareporter.cli import script
+from avareporter.bench import run_benchmarks, format_results, DEFAULT_SIZES
+
+
+def parse_bench_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--sizes',
+                        default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Comma separated numbers of deposits per direction to benchmark')
+
+    parser.add_argument('--latency',
+                        type=float,
+                        default=0.0,
+                        help='Seconds added to every RPC request')
+
+    parser.add_argument('--rate-limit',
+                        type=float,
+                        default=None,
+                        help='Requests per second each endpoint accepts before answering with HTTP 429')
+
+    parser.add_argument('--client-rate-limit',
+                        type=float,
+                        default=None,
+                        help='Requests per second the monitor paces itself to, like its *_requests_per_second options')
+
+    parser.add_argument('--log-range-limit',
+                        type=int,
+                        default=None,
+                        help='The widest block range eth_getLogs accepts')
+
+    parser.add_argument('--batch-size',
+                        type=int,
+                        default=None,
+                        help='The monitor batch_size option')
+
+    parser.add_argument('--multicall',
+                        action='store_true',
+                        help='Aggregate batched reads through the fake Multicall contracts')
+
+    parser.add_argument('--no-memory',
+                        dest='trace_memory',
+                        action='store_false',
+                        help='Do not trace peak memory, tracing slows down the benchmarks')
+
+    parser.add_argument('--json',
+                        dest='json_output',
+                        default=None,
+                        help='Also write the results to this JSON file')
+
+    args, _ = parser.parse_known_args()
+    return args
+
+
+@script('bench')
+def execute():
+    args = parse_bench_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    options = {}
+    if args.batch_size is not None:
+        options['batch_size'] = str(args.batch_size)
+
+    results = run_benchmarks(
+        sizes=[int(s) for s in args.sizes.split(',')],
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        client_rate_limit=args.client_rate_limit,
+        log_range_limit=args.log_range_limit,
+        use_multicall=args.multicall,
+        options=options,
+        trace_memory=args.trace_memory,
+    )
+
+    print(format_results(results))
+
+    if args.json_output is not None:
+        with open(args.json_output, mode='w') as f:
+            json.dump([r.as_dict() for r in results], f, indent=2)
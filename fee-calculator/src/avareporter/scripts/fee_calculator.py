@@ -1,6 +1,7 @@
 import configparser
 import csv
-from typing import List, Dict, Tuple
+from itertools import chain
+from typing import List, Dict, Tuple, Iterable
 
 from pydantic import BaseModel
 from web3 import Web3
@@ -8,7 +9,10 @@ from web3 import Web3
 from avareporter.cli import script
 import avareporter.etherscan as es
 import avareporter.graphql as ava
-from avareporter.models import Transaction
+from avareporter.models import TransactionRecord
+from avareporter.rpc import set_rate_limit, connect, endpoint_list
+from avareporter.utils.http import configure_sessions, DEFAULT_POOL_SIZE
+from avareporter.utils.streams import prefetch
 
 
 class Result(BaseModel):
@@ -28,36 +32,67 @@ class BothResults(BaseModel):
     ava_results: AllResults
 
 
+class GasTotals:
+    """
+    Accumulates the gas used by transactions sent from or to a set of addresses. Addresses are mapped to integer
+    codes once, so adding a transaction costs two dict lookups no matter how many addresses are watched
+
+    Parameters
+    ----------
+    addresses
+        The lowercase addresses to group the gas by
+    """
+
+    def __init__(self, addresses: List[str]):
+        self.addresses = addresses
+        self._codes = {address: code for code, address in enumerate(addresses)}
+        self._sums = [0] * len(addresses)
+        self.total_gas = 0
+
+    def add(self, transaction: TransactionRecord):
+        from_code = self._codes.get(transaction.from_address)
+        to_code = self._codes.get(transaction.to_address)
+
+        if from_code is None and to_code is None:
+            return
+
+        gas = transaction.gas_used
+        self.total_gas += gas
+
+        # A transaction between two watched addresses counts for both, but only once for the total
+        if from_code is not None:
+            self._sums[from_code] += gas
+        if to_code is not None and to_code != from_code:
+            self._sums[to_code] += gas
+
+    def gas_used(self, address: str) -> int:
+        return self._sums[self._codes[address]]
+
+
 def fee_calculate(addresses: List[str], multisig_only: List[str],
-                  multisig_transactions: List[Transaction],
-                  bridge_transactions: List[Transaction]) -> Tuple[Dict[str, float], float]:
-    all_transactions = multisig_transactions + bridge_transactions
-    filtered_transactions = list(filter(
-        lambda t: t.from_address in addresses or t.to_address in addresses,
-        all_transactions
-    ))
-    multisig_only_transactions = list(filter(
-        lambda t: t.from_address in multisig_only or t.to_address in multisig_only,
-        multisig_transactions
-    ))
-
-    total_gas = sum(int(t.gas_used) for t in filtered_transactions + multisig_only_transactions)
+                  multisig_transactions: Iterable[TransactionRecord],
+                  bridge_transactions: Iterable[TransactionRecord]) -> Tuple[Dict[str, float], float]:
+    users = GasTotals(addresses)
+    multisig_only_users = GasTotals(multisig_only)
+
+    for t in multisig_transactions:
+        users.add(t)
+        multisig_only_users.add(t)
+
+    for t in bridge_transactions:
+        users.add(t)
+
+    total_gas = users.total_gas + multisig_only_users.total_gas
 
     all_users = {
-        address: sum(int(t.gas_used) for t in
-                                 filter(lambda t: t.from_address == address or t.to_address == address,
-                                        filtered_transactions)) / total_gas
+        address: users.gas_used(address) / total_gas
         for address in addresses
     }
 
-    multisig_only_users = {
-        address: sum(int(t.gas_used) for t in
-                                 filter(lambda t: t.from_address == address or t.to_address == address,
-                                        multisig_only_transactions)) / total_gas
+    all_users.update({
+        address: multisig_only_users.gas_used(address) / total_gas
         for address in multisig_only
-    }
-
-    all_users.update(multisig_only_users)
+    })
 
     return all_users, total_gas
 
@@ -77,17 +112,37 @@ def execute():
     ava_start_block = int(config['fee_calculator']['ava_start_block'])
     eth_end_block = config['fee_calculator']['eth_end_block']
     ava_end_block = config['fee_calculator']['ava_end_block']
-    eth_rpc_url = config['fee_calculator']['eth_rpc_url']
-    ava_rpc_url = config['fee_calculator']['ava_rpc_url']
+    eth_rpc_urls = endpoint_list(config['fee_calculator']['eth_rpc_url'])
+    ava_rpc_urls = endpoint_list(config['fee_calculator']['ava_rpc_url'])
     output_csv = bool(config['fee_calculator']['output_csv'])
     output_json = bool(config['fee_calculator']['output_json'])
     output_stdout = bool(config['fee_calculator']['output_stdout'])
-
-    eth_web3 = Web3(Web3.HTTPProvider(eth_rpc_url))
-    ava_web3 = Web3(Web3.HTTPProvider(ava_rpc_url))
-
+    etherscan_cache_dir = config['fee_calculator'].get('etherscan_cache', '.etherscan_cache')
+    etherscan_cache_confirmations = int(config['fee_calculator'].get('etherscan_cache_confirmations',
+                                                                      es.DEFAULT_CACHE_CONFIRMATIONS))
+    eth_requests_per_second = float(config['fee_calculator'].get('eth_requests_per_second') or 0)
+    ava_requests_per_second = float(config['fee_calculator'].get('ava_requests_per_second') or 0)
+    http_pool_size = int(config['fee_calculator'].get('http_pool_size', DEFAULT_POOL_SIZE))
+
+    configure_sessions(http_pool_size)
+
+    etherscan_cache = es.TransactionCache(etherscan_cache_dir) if etherscan_cache_dir else None
+
+    for rpc_url in eth_rpc_urls:
+        if eth_requests_per_second > 0:
+            set_rate_limit(rpc_url, eth_requests_per_second)
+    for rpc_url in ava_rpc_urls:
+        if ava_requests_per_second > 0:
+            set_rate_limit(rpc_url, ava_requests_per_second)
+
+    eth_web3 = connect(eth_rpc_urls)
+    ava_web3 = connect(ava_rpc_urls)
+
+    # Blocks this close to the head are fetched again on every run instead of being cached
+    eth_head = eth_web3.eth.blockNumber
+    eth_confirmed_block = eth_head - etherscan_cache_confirmations
     if eth_end_block == 'latest':
-        eth_end_block = eth_web3.eth.blockNumber
+        eth_end_block = eth_head
     else:
         eth_end_block = int(eth_end_block)
 
@@ -100,26 +155,30 @@ def execute():
     addresses = list(map(lambda s: s.lower().strip(), addresses))
     multisig_only = list(map(lambda s: s.lower().strip(), multisig_only))
 
-    print("Grabbing all Ethereum Multisig transactions via Etherscan")
-    eth_multisig_transactions = es.get_transactions_by_account(eth_multisig_address, start_block=eth_start_block,
-                                                               end_block=eth_end_block).result
-
-    print("Grabbing all Ethereum Bridge transactions via Etherscan")
-    eth_bridge_transactions = es.get_transactions_by_account(eth_bridge_address, start_block=eth_start_block,
-                                                             end_block=eth_end_block).result
-
-    print("Grabbing all Avalanche Multisig transactions via Avascanner")
-    ava_multisig_transactions = ava.get_all_transactions_by_address(ava_multisig_address, start_block=ava_start_block,
-                                                                    end_block=ava_end_block)
-
-    print("Grabbing all Avalanche Bridge transactions via Avascanner")
-    ava_bridge_transactions = ava.get_all_transactions_by_address(ava_bridge_address, start_block=ava_start_block,
-                                                                  end_block=ava_end_block)
+    # Every source is fetched on its own thread while the pages already received are added up, so only a few
+    # pages per source are held in memory at any time
+    print("Streaming all Ethereum Multisig and Bridge transactions via Etherscan")
+    eth_multisig_transactions = prefetch(es.iter_transaction_records_by_account(
+        eth_multisig_address, start_block=eth_start_block, end_block=eth_end_block, cache=etherscan_cache,
+        confirmed_block=eth_confirmed_block))
+    eth_bridge_transactions = prefetch(es.iter_transaction_records_by_account(
+        eth_bridge_address, start_block=eth_start_block, end_block=eth_end_block, cache=etherscan_cache,
+        confirmed_block=eth_confirmed_block))
+
+    print("Streaming all Avalanche Multisig and Bridge transactions via Avascanner")
+    ava_multisig_transactions = prefetch(ava.iter_transaction_records_by_address(
+        ava_multisig_address, start_block=ava_start_block, end_block=ava_end_block))
+    ava_bridge_transactions = prefetch(ava.iter_transaction_records_by_address(
+        ava_bridge_address, start_block=ava_start_block, end_block=ava_end_block))
 
     print("Calculating Ethereum fees and total gas")
-    eth_results, eth_total_gas = fee_calculate(addresses, multisig_only, eth_multisig_transactions, eth_bridge_transactions)
+    eth_results, eth_total_gas = fee_calculate(addresses, multisig_only,
+                                               chain.from_iterable(eth_multisig_transactions),
+                                               chain.from_iterable(eth_bridge_transactions))
     print("Calculating Avalanche fees and total gas")
-    ava_results, ava_total_gas = fee_calculate(addresses, multisig_only, ava_multisig_transactions, ava_bridge_transactions)
+    ava_results, ava_total_gas = fee_calculate(addresses, multisig_only,
+                                               chain.from_iterable(ava_multisig_transactions),
+                                               chain.from_iterable(ava_bridge_transactions))
 
     print("Grabbing balance of Ethereum bridge")
     eth_balance = eth_web3.eth.get_balance(eth_bridge_address)
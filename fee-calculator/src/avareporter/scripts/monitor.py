@@ -1,28 +1,40 @@
+import argparse
+import asyncio
 import configparser
+import copy
 import json
+import threading
 import time
-from dataclasses import dataclass, asdict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field, replace, InitVar
 from enum import Enum
-from functools import partial
+from functools import partial, lru_cache
+from itertools import zip_longest
 from multiprocessing import Pool
 from multiprocessing.pool import ThreadPool
-from typing import List, Set, Dict, Optional, Any, Iterable
+from typing import List, Set, Dict, Optional, Any, Iterable, Iterator, Sequence, Tuple, Callable, Type
 from pathlib import Path
 
-import requests
-from requests import Response
 from tqdm.contrib.concurrent import process_map, thread_map
 
 from hexbytes import HexBytes
-from web3.contract import Contract
-
-from avareporter.abis import bridge_abi, handler_abi, erc20_abi, erc20_nonstandard_abi
+from eth_utils import event_abi_to_log_topic
+from web3.contract import Contract, ContractEvent
+
+from avareporter.abis import bridge_abi, handler_abi, erc20_abi, erc20_nonstandard_abi, multicall_abi
+from avareporter.rpc import batch_call, DEFAULT_BATCH_SIZE, set_concurrency_limit, \
+    LogScanner, BlockCursor, RetryPolicy, set_rate_limit, rate_limits, set_retry_policy, \
+    retry_policy, FailoverHTTPProvider, connect, endpoint_list
+from avareporter.rpc.subscriptions import subscribe, format_log
+from avareporter import metrics
+from avareporter.utils.http import configure_sessions, DEFAULT_POOL_SIZE
+from avareporter.storage import DepositIndex, DepositRecord, ResourceRegistry, ResourceRecord, StateStore, \
+    canonical_resource_id
 from web3 import Web3
 from avareporter.cli import script
 import logging
 from logging.config import fileConfig
 from logging.config import dictConfig
-import requests
 from web3.types import EventData
 
 CHAIN_NAMES = {
@@ -34,6 +46,9 @@ CHAIN_NAMES = {
 EMPTY_BYTES32 = b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
 ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
 
+# Deposit nonces whose proposals are fetched per loop, the rest of a backlog is backfilled by later loops
+DEFAULT_MAX_NONCES_PER_LOOP = 5000
+
 
 class ProposalStatus(int, Enum):
     Inactive = 0
@@ -54,15 +69,145 @@ class Proposal:
     deposit_nonce: int
     deposit_block: Optional[int]
     deposit_transaction_hash: Optional[str]
+    origin_chain_id: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: dict, origin_chain_id: Optional[int] = None) -> 'Proposal':
+        data = dict(data)
+        data['resource_id'] = HexBytes(data['resource_id'])
+        data['data_hash'] = HexBytes(data['data_hash'])
+        data['status'] = ProposalStatus(data['status'])
+        if data.get('origin_chain_id') is None:
+            data['origin_chain_id'] = origin_chain_id
+
+        return cls(**data)
+
+    @property
+    def key(self) -> Tuple[Optional[int], int]:
+        return self.origin_chain_id, self.deposit_nonce
 
     def as_dict(self):
         return asdict(self)
 
+    # A proposal is identified by its deposit, the other fields are its current state
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Proposal):
+            return NotImplemented
+        return self.key == other.key
+
     def __hash__(self):
-        return self.deposit_transaction_hash
+        return hash(self.key)
+
+
+class ProposalSet:
+    """
+    The watched proposals of one origin chain, keyed by deposit nonce so membership checks, additions and removals
+    do not depend on the number of watched proposals. Iterating returns a snapshot, so proposals can be removed
+    while iterating
+    """
+
+    def __init__(self, proposals: Iterable[Proposal] = ()):
+        self._proposals: Dict[int, Proposal] = {}
+        self._changed: Set[int] = set()
+        for proposal in proposals:
+            self.add(proposal)
+
+    def add(self, proposal: Proposal):
+        self._proposals[proposal.deposit_nonce] = proposal
+        self._changed.add(proposal.deposit_nonce)
+
+    def remove(self, proposal: Proposal):
+        del self._proposals[proposal.deposit_nonce]
+        self._changed.add(proposal.deposit_nonce)
+
+    def discard(self, proposal: Proposal):
+        if self._proposals.pop(proposal.deposit_nonce, None) is not None:
+            self._changed.add(proposal.deposit_nonce)
+
+    def take_changes(self) -> Tuple[List[Proposal], List[int]]:
+        """
+        The proposals added or replaced and the nonces removed since the last call
+        """
+        changed = [self._proposals[nonce] for nonce in self._changed if nonce in self._proposals]
+        removed = [nonce for nonce in self._changed if nonce not in self._proposals]
+        self._changed = set()
+
+        return changed, removed
+
+    def get(self, deposit_nonce: int) -> Optional[Proposal]:
+        return self._proposals.get(deposit_nonce)
+
+    def __contains__(self, proposal: Proposal) -> bool:
+        return proposal.deposit_nonce in self._proposals
+
+    def __iter__(self) -> Iterator[Proposal]:
+        return iter(list(self._proposals.values()))
+
+    def __len__(self) -> int:
+        return len(self._proposals)
+
+
+class NonceBacklog:
+    """
+    The deposit nonces of one direction that are on chain but whose proposals were not handled yet, as sorted,
+    non-overlapping ``[start, end)`` ranges. Slices are handed out newest first, so new deposits are handled
+    before older ones are backfilled, and only leave the backlog once their proposals were fetched
+    """
+
+    def __init__(self, ranges: Iterable[Sequence[int]] = ()):
+        self._ranges: List[Tuple[int, int]] = []
+        for start, end in ranges:
+            self.add(start, end)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'NonceBacklog':
+        return cls(data.get('ranges', []))
+
+    def as_dict(self) -> dict:
+        return {'ranges': [[start, end] for start, end in self._ranges]}
+
+    def add(self, start: int, end: int):
+        if end <= start:
+            return
+
+        merged = []
+        for range_start, range_end in sorted(self._ranges + [(start, end)]):
+            if len(merged) > 0 and range_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+
+        self._ranges = merged
+
+    def remove(self, start: int, end: int):
+        remaining = []
+        for range_start, range_end in self._ranges:
+            if range_end <= start or range_start >= end:
+                remaining.append((range_start, range_end))
+                continue
+            if range_start < start:
+                remaining.append((range_start, start))
+            if range_end > end:
+                remaining.append((end, range_end))
 
-    def __cmp__(self, other: 'Proposal'):
-        return other.deposit_transaction_hash == self.deposit_transaction_hash
+        self._ranges = remaining
+
+    def newest(self, count: int, batch_size: int) -> List[range]:
+        """
+        Up to ``count`` of the newest nonces, in ranges of at most ``batch_size`` nonces, newest first
+        """
+        slices = []
+        for start, end in reversed(self._ranges):
+            while end > start and count > 0:
+                size = min(batch_size, count, end - start)
+                slices.append(range(end - size, end))
+                end -= size
+                count -= size
+
+        return slices
+
+    def __len__(self) -> int:
+        return sum(end - start for start, end in self._ranges)
 
 
 class AlertType(str, Enum):
@@ -85,17 +230,45 @@ class Alert:
         return asdict(self)
 
 
+@dataclass
+class InFlightDeposit:
+    origin_chain_id: int
+    destination_chain_id: int
+    deposit_nonce: int
+    resource_id: str
+    # In the smallest unit of the token on the origin chain
+    amount: int
+    decimals: int
+    status: ProposalStatus
+
+    def as_dict(self):
+        return asdict(self)
+
+
 @dataclass
 class Bridge:
     contract: Contract
     chain_id: int
     handler: str
+    multicall_address: Optional[str] = None
+
+    def multicall_contract(self) -> Optional[Contract]:
+        if self.multicall_address is None:
+            return None
+
+        return self.contract.web3.eth.contract(address=self.multicall_address, abi=multicall_abi)
 
     def __setstate__(self, state):
         self.chain_id = state['chain_id']
         self.handler = state['handler']
+        self.multicall_address = state.get('multicall_address')
 
-        web3 = Web3(state['web3']['type'](state['web3']['arg1']))
+        if issubclass(state['web3']['type'], FailoverHTTPProvider):
+            web3 = connect(**state['web3']['arg1'])
+        elif issubclass(state['web3']['type'], Web3.HTTPProvider):
+            web3 = connect(state['web3']['arg1'])
+        else:
+            web3 = Web3(state['web3']['type'](state['web3']['arg1']))
 
         self.contract = web3.eth.contract(address=state['web3']['address'], abi=bridge_abi)
 
@@ -103,11 +276,12 @@ class Bridge:
         provider_type = type(self.contract.web3.provider)
         if isinstance(self.contract.web3.provider, Web3.HTTPProvider) or isinstance(self.contract.web3.provider, Web3.WebsocketProvider):
             p: Web3.HTTPProvider = self.contract.web3.provider
-            arg1 = p.endpoint_uri
+            arg1 = p.options if isinstance(p, FailoverHTTPProvider) else p.endpoint_uri
 
         return {
             'chain_id': self.chain_id,
             'handler': self.handler,
+            'multicall_address': self.multicall_address,
             'web3': {
                 'type': provider_type,
                 'arg1': arg1,
@@ -127,13 +301,94 @@ class BytesEncoder(json.JSONEncoder):
 
 @dataclass
 class MonitorState:
-    active_proposals: Dict[str, List[Proposal]]
-    passed_proposals: Dict[str, List[Proposal]]
-    resource_ids: List[str]
+    active_proposals: Dict[str, ProposalSet]
+    passed_proposals: Dict[str, ProposalSet]
+    resource_ids: Set[str]
     ava_deposit_count: int = 0
     eth_deposit_count: int = 0
+    # Block cursors of the event scans, by name (e.g. ``eth_votes``)
+    cursors: Dict[str, BlockCursor] = field(default_factory=dict)
+    # Nonces below the deposit counts still to handle, named like the deposit counts (``ava`` for eth -> ava)
+    nonce_backlogs: Dict[str, NonceBacklog] = field(default_factory=dict)
+    # Replaced by the ``*_proposal_events`` cursors, only read from older saved states
+    ava_proposal_event_block: InitVar[int] = 0
+    eth_proposal_event_block: InitVar[int] = 0
+    store: Optional[StateStore] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self, ava_proposal_event_block: int, eth_proposal_event_block: int):
+        # Saved states hold plain lists of proposal dicts
+        for proposals in (self.active_proposals, self.passed_proposals):
+            for chain_id, chain_proposals in proposals.items():
+                if not isinstance(chain_proposals, ProposalSet):
+                    proposals[chain_id] = ProposalSet(
+                        p if isinstance(p, Proposal) else Proposal.from_dict(p, int(chain_id))
+                        for p in chain_proposals
+                    )
+
+        self.resource_ids = set(self.resource_ids)
+        self._saved_resource_ids: Set[str] = set()
+
+        self.cursors = {name: c if isinstance(c, BlockCursor) else BlockCursor.from_dict(c)
+                        for name, c in self.cursors.items()}
+        self.nonce_backlogs = {name: b if isinstance(b, NonceBacklog) else NonceBacklog.from_dict(b)
+                               for name, b in self.nonce_backlogs.items()}
+        for name, block in (('ava_proposal_events', ava_proposal_event_block),
+                            ('eth_proposal_events', eth_proposal_event_block)):
+            if block > 0 and name not in self.cursors:
+                self.cursors[name] = BlockCursor(block=block)
+
+    def cursor(self, name: str) -> BlockCursor:
+        return self.cursors.setdefault(name, BlockCursor())
+
+    def nonce_backlog(self, name: str) -> NonceBacklog:
+        return self.nonce_backlogs.setdefault(name, NonceBacklog())
+
+    def as_dict(self) -> dict:
+        return {
+            'active_proposals': {chain_id: [p.as_dict() for p in proposals]
+                                 for chain_id, proposals in self.active_proposals.items()},
+            'passed_proposals': {chain_id: [p.as_dict() for p in proposals]
+                                 for chain_id, proposals in self.passed_proposals.items()},
+            'resource_ids': sorted(self.resource_ids),
+            'ava_deposit_count': self.ava_deposit_count,
+            'eth_deposit_count': self.eth_deposit_count,
+            'cursors': {name: c.as_dict() for name, c in self.cursors.items()},
+            'nonce_backlogs': {name: b.as_dict() for name, b in self.nonce_backlogs.items()},
+        }
+
+    def _take_changes(self) -> Tuple[List[Tuple[Tuple[str, int, int], dict]], List[Tuple[str, int, int]]]:
+        upserts = []
+        deletes = []
+        for watch, proposals in (('active', self.active_proposals), ('passed', self.passed_proposals)):
+            for chain_id, chain_proposals in proposals.items():
+                changed, removed = chain_proposals.take_changes()
+                upserts.extend(((watch, int(chain_id), p.deposit_nonce), p.as_dict()) for p in changed)
+                deletes.extend((watch, int(chain_id), nonce) for nonce in removed)
+
+        return upserts, deletes
+
+    def mark_saved(self):
+        """
+        Forget the pending changes, used once the state was loaded from the store
+        """
+        self._take_changes()
+        self._saved_resource_ids = set(self.resource_ids)
 
     def save(self):
+        if self.store is not None:
+            # Only the proposals and resource IDs that changed since the last save are written
+            upserts, deletes = self._take_changes()
+            new_resource_ids = self.resource_ids - self._saved_resource_ids
+
+            self.store.apply(upserts, deletes, new_resource_ids, {
+                'ava_deposit_count': self.ava_deposit_count,
+                'eth_deposit_count': self.eth_deposit_count,
+            }, {name: c.as_dict() for name, c in self.cursors.items()},
+                {name: b.as_dict() for name, b in self.nonce_backlogs.items()})
+
+            self._saved_resource_ids.update(new_resource_ids)
+            return
+
         save_state = Path('.state')
         if save_state.exists():
             backup_state = Path(f'.state.backup')
@@ -144,7 +399,7 @@ class MonitorState:
             save_state.rename(backup_state)
 
         with open(str(save_state.absolute()), mode='w') as f:
-            json.dump(asdict(self), f, cls=BytesEncoder)
+            json.dump(self.as_dict(), f, cls=BytesEncoder)
 
 
 @dataclass
@@ -153,18 +408,46 @@ class State:
     eth_bridge: Bridge
     ava_bridge: Bridge
     config: configparser.ConfigParser
+    deposits: Optional[DepositIndex] = None
+    workers: Optional['ProposalWorkers'] = None
+    # The settings every chain's scanner starts from, see chain_scanner
+    scanner: LogScanner = field(default_factory=LogScanner)
+    resources: ResourceRegistry = field(default_factory=lambda: ResourceRegistry(':memory:'))
+    proposal_cache: 'ProposalCache' = field(default_factory=lambda: ProposalCache())
+    scanners: Dict[int, LogScanner] = field(default_factory=dict)
+
+    def chain_scanner(self, bridge: Bridge) -> LogScanner:
+        """
+        The log scanner of the chain of ``bridge``. Every chain gets its own copy of ``scanner``, so the window size
+        one provider settles on does not carry over to the other chain
+        """
+        return self.scanners.setdefault(bridge.chain_id, copy.copy(self.scanner))
+
+
+def load_or_new_state(store: Optional[StateStore] = None) -> MonitorState:
+    """
+    Load the monitor state from ``store``. When the store is empty the state is read from the legacy ``.state``
+    JSON file (or started fresh) and written to the store in full on the first save
+    """
+    if store is not None and not store.is_empty():
+        data = store.load()
+        for watch in ('active_proposals', 'passed_proposals'):
+            for chain_id in ('1', '2'):
+                data[watch].setdefault(chain_id, [])
+
+        state = MonitorState(**data, store=store)
+        state.mark_saved()
+        return state
 
-
-def load_or_new_state() -> MonitorState:
     save_state = Path('.state')
     if not save_state.exists():
         return MonitorState(active_proposals={
-            '1': [],
-            '2': []
+            '1': ProposalSet(),
+            '2': ProposalSet()
         }, passed_proposals={
-            '1': [],
-            '2': []
-        }, resource_ids=[])
+            '1': ProposalSet(),
+            '2': ProposalSet()
+        }, resource_ids=set(), store=store)
 
     with open(str(save_state.absolute()), mode='r') as f:
         data = json.load(f)
@@ -172,7 +455,7 @@ def load_or_new_state() -> MonitorState:
     if 'imbalance_alerts' in data:
         del data['imbalance_alerts']
 
-    return MonitorState(**data)
+    return MonitorState(**data, store=store)
 
 
 def log_alert(message: str, atype: AlertType, related_object: Optional[Any] = None):
@@ -183,161 +466,436 @@ def log_alert(message: str, atype: AlertType, related_object: Optional[Any] = No
     logger.error(json.dumps(alert.as_dict(), cls=BytesEncoder))
 
 
-def fetch_proposal(origin_bridge: Bridge, destination_bridge: Bridge, nonce: int) -> Proposal:
-    try:
-        records = origin_bridge.contract.functions._depositRecords(nonce, destination_bridge.chain_id).call()
-
-        hash = Web3.solidityKeccak(['address', 'bytes'], [destination_bridge.handler, records])
-
-        raw_proposal = destination_bridge.contract.functions.getProposal(origin_bridge.chain_id, nonce, hash.hex()).call()
-
-        events = origin_bridge.contract.events.Deposit.getLogs(fromBlock=0, toBlock='latest', argument_filters={
-            'depositNonce': nonce
-        })
-
-        temp_proposal = Proposal(
-            resource_id=raw_proposal[0],
-            data_hash=raw_proposal[1],
-            yes_votes=raw_proposal[2],
-            no_votes=raw_proposal[3],
-            status=ProposalStatus(raw_proposal[4]),
-            proposed_block=raw_proposal[5],
-            deposit_nonce=nonce,
-            deposit_block=None,
-            deposit_transaction_hash=None
-        )
+def _build_proposal(origin_bridge: Bridge, destination_bridge: Bridge, nonce: int, raw_proposal: Any,
+                    deposits: List[DepositRecord]) -> Proposal:
+    temp_proposal = Proposal(
+        resource_id=raw_proposal[0],
+        data_hash=raw_proposal[1],
+        yes_votes=raw_proposal[2],
+        no_votes=raw_proposal[3],
+        status=ProposalStatus(raw_proposal[4]),
+        proposed_block=raw_proposal[5],
+        deposit_nonce=nonce,
+        deposit_block=None,
+        deposit_transaction_hash=None,
+        origin_chain_id=origin_bridge.chain_id
+    )
+
+    if len(deposits) == 0:
+        log_alert(f'Deposit {nonce} not found on Origin Chain {CHAIN_NAMES[origin_bridge.chain_id]}', AlertType.Internal, temp_proposal)
+        deposit_block = None
+        deposit_transaction_hash = None
+    elif len(deposits) > 1 or deposits[0].occurrences > 1:
+        log_alert(f'Multiple Deposit events with the nonce {nonce} found on Origin Chain {CHAIN_NAMES[origin_bridge.chain_id]}', AlertType.Internal, temp_proposal)
+        deposit_block = None
+        deposit_transaction_hash = None
+    else:
+        deposit = deposits[0]
 
-        if len(events) == 0:
-            log_alert(f'Deposit {nonce} not found on Origin Chain {CHAIN_NAMES[origin_bridge.chain_id]}', AlertType.Internal, temp_proposal)
+        if deposit.resource_id != raw_proposal[0]:
+            log_alert(f'Deposit event found, but proposal resource ID mismatch', AlertType.Internal, temp_proposal)
             deposit_block = None
             deposit_transaction_hash = None
-        elif len(events) > 1:
-            log_alert(f'Multiple Deposit events with the nonce {nonce} found on Origin Chain {CHAIN_NAMES[origin_bridge.chain_id]}', AlertType.Internal, temp_proposal)
+        elif deposit.destination_chain_id != destination_bridge.chain_id:
+            log_alert(f'Deposit event found, but proposal resource ID mismatch', AlertType.Internal, temp_proposal)
             deposit_block = None
             deposit_transaction_hash = None
         else:
-            event = events[0]
-
-            if event.args is not None:
-                if event.args.resourceID != raw_proposal[0]:
-                    log_alert(f'Deposit event found, but proposal resource ID mismatch', AlertType.Internal, temp_proposal)
-                    deposit_block = None
-                    deposit_transaction_hash = None
-                elif event.args.destinationChainID != destination_bridge.chain_id:
-                    log_alert(f'Deposit event found, but proposal resource ID mismatch', AlertType.Internal, temp_proposal)
-                    deposit_block = None
-                    deposit_transaction_hash = None
-                else:
-                    deposit_block = event.blockNumber
-                    deposit_transaction_hash = event.transactionHash
+            deposit_block = deposit.block_number
+            deposit_transaction_hash = deposit.transaction_hash
+
+    return Proposal(
+        resource_id=raw_proposal[0],
+        data_hash=raw_proposal[1],
+        yes_votes=raw_proposal[2],
+        no_votes=raw_proposal[3],
+        status=ProposalStatus(raw_proposal[4]),
+        proposed_block=raw_proposal[5],
+        deposit_nonce=nonce,
+        deposit_block=deposit_block,
+        deposit_transaction_hash=deposit_transaction_hash,
+        origin_chain_id=origin_bridge.chain_id
+    )
+
+
+def _find_deposits(origin_bridge: Bridge, destination_bridge: Bridge, nonces: List[int],
+                   deposit_index: Optional[DepositIndex]) -> Dict[int, List[DepositRecord]]:
+    deposits: Dict[int, List[DepositRecord]] = {nonce: [] for nonce in nonces}
+
+    missing = nonces
+    from_block = 0
+    if deposit_index is not None:
+        missing = []
+        for nonce in nonces:
+            record = deposit_index.lookup(origin_bridge.chain_id, destination_bridge.chain_id, nonce)
+            if record is None:
+                missing.append(nonce)
             else:
-                log_alert(f'Deposit event found, but unverified (no data in event)', AlertType.Internal, temp_proposal)
-                deposit_block = event.blockNumber
-                deposit_transaction_hash = event.transactionHash
-
-        return Proposal(
-            resource_id=raw_proposal[0],
-            data_hash=raw_proposal[1],
-            yes_votes=raw_proposal[2],
-            no_votes=raw_proposal[3],
-            status=ProposalStatus(raw_proposal[4]),
-            proposed_block=raw_proposal[5],
-            deposit_nonce=nonce,
-            deposit_block=deposit_block,
-            deposit_transaction_hash=deposit_transaction_hash
-        )
-    except requests.exceptions.HTTPError as e:
-        r: Response = e.response
-        if r.status_code == 429:
-            time.sleep(5)
-            return fetch_proposal(origin_bridge, destination_bridge, nonce)  # Try again
-        raise e
+                deposits[nonce].append(record)
+
+        last_block = deposit_index.last_block(origin_bridge.chain_id)
+        if last_block is not None:
+            from_block = last_block + 1
+
+    if len(missing) > 0:
+        # Only deposits newer than the last indexed block can be missing from the index
+        # Try the whole range in one request first, the scanner only splits it when the provider refuses
+        scanner = LogScanner(chunk_size=2 ** 32, max_chunk_size=2 ** 32)
+        events = scanner.get_logs(origin_bridge.contract.events.Deposit, from_block, 'latest', argument_filters={
+            'destinationChainID': destination_bridge.chain_id,
+            'depositNonce': missing
+        })
 
+        for event in events:
+            record = DepositRecord.from_event(origin_bridge.chain_id, event)
+            if record.deposit_nonce in deposits:
+                deposits[record.deposit_nonce].append(record)
 
-def find_all_new_proposals(current_state: State) -> Dict[str, List[Proposal]]:
-    logger = logging.getLogger('fetch_new_proposals')
+    return deposits
 
-    eth_bridge = current_state.eth_bridge
-    ava_bridge = current_state.ava_bridge
 
-    eth_bridge_contract = eth_bridge.contract
-    ava_bridge_contract = ava_bridge.contract
+def fetch_proposals(origin_bridge: Bridge, destination_bridge: Bridge, nonces: Sequence[int],
+                    batch_size: int = DEFAULT_BATCH_SIZE,
+                    deposit_index: Optional[DepositIndex] = None) -> List[Proposal]:
+    nonces = list(nonces)
+    if len(nonces) == 0:
+        return []
 
-    eth_chain_id = str(eth_bridge.chain_id)
-    ava_chain_id = str(ava_bridge.chain_id)
+    origin_web3 = origin_bridge.contract.web3
+    destination_web3 = destination_bridge.contract.web3
 
-    state = current_state.monitor
+    records = batch_call(origin_web3, [
+        origin_bridge.contract.functions._depositRecords(nonce, destination_bridge.chain_id)
+        for nonce in nonces
+    ], multicall=origin_bridge.multicall_contract(), batch_size=batch_size)
 
-    worker_count = int(current_state.config['monitor']['worker_count'])
-    use_multiprocessing = bool(current_state.config['monitor']['use_child_processes'])
+    hashes = [Web3.solidityKeccak(['address', 'bytes'], [destination_bridge.handler, record]) for record in records]
 
-    PoolClass = Pool if use_multiprocessing else ThreadPool
+    raw_proposals = batch_call(destination_web3, [
+        destination_bridge.contract.functions.getProposal(origin_bridge.chain_id, nonce, hash.hex())
+        for nonce, hash in zip(nonces, hashes)
+    ], multicall=destination_bridge.multicall_contract(), batch_size=batch_size)
 
-    logger.debug('Grabbing deposit counts')
+    deposits_by_nonce = _find_deposits(origin_bridge, destination_bridge, nonces, deposit_index)
 
-    # eth -> ava
-    ava_deposit_count = eth_bridge_contract.functions._depositCounts(ava_bridge.chain_id).call()
-    # ava -> eth
-    eth_deposit_count = ava_bridge_contract.functions._depositCounts(eth_bridge.chain_id).call()
+    return [
+        _build_proposal(origin_bridge, destination_bridge, nonce, raw_proposal, deposits_by_nonce[nonce])
+        for nonce, raw_proposal in zip(nonces, raw_proposals)
+    ]
 
-    logger.debug('ETH -> AVA Deposits: ' + str(ava_deposit_count))
-    logger.debug('AVA -> ETH Deposits: ' + str(eth_deposit_count))
 
-    proposals = {
-        eth_chain_id: [],
-        ava_chain_id: []
-    }
-    if state.ava_deposit_count > ava_deposit_count:
-        logger.error('Saved state has more deposit counts than what blockchain reported!')
-    elif state.ava_deposit_count < ava_deposit_count:
-        count = ava_deposit_count - state.ava_deposit_count
-        chunksize = int(count / worker_count)
+def fetch_proposal(origin_bridge: Bridge, destination_bridge: Bridge, nonce: int,
+                   deposit_index: Optional[DepositIndex] = None) -> Proposal:
+    return fetch_proposals(origin_bridge, destination_bridge, [nonce], deposit_index=deposit_index)[0]
+
+
+# Bridges and Deposit index of the current worker process, built once by _init_worker
+_worker_bridges: Dict[int, Bridge] = {}
+_worker_deposits: Optional[DepositIndex] = None
+
+
+class ProposalCache:
+    """
+    The proposals fetched during one monitor loop, keyed by (origin chain, deposit nonce). Vote checks, new proposal
+    discovery and the watched proposal checks all read through it, so a proposal is fetched at most once per loop.
+    The cache is cleared at the start of every loop
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._proposals: Dict[Tuple[int, int], Proposal] = {}
+
+    def clear(self):
+        with self._lock:
+            self._proposals = {}
+
+    def put(self, proposals: Iterable[Proposal]):
+        with self._lock:
+            for proposal in proposals:
+                self._proposals[proposal.key] = proposal
+
+    def fetch(self, origin_bridge: Bridge, destination_bridge: Bridge, nonces: Sequence[int],
+              batch_size: int = DEFAULT_BATCH_SIZE, deposit_index: Optional[DepositIndex] = None) -> List[Proposal]:
+        """
+        Same as ``fetch_proposals``, but only the proposals not fetched yet during this loop are requested
+        """
+        with self._lock:
+            missing = [nonce for nonce in dict.fromkeys(nonces)
+                       if (origin_bridge.chain_id, nonce) not in self._proposals]
+
+        self.put(fetch_proposals(origin_bridge, destination_bridge, missing, batch_size=batch_size,
+                                 deposit_index=deposit_index))
+
+        with self._lock:
+            return [self._proposals[(origin_bridge.chain_id, nonce)] for nonce in nonces]
+
 
-        if chunksize < 5:
-            PoolClass = ThreadPool
+def _init_worker(bridge_states: List[dict], deposit_index: Optional[DepositIndex],
+                 endpoint_rate_limits: Dict[str, Tuple[float, float]], policy: RetryPolicy):
+    global _worker_deposits
 
-        if chunksize >= 1:
-            with PoolClass(worker_count) as p:
-                new_eth_proposals = p.map(partial(fetch_proposal, eth_bridge, ava_bridge),
-                                          range(state.ava_deposit_count, ava_deposit_count),
-                                          chunksize=chunksize)
+    for endpoint_uri, (rate, burst) in endpoint_rate_limits.items():
+        set_rate_limit(endpoint_uri, rate, burst)
+    set_retry_policy(policy)
 
-                proposals[eth_chain_id] = new_eth_proposals
+    for bridge_state in bridge_states:
+        bridge = Bridge.__new__(Bridge)
+        bridge.__setstate__(bridge_state)
+        _worker_bridges[bridge.chain_id] = bridge
+
+    _worker_deposits = deposit_index
+
+
+def _fetch_in_worker(origin_chain_id: int, destination_chain_id: int, batch_size: int,
+                     nonces: range) -> List[Proposal]:
+    return fetch_proposals(_worker_bridges[origin_chain_id], _worker_bridges[destination_chain_id], nonces,
+                           batch_size=batch_size, deposit_index=_worker_deposits)
+
+
+class ProposalWorkers:
+    """
+    A pool of long-lived workers used to fetch proposals in parallel. The pool is created once when the monitor
+    starts. Child processes build their own Bridge objects (and HTTP sessions) a single time in the pool
+    initializer, so tasks only carry the chain IDs and the nonce range to fetch
+    """
+
+    def __init__(self, bridges: List[Bridge], worker_count: int, use_child_processes: bool,
+                 deposit_index: Optional[DepositIndex] = None):
+        self.use_child_processes = use_child_processes
+
+        if use_child_processes:
+            # Every process has its own token buckets, the endpoint rate is split between the workers
+            worker_rate_limits = {endpoint_uri: (rate / worker_count, max(1.0, burst / worker_count))
+                                  for endpoint_uri, (rate, burst) in rate_limits().items()}
+            self._pool = Pool(worker_count, initializer=_init_worker,
+                              initargs=([bridge.__getstate__() for bridge in bridges], deposit_index,
+                                        worker_rate_limits, retry_policy()))
         else:
-            proposals[eth_chain_id] = []
-            for nonce in range(state.ava_deposit_count, ava_deposit_count):
-                proposals[eth_chain_id].append(fetch_proposal(eth_bridge, ava_bridge, nonce))
+            # Threads share the parent's Bridge objects, nothing needs rebuilding
+            self._bridges = {bridge.chain_id: bridge for bridge in bridges}
+            self._deposits = deposit_index
+            self._pool = ThreadPool(worker_count)
+
+    def _fetch(self, origin_chain_id: int, destination_chain_id: int, batch_size: int,
+               nonces: range) -> List[Proposal]:
+        return fetch_proposals(self._bridges[origin_chain_id], self._bridges[destination_chain_id], nonces,
+                               batch_size=batch_size, deposit_index=self._deposits)
+
+    def fetch_slices(self, slices: List[Tuple[Bridge, Bridge, range]],
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> List[List[Proposal]]:
+        """
+        Fetch the proposals of every (origin bridge, destination bridge, nonces) slice, one slice per task in the
+        order given, so slices at the front of the list are fetched first. Returns the proposals of every slice
+        """
+        task = _fetch_in_worker if self.use_child_processes else self._fetch
+
+        return self._pool.starmap(task, [(origin_bridge.chain_id, destination_bridge.chain_id, batch_size, nonces)
+                                         for origin_bridge, destination_bridge, nonces in slices], chunksize=1)
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+
+def _config_prefix(current_state: State, bridge: Bridge) -> str:
+    return 'eth' if bridge.chain_id == current_state.eth_bridge.chain_id else 'ava'
+
+
+def sync_chain_deposit_index(current_state: State, bridge: Bridge):
+    logger = logging.getLogger('sync_deposit_index')
+
+    if current_state.deposits is None:
+        return
+
+    prefix = _config_prefix(current_state, bridge)
+    start_block = int(current_state.config['monitor'].get(f'{prefix}_bridge_start_block', 0))
+    confirmations = int(current_state.config['monitor'].get('event_confirmations', 0))
+
+    logger.debug(f'Syncing {CHAIN_NAMES[bridge.chain_id]} Deposit events')
+    current_state.deposits.sync(bridge.contract, bridge.chain_id, start_block=start_block,
+                                scanner=current_state.chain_scanner(bridge), confirmations=confirmations)
+
+
+def sync_deposit_index(current_state: State):
+    sync_chain_deposit_index(current_state, current_state.eth_bridge)
+    sync_chain_deposit_index(current_state, current_state.ava_bridge)
+
+
+def _saved_deposit_count(current_state: State, destination_bridge: Bridge) -> int:
+    # Deposit counts are saved under the destination chain, eth -> ava deposits are ava_deposit_count
+    return getattr(current_state.monitor, f'{_config_prefix(current_state, destination_bridge)}_deposit_count')
+
+
+def save_deposit_count(current_state: State, destination_bridge: Bridge, deposit_count: int):
+    setattr(current_state.monitor, f'{_config_prefix(current_state, destination_bridge)}_deposit_count', deposit_count)
+
+
+def nonce_backlog(current_state: State, destination_bridge: Bridge) -> NonceBacklog:
+    # Named like the deposit counts, the eth -> ava backlog is ava
+    return current_state.monitor.nonce_backlog(_config_prefix(current_state, destination_bridge))
+
+
+def _report_processed(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge):
+    processed = _saved_deposit_count(current_state, destination_bridge) - \
+        len(nonce_backlog(current_state, destination_bridge))
 
-    if state.eth_deposit_count > eth_deposit_count:
+    metrics.set_deposit_counts(CHAIN_NAMES[origin_bridge.chain_id], CHAIN_NAMES[destination_bridge.chain_id],
+                               processed=processed)
+
+
+def schedule_new_deposits(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge) -> int:
+    """
+    Add the deposits made on ``origin_bridge`` towards ``destination_bridge`` since the saved deposit count to the
+    nonce backlog of the direction, and move the saved count up to the on-chain count. Returns the on-chain count
+    """
+    logger = logging.getLogger('fetch_new_proposals')
+
+    origin_name = CHAIN_NAMES[origin_bridge.chain_id]
+    destination_name = CHAIN_NAMES[destination_bridge.chain_id]
+
+    logger.debug(f'Grabbing {origin_name} -> {destination_name} deposit count')
+
+    deposit_count = origin_bridge.contract.functions._depositCounts(destination_bridge.chain_id).call()
+    saved_deposit_count = _saved_deposit_count(current_state, destination_bridge)
+
+    logger.debug(f'{origin_name} -> {destination_name} Deposits: {deposit_count}')
+
+    if saved_deposit_count > deposit_count:
         logger.error('Saved state has more deposit counts than what blockchain reported!')
-    elif state.eth_deposit_count < eth_deposit_count:
-        count = ava_deposit_count - state.ava_deposit_count
-        chunksize = int(count / worker_count)
-        if chunksize < 5:
-            PoolClass = ThreadPool
-
-        if chunksize >= 1:
-            with PoolClass(worker_count) as p:
-                new_ava_proposals = p.map(partial(fetch_proposal, ava_bridge, eth_bridge),
-                                          range(state.eth_deposit_count, eth_deposit_count),
-                                          chunksize=chunksize)
-                proposals[ava_chain_id] = new_ava_proposals
+    elif saved_deposit_count < deposit_count:
+        # Deposit nonces start at 1, the newest deposit has the nonce of the deposit count
+        nonce_backlog(current_state, destination_bridge).add(saved_deposit_count + 1, deposit_count + 1)
+        save_deposit_count(current_state, destination_bridge, deposit_count)
+
+    metrics.set_deposit_counts(origin_name, destination_name, on_chain=deposit_count)
+    _report_processed(current_state, origin_bridge, destination_bridge)
+
+    return deposit_count
+
+
+def schedule_nonces(current_state: State,
+                    directions: List[Tuple[Bridge, Bridge]]) -> List[Tuple[Bridge, Bridge, range]]:
+    """
+    The (origin bridge, destination bridge, nonces) slices to fetch during this loop. Every direction hands out its
+    newest nonces first, and the directions take turns, so new deposits of both directions are alerted on before
+    older ones are backfilled. At most ``max_nonces_per_loop`` nonces are scheduled, 0 schedules the whole backlog
+    """
+    config = current_state.config['monitor']
+    batch_size = int(config.get('batch_size', DEFAULT_BATCH_SIZE))
+    max_nonces = int(config.get('max_nonces_per_loop', DEFAULT_MAX_NONCES_PER_LOOP))
+
+    backlogs = [nonce_backlog(current_state, destination_bridge) for _, destination_bridge in directions]
+    if max_nonces <= 0:
+        max_nonces = sum(len(backlog) for backlog in backlogs)
+
+    queues = [[(origin_bridge, destination_bridge, nonces) for nonces in backlog.newest(max_nonces, batch_size)]
+              for (origin_bridge, destination_bridge), backlog in zip(directions, backlogs)]
+
+    slices = []
+    for turn in zip_longest(*queues):
+        for task in turn:
+            if task is None or max_nonces <= 0:
+                continue
+
+            origin_bridge, destination_bridge, nonces = task
+            # Keep the newest nonces of a slice that does not fit anymore
+            nonces = nonces[max(0, len(nonces) - max_nonces):]
+            slices.append((origin_bridge, destination_bridge, nonces))
+            max_nonces -= len(nonces)
+
+    return slices
+
+
+def fetch_scheduled_proposals(current_state: State,
+                              directions: List[Tuple[Bridge, Bridge]]) -> Dict[str, List[Proposal]]:
+    """
+    Schedule the new deposits of every (origin bridge, destination bridge) direction and fetch the proposals of the
+    scheduled nonces, keyed by origin chain ID. The nonces stay in the backlog until ``complete_new_proposals`` is
+    called once the proposals are watched
+    """
+    batch_size = int(current_state.config['monitor'].get('batch_size', DEFAULT_BATCH_SIZE))
+
+    for origin_bridge, destination_bridge in directions:
+        schedule_new_deposits(current_state, origin_bridge, destination_bridge)
+
+    slices = schedule_nonces(current_state, directions)
+
+    if len(slices) > 1 and current_state.workers is not None:
+        results = current_state.workers.fetch_slices(slices, batch_size)
+    else:
+        results = [fetch_proposals(origin_bridge, destination_bridge, nonces, batch_size=batch_size,
+                                   deposit_index=current_state.deposits)
+                   for origin_bridge, destination_bridge, nonces in slices]
+
+    proposals = {str(origin_bridge.chain_id): [] for origin_bridge, _ in directions}
+    for (origin_bridge, _, _), slice_proposals in zip(slices, results):
+        current_state.proposal_cache.put(slice_proposals)
+        proposals[str(origin_bridge.chain_id)].extend(slice_proposals)
+
+    return proposals
+
+
+def _nonce_runs(nonces: Iterable[int]) -> List[Tuple[int, int]]:
+    runs = []
+    for nonce in sorted(set(nonces)):
+        if len(runs) > 0 and runs[-1][1] == nonce:
+            runs[-1] = (runs[-1][0], nonce + 1)
         else:
-            proposals[ava_chain_id] = []
-            for nonce in range(state.eth_deposit_count, eth_deposit_count):
-                proposals[ava_chain_id].append(fetch_proposal(ava_bridge, eth_bridge, nonce))
+            runs.append((nonce, nonce + 1))
 
-    state.ava_deposit_count = ava_deposit_count
-    state.eth_deposit_count = eth_deposit_count
+    return runs
 
-    # Save new resource ids
-    for proposal in proposals[eth_chain_id]:
-        if proposal.resource_id.hex() not in state.resource_ids:
-            state.resource_ids.append(proposal.resource_id.hex())
 
-    for proposal in proposals[ava_chain_id]:
-        if proposal.resource_id.hex() not in state.resource_ids:
-            state.resource_ids.append(proposal.resource_id.hex())
+def complete_new_proposals(current_state: State, proposals: Dict[str, List[Proposal]]):
+    """
+    Take the nonces of ``proposals`` out of their backlogs. Call it once the proposals are watched and before the
+    state is saved, so the watched proposals and the backlog are checkpointed in the same transaction and a loop
+    failing in between fetches the same nonces again
+    """
+    logger = logging.getLogger('fetch_new_proposals')
+
+    for origin_bridge, destination_bridge in ((current_state.eth_bridge, current_state.ava_bridge),
+                                              (current_state.ava_bridge, current_state.eth_bridge)):
+        chain_proposals = proposals.get(str(origin_bridge.chain_id), [])
+        if len(chain_proposals) == 0:
+            continue
+
+        backlog = nonce_backlog(current_state, destination_bridge)
+        for start, end in _nonce_runs(proposal.deposit_nonce for proposal in chain_proposals):
+            backlog.remove(start, end)
+
+        _report_processed(current_state, origin_bridge, destination_bridge)
+
+        if len(backlog) > 0:
+            logger.info(f'{len(backlog)} {CHAIN_NAMES[origin_bridge.chain_id]} -> '
+                        f'{CHAIN_NAMES[destination_bridge.chain_id]} deposits left to backfill')
+
+
+def find_new_proposals(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge) -> List[Proposal]:
+    """
+    Fetch the proposals of the newest unhandled deposits made on ``origin_bridge`` towards ``destination_bridge``,
+    see ``fetch_scheduled_proposals``
+    """
+    return fetch_scheduled_proposals(current_state, [(origin_bridge, destination_bridge)])[str(origin_bridge.chain_id)]
+
+
+def save_resource_ids(current_state: State, proposals: Dict[str, List[Proposal]]):
+    state = current_state.monitor
+
+    for chain_proposals in proposals.values():
+        for proposal in chain_proposals:
+            state.resource_ids.add(proposal.resource_id.hex())
+
+
+def find_all_new_proposals(current_state: State) -> Dict[str, List[Proposal]]:
+    eth_bridge = current_state.eth_bridge
+    ava_bridge = current_state.ava_bridge
+
+    # eth -> ava and ava -> eth, both directions share the fetch budget and the workers of the loop
+    proposals = fetch_scheduled_proposals(current_state, [(eth_bridge, ava_bridge), (ava_bridge, eth_bridge)])
+
+    # Save new resource ids
+    save_resource_ids(current_state, proposals)
 
     return proposals
 
@@ -387,13 +945,13 @@ def watch_active_proposals(current_state: State, proposals: Dict[str, List[Propo
 
     for proposal in proposals[eth_chain_id]:
         if proposal.status == ProposalStatus.Active and proposal not in current_state.monitor.active_proposals[eth_chain_id]:
-            current_state.monitor.active_proposals[eth_chain_id].append(proposal)
+            current_state.monitor.active_proposals[eth_chain_id].add(proposal)
 
     logger.debug('Searching for new active proposals on Avalanche')
 
     for proposal in proposals[ava_chain_id]:
         if proposal.status == ProposalStatus.Active and proposal not in current_state.monitor.active_proposals[ava_chain_id]:
-            current_state.monitor.active_proposals[ava_chain_id].append(proposal)
+            current_state.monitor.active_proposals[ava_chain_id].add(proposal)
 
 
 def watch_passed_proposals(current_state: State, proposals: Dict[str, List[Proposal]]):
@@ -409,7 +967,7 @@ def watch_passed_proposals(current_state: State, proposals: Dict[str, List[Propo
 
     for proposal in proposals[eth_chain_id]:
         if proposal.status == ProposalStatus.Active and proposal not in current_state.monitor.passed_proposals[eth_chain_id]:
-            current_state.monitor.passed_proposals[eth_chain_id].append(proposal)
+            current_state.monitor.passed_proposals[eth_chain_id].add(proposal)
 
             logger.debug("Checking if we are already watching the active proposal")
 
@@ -418,140 +976,500 @@ def watch_passed_proposals(current_state: State, proposals: Dict[str, List[Propo
 
     for proposal in proposals[ava_chain_id]:
         if proposal.status == ProposalStatus.Active and proposal not in current_state.monitor.passed_proposals[ava_chain_id]:
-            current_state.monitor.passed_proposals[ava_chain_id].append(proposal)
+            current_state.monitor.passed_proposals[ava_chain_id].add(proposal)
 
 
-def check_active_proposals(current_state: State):
-    logger = logging.getLogger('check_active_proposals')
+def event_cursor(current_state: State, bridge: Bridge, name: str) -> BlockCursor:
+    """
+    The persisted cursor of the ``name`` event scan on the chain of ``bridge``
+    """
+    return current_state.monitor.cursor(f'{_config_prefix(current_state, bridge)}_{name}')
 
-    active_proposal_block_alert = int(current_state.config['monitor']['active_proposal_block_alert'])
 
-    eth_bridge = current_state.eth_bridge
-    ava_bridge = current_state.ava_bridge
+def next_block_range(current_state: State, bridge: Bridge, name: str) -> Optional[Tuple[int, int]]:
+    """
+    The blocks the ``name`` event scan on the chain of ``bridge`` should cover next, ``event_confirmations`` blocks
+    behind the head. Blocks replaced by a reorg since the last scan are included again
+    """
+    confirmations = int(current_state.config['monitor'].get('event_confirmations', 0))
 
-    eth_chain_id = str(eth_bridge.chain_id)
-    ava_chain_id = str(ava_bridge.chain_id)
+    return event_cursor(current_state, bridge, name).next_range(bridge.contract.web3, confirmations)
 
-    eth_latest_block = current_state.eth_bridge.contract.web3.eth.block_number
-    ava_latest_block = current_state.ava_bridge.contract.web3.eth.block_number
 
-    if len(current_state.monitor.active_proposals[eth_chain_id]) > 0:
-        logger.debug('Checking active Ethereum proposals')
+def tracks_proposal_events(current_state: State) -> bool:
+    # Subscriptions deliver every ProposalEvent, polling the watched proposals would only repeat them
+    monitor_config = current_state.config['monitor']
+    return monitor_config.getboolean('track_proposal_events', fallback=False) or \
+        monitor_config.getboolean('use_subscriptions', fallback=False)
 
-        for proposal in current_state.monitor.active_proposals[eth_chain_id][:]:
-            current_proposal_state = fetch_proposal(current_state.eth_bridge, current_state.ava_bridge, proposal.deposit_nonce)
 
-            if current_proposal_state.status != proposal.status:
-                current_state.monitor.active_proposals[eth_chain_id].remove(proposal)
-                if current_proposal_state.status == ProposalStatus.Passed:
-                    current_state.monitor.passed_proposals[eth_chain_id].append(current_proposal_state)
-                continue
+def track_chain_proposal_events(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge):
+    """
+    Apply the status changes of proposals for deposits made on ``origin_bridge`` from the ProposalEvent logs emitted
+    by ``destination_bridge`` since the last scanned block. Watched proposals move from active to passed or stop
+    being watched without polling getProposal, which is only called for proposals that show up in the logs but are
+    not watched yet
+    """
+    logger = logging.getLogger('track_proposal_events')
 
-            block_elapsed = eth_latest_block - current_proposal_state.proposed_block
+    chain_name = CHAIN_NAMES[origin_bridge.chain_id]
 
-            if block_elapsed >= active_proposal_block_alert:
-                log_alert(f'[Ethereum] Proposal has remained active for {block_elapsed} blocks',
-                          AlertType.ProposalNotVoted, proposal)
-            else:
-                logger.debug(f"Proposal has remained pass for {block_elapsed} blocks")
-    else:
-        logger.debug("Not watching any Ethereum proposals")
+    # The cursor is a block of the destination chain, so it is saved under the destination like the deposit counts
+    block_range = next_block_range(current_state, destination_bridge, 'proposal_events')
+    if block_range is None:
+        return
+
+    from_block, to_block = block_range
+
+    scanner = current_state.chain_scanner(destination_bridge)
+    events = scanner.get_logs(destination_bridge.contract.events.ProposalEvent, from_block, to_block,
+                              argument_filters={'originChainID': origin_bridge.chain_id})
+
+    logger.debug(f'Applying {len(events)} {chain_name} ProposalEvent logs')
+
+    apply_proposal_events(current_state, origin_bridge, destination_bridge, events)
+
+    event_cursor(current_state, destination_bridge, 'proposal_events').advance_to(destination_bridge.contract.web3,
+                                                                                  to_block)
+
+
+def apply_proposal_events(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge,
+                          events: Iterable[EventData]):
+    """
+    Apply the status changes of ProposalEvent logs emitted by ``destination_bridge`` for deposits made on
+    ``origin_bridge`` to the watched proposals, in log order
+    """
+    batch_size = int(current_state.config['monitor'].get('batch_size', DEFAULT_BATCH_SIZE))
+
+    chain_id = str(origin_bridge.chain_id)
+
+    active = current_state.monitor.active_proposals[chain_id]
+    passed = current_state.monitor.passed_proposals[chain_id]
+
+    unwatched: Dict[int, ProposalStatus] = {}
+    for event in events:
+        nonce = event.args.depositNonce
+        status = ProposalStatus(event.args.status)
+
+        proposal = active.get(nonce)
+        if proposal is not None:
+            if status != ProposalStatus.Active:
+                active.remove(proposal)
+                if status == ProposalStatus.Passed:
+                    passed.add(replace(proposal, status=status))
+            continue
+
+        proposal = passed.get(nonce)
+        if proposal is not None:
+            if status != ProposalStatus.Passed:
+                passed.remove(proposal)
+            continue
+
+        if status in (ProposalStatus.Active, ProposalStatus.Passed):
+            unwatched[nonce] = status
+        else:
+            unwatched.pop(nonce, None)
+
+    if len(unwatched) > 0:
+        for proposal in current_state.proposal_cache.fetch(origin_bridge, destination_bridge, sorted(unwatched),
+                                                           batch_size=batch_size,
+                                                           deposit_index=current_state.deposits):
+            if proposal.status == ProposalStatus.Active:
+                active.add(proposal)
+            elif proposal.status == ProposalStatus.Passed:
+                passed.add(proposal)
+
+
+def track_proposal_events(current_state: State):
+    track_chain_proposal_events(current_state, current_state.eth_bridge, current_state.ava_bridge)
+    track_chain_proposal_events(current_state, current_state.ava_bridge, current_state.eth_bridge)
+
+
+def check_chain_active_proposals(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge):
+    logger = logging.getLogger('check_active_proposals')
+
+    active_proposal_block_alert = int(current_state.config['monitor']['active_proposal_block_alert'])
+    batch_size = int(current_state.config['monitor'].get('batch_size', DEFAULT_BATCH_SIZE))
 
-    if len(current_state.monitor.active_proposals[ava_chain_id]) > 0:
-        logger.debug('Checking active Avalanche proposals')
+    chain_id = str(origin_bridge.chain_id)
+    chain_name = CHAIN_NAMES[origin_bridge.chain_id]
 
-        for proposal in current_state.monitor.active_proposals[ava_chain_id][:]:
-            current_proposal_state = fetch_proposal(current_state.ava_bridge, current_state.eth_bridge, proposal.deposit_nonce)
+    if len(current_state.monitor.active_proposals[chain_id]) > 0:
+        logger.debug(f'Checking active {chain_name} proposals')
 
+        latest_block = origin_bridge.contract.web3.eth.block_number
+
+        watched = list(current_state.monitor.active_proposals[chain_id])
+        if tracks_proposal_events(current_state):
+            # Status changes were already applied from the ProposalEvent logs
+            current_proposal_states = watched
+        else:
+            current_proposal_states = current_state.proposal_cache.fetch(
+                origin_bridge, destination_bridge, [proposal.deposit_nonce for proposal in watched],
+                batch_size=batch_size, deposit_index=current_state.deposits)
+
+        for proposal, current_proposal_state in zip(watched, current_proposal_states):
             if current_proposal_state.status != proposal.status:
-                current_state.monitor.active_proposals[ava_chain_id].remove(proposal)
+                current_state.monitor.active_proposals[chain_id].remove(proposal)
                 if current_proposal_state.status == ProposalStatus.Passed:
-                    current_state.monitor.passed_proposals[ava_chain_id].append(current_proposal_state)
+                    current_state.monitor.passed_proposals[chain_id].add(current_proposal_state)
                 continue
 
-            block_elapsed = ava_latest_block - current_proposal_state.proposed_block
+            block_elapsed = latest_block - current_proposal_state.proposed_block
 
             if block_elapsed >= active_proposal_block_alert:
-                log_alert(f'[Avalanche] Proposal has remained active for {block_elapsed} blocks',
+                log_alert(f'[{chain_name}] Proposal has remained active for {block_elapsed} blocks',
                           AlertType.ProposalNotVoted, proposal)
             else:
                 logger.debug(f"Proposal has remained pass for {block_elapsed} blocks")
     else:
-        logger.debug("Not watching any Avalanche proposals")
+        logger.debug(f"Not watching any {chain_name} proposals")
 
 
-def check_passed_proposals(current_state: State):
+def check_active_proposals(current_state: State):
+    check_chain_active_proposals(current_state, current_state.eth_bridge, current_state.ava_bridge)
+    check_chain_active_proposals(current_state, current_state.ava_bridge, current_state.eth_bridge)
+
+
+def check_chain_passed_proposals(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge):
     logger = logging.getLogger('check_active_proposals')
 
     passed_proposal_block_alert = int(current_state.config['monitor']['passed_proposal_block_alert'])
+    batch_size = int(current_state.config['monitor'].get('batch_size', DEFAULT_BATCH_SIZE))
 
-    eth_bridge = current_state.eth_bridge
-    ava_bridge = current_state.ava_bridge
+    chain_id = str(origin_bridge.chain_id)
+    chain_name = CHAIN_NAMES[origin_bridge.chain_id]
 
-    eth_chain_id = str(eth_bridge.chain_id)
-    ava_chain_id = str(ava_bridge.chain_id)
+    if len(current_state.monitor.passed_proposals[chain_id]) > 0:
+        logger.debug(f'Checking passed {chain_name} proposals')
 
-    eth_latest_block = current_state.eth_bridge.contract.web3.eth.block_number
-    ava_latest_block = current_state.ava_bridge.contract.web3.eth.block_number
+        latest_block = origin_bridge.contract.web3.eth.block_number
 
-    if len(current_state.monitor.passed_proposals[eth_chain_id]) > 0:
-        logger.debug('Checking passed Ethereum proposals')
-
-        for proposal in current_state.monitor.passed_proposals[eth_chain_id][:]:
-            current_proposal_state = fetch_proposal(current_state.eth_bridge, current_state.ava_bridge, proposal.deposit_nonce)
+        watched = list(current_state.monitor.passed_proposals[chain_id])
+        if tracks_proposal_events(current_state):
+            # Status changes were already applied from the ProposalEvent logs
+            current_proposal_states = watched
+        else:
+            current_proposal_states = current_state.proposal_cache.fetch(
+                origin_bridge, destination_bridge, [proposal.deposit_nonce for proposal in watched],
+                batch_size=batch_size, deposit_index=current_state.deposits)
 
+        for proposal, current_proposal_state in zip(watched, current_proposal_states):
             if current_proposal_state.status != proposal.status:
-                current_state.monitor.passed_proposals[eth_chain_id].remove(proposal)
+                current_state.monitor.passed_proposals[chain_id].remove(proposal)
                 continue
 
-            block_elapsed = eth_latest_block - current_proposal_state.proposed_block
+            block_elapsed = latest_block - current_proposal_state.proposed_block
 
             if block_elapsed >= passed_proposal_block_alert:
-                log_alert(f'[Ethereum] Proposal has remained passed for {block_elapsed} blocks',
+                log_alert(f'[{chain_name}] Proposal has remained passed for {block_elapsed} blocks',
                           AlertType.ProposalExpired, proposal)
             else:
                 logger.debug(f"Proposal has remained pass for {block_elapsed} blocks")
     else:
-        logger.debug("Not watching any Ethereum proposals")
+        logger.debug(f"Not watching any {chain_name} proposals")
+
 
-    if len(current_state.monitor.passed_proposals[ava_chain_id]) > 0:
-        logger.debug('Checking passed Avalanche proposals')
+def check_passed_proposals(current_state: State):
+    check_chain_passed_proposals(current_state, current_state.eth_bridge, current_state.ava_bridge)
+    check_chain_passed_proposals(current_state, current_state.ava_bridge, current_state.eth_bridge)
 
-        for proposal in current_state.monitor.passed_proposals[ava_chain_id][:]:
-            current_proposal_state = fetch_proposal(current_state.ava_bridge, current_state.eth_bridge, proposal.deposit_nonce)
 
-            if current_proposal_state.status != proposal.status:
-                current_state.monitor.passed_proposals[ava_chain_id].remove(proposal)
-                continue
+def check_chain_vote_events(current_state: State, bridge: Bridge):
+    """
+    Alert on the ProposalVote logs emitted by ``bridge`` since the last scanned block. The cursor only moves once
+    the alerts were raised, so a failed check is retried on the next loop
+    """
+    block_range = next_block_range(current_state, bridge, 'votes')
+    if block_range is None:
+        return
 
-            block_elapsed = ava_latest_block - current_proposal_state.proposed_block
+    from_block, to_block = block_range
 
-            if block_elapsed >= passed_proposal_block_alert:
-                log_alert(f'[Avalanche] Proposal has remained passed for {block_elapsed} blocks',
-                          AlertType.ProposalExpired, proposal)
-            else:
-                logger.debug(f"Proposal has remained pass for {block_elapsed} blocks")
-    else:
-        logger.debug("Not watching any Avalanche proposals")
+    # After downtime the range can be large, let the scanner split it into windows the provider accepts
+    scanner = current_state.chain_scanner(bridge)
+    check_vote_event(current_state, scanner.get_logs(bridge.contract.events.ProposalVote, from_block, to_block))
+
+    event_cursor(current_state, bridge, 'votes').advance_to(bridge.contract.web3, to_block)
 
 
 def check_vote_event(state: State, event_filter: Iterable[EventData]):
-    for event in event_filter:
-        nonce = event.args.depositNonce
-        origin = event.args.originChainID
+    batch_size = int(state.config['monitor'].get('batch_size', DEFAULT_BATCH_SIZE))
+
+    events = list(event_filter)
+
+    # A proposal reaching its threshold gets one vote per relayer, fetch each voted proposal once
+    nonces_by_origin: Dict[int, List[int]] = {}
+    for event in events:
+        nonces_by_origin.setdefault(event.args.originChainID, []).append(event.args.depositNonce)
+
+    proposals: Dict[Tuple[int, int], Proposal] = {}
+    for origin, nonces in nonces_by_origin.items():
         destination = 1 if origin == 2 else 2
 
         origin_bridge = state.eth_bridge if origin == 1 else state.ava_bridge
         dst_bridge = state.eth_bridge if destination == 1 else state.ava_bridge
 
-        proposal = fetch_proposal(origin_bridge, dst_bridge, nonce)
+        for nonce, proposal in zip(nonces, state.proposal_cache.fetch(origin_bridge, dst_bridge, nonces,
+                                                                      batch_size=batch_size,
+                                                                      deposit_index=state.deposits)):
+            proposals[(origin, nonce)] = proposal
+
+    for event in events:
+        proposal = proposals[(event.args.originChainID, event.args.depositNonce)]
 
         log_alert('New vote for proposal', AlertType.ProposalVoted, proposal)
 
 
-def check_for_imbalances(current_state: State):
+TOKEN_ABIS = {
+    'standard': erc20_abi,
+    'nonstandard': erc20_nonstandard_abi,
+}
+
+
+@lru_cache(maxsize=None)
+def _token_contract(web3: Web3, token_address: str, abi_variant: str) -> Contract:
+    return web3.eth.contract(address=token_address, abi=TOKEN_ABIS[abi_variant])
+
+
+def _read_resource(bridge: Bridge, resource_id: str) -> Optional[ResourceRecord]:
     logger = logging.getLogger('check_for_imbalances')
 
+    web3 = bridge.contract.web3
+    chain_name = CHAIN_NAMES[bridge.chain_id]
+
+    handler_address = bridge.contract.functions._resourceIDToHandlerAddress(resource_id).call()
+    if handler_address == ZERO_ADDRESS:
+        return None
+
+    handler = web3.eth.contract(address=handler_address, abi=handler_abi)
+    token_address = handler.functions._resourceIDToTokenContractAddress(resource_id).call()
+
+    abi_variant = 'standard'
+    token = _token_contract(web3, token_address, abi_variant)
+    try:
+        name = token.functions.name().call()
+    except OverflowError as e:
+        abi_variant = 'nonstandard'
+        token = _token_contract(web3, token_address, abi_variant)
+        try:
+            name = token.functions.name().call()
+        except Exception as e:
+            logger.warning(f"Could not decode token name for {chain_name} token contract {token_address}")
+            logger.error(e)
+            name = "~Unknown~"
+
+    try:
+        symbol = token.functions.symbol().call()
+    except Exception as e:
+        logger.warning(f"Could not decode token symbol for {chain_name} token contract {token_address}")
+        logger.error(e)
+        symbol = "~Unknown~"
+
+    try:
+        decimals = token.functions.decimals().call()
+    except Exception as e:
+        logger.warning(f"Could not read token decimals for {chain_name} token contract {token_address}, assuming 18")
+        logger.error(e)
+        decimals = 18
+
+    if isinstance(name, bytes):
+        name = name.rstrip(b'\x00').decode('utf-8', errors='replace')
+    if isinstance(symbol, bytes):
+        symbol = symbol.rstrip(b'\x00').decode('utf-8', errors='replace')
+
+    return ResourceRecord(
+        chain_id=bridge.chain_id,
+        resource_id=resource_id,
+        handler_address=handler_address,
+        token_address=token_address,
+        abi_variant=abi_variant,
+        name=name,
+        symbol=symbol,
+        decimals=decimals,
+    )
+
+
+def resolve_resource(current_state: State, bridge: Bridge, resource_id: str) -> Optional[ResourceRecord]:
+    """
+    The handler and token of ``resource_id`` on ``bridge``'s chain, read from the resource registry when known.
+    Returns None while the resource is not registered on that chain
+    """
+    resource_id = canonical_resource_id(resource_id)
+    record = current_state.resources.get(bridge.chain_id, resource_id)
+    if record is not None:
+        return record
+
+    record = _read_resource(bridge, resource_id)
+    if record is not None:
+        current_state.resources.put(record)
+
+    return record
+
+
+def revalidate_resources(current_state: State, bridge: Bridge):
+    """
+    Re-read the handler and token address of every cached resource of ``bridge``'s chain that was not checked for
+    ``resource_revalidate_interval`` seconds, and drop the entries an admin re-registered since. The bridge does not
+    emit an event when a resource is set, so this is the only way a stale entry is noticed
+    """
+    logger = logging.getLogger('check_for_imbalances')
+
+    interval = float(current_state.config['monitor'].get('resource_revalidate_interval', 3600))
+    batch_size = int(current_state.config['monitor'].get('batch_size', DEFAULT_BATCH_SIZE))
+
+    now = time.time()
+    stale = [r for r in current_state.resources.records()
+             if r.chain_id == bridge.chain_id and now - r.checked_at >= interval]
+
+    if len(stale) == 0:
+        return
+
+    web3 = bridge.contract.web3
+    multicall = bridge.multicall_contract()
+
+    handler_addresses = batch_call(web3, [
+        bridge.contract.functions._resourceIDToHandlerAddress(r.resource_id) for r in stale
+    ], multicall=multicall, batch_size=batch_size)
+
+    token_addresses = batch_call(web3, [
+        web3.eth.contract(address=r.handler_address, abi=handler_abi).functions._resourceIDToTokenContractAddress(
+            r.resource_id) for r in stale
+    ], multicall=multicall, batch_size=batch_size)
+
+    for record, handler_address, token_address in zip(stale, handler_addresses, token_addresses):
+        if handler_address != record.handler_address or token_address != record.token_address:
+            logger.info(f'Resource {record.resource_id} changed on {CHAIN_NAMES[bridge.chain_id]}, '
+                        f'dropping its cached metadata')
+            current_state.resources.invalidate(bridge.chain_id, record.resource_id)
+        else:
+            record.checked_at = now
+            current_state.resources.put(record)
+
+
+def read_token_amounts(current_state: State, bridge: Bridge, resources: List[ResourceRecord],
+                       block_identifier: Optional[int] = None) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Read the handler balance and total supply of every token in ``resources`` in as few requests as possible, all
+    pinned to the same block so the amounts form a consistent snapshot of the chain
+
+    Returns
+    -------
+    Tuple[List[Tuple[int, int]], int]
+        A (handler balance, total supply) pair per resource, and the block they were read at
+    """
+    web3 = bridge.contract.web3
+    batch_size = int(current_state.config['monitor'].get('batch_size', DEFAULT_BATCH_SIZE))
+
+    if block_identifier is None:
+        block_identifier = web3.eth.block_number
+
+    functions = []
+    for r in resources:
+        token = _token_contract(web3, r.token_address, r.abi_variant)
+        functions.append(token.functions.balanceOf(r.handler_address))
+        functions.append(token.functions.totalSupply())
+
+    results = batch_call(web3, functions, block_identifier=block_identifier,
+                         multicall=bridge.multicall_contract(), batch_size=batch_size)
+
+    return list(zip(results[0::2], results[1::2])), block_identifier
+
+
+def _erc20_deposit_amount(data: bytes) -> Optional[int]:
+    # ERC20 deposit data is the amount followed by the recipient length and the recipient, each 32 byte aligned
+    if len(data) < 64:
+        return None
+    return int.from_bytes(data[:32], 'big')
+
+
+def _scale_amount(amount: int, from_decimals: int, to_decimals: int) -> int:
+    if to_decimals >= from_decimals:
+        return amount * 10 ** (to_decimals - from_decimals)
+    return amount // 10 ** (from_decimals - to_decimals)
+
+
+def find_in_flight_deposits(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge,
+                            origin_block: int, destination_block: int) -> List[InFlightDeposit]:
+    """
+    The most recent ``imbalance_in_flight_nonces`` deposits made on ``origin_bridge`` up to ``origin_block`` whose
+    proposal was not executed (or cancelled) on ``destination_bridge`` by ``destination_block``. Their tokens are
+    locked or burned on the origin chain but not yet released or minted on the destination chain, which shows up as
+    a temporary imbalance. Only deposits of resources handled by the ERC20 handler of ``origin_bridge`` are
+    returned, their amounts are in the decimals of the origin token
+    """
+    window = int(current_state.config['monitor'].get('imbalance_in_flight_nonces', 50))
+    batch_size = int(current_state.config['monitor'].get('batch_size', DEFAULT_BATCH_SIZE))
+
+    if window <= 0:
+        return []
+
+    origin_web3 = origin_bridge.contract.web3
+    destination_web3 = destination_bridge.contract.web3
+
+    deposit_count = origin_bridge.contract.functions._depositCounts(destination_bridge.chain_id).call(
+        block_identifier=origin_block)
+    nonces = list(range(max(1, deposit_count - window + 1), deposit_count + 1))
+
+    if len(nonces) == 0:
+        return []
+
+    records = batch_call(origin_web3, [
+        origin_bridge.contract.functions._depositRecords(nonce, destination_bridge.chain_id) for nonce in nonces
+    ], block_identifier=origin_block, multicall=origin_bridge.multicall_contract(), batch_size=batch_size)
+
+    hashes = [Web3.solidityKeccak(['address', 'bytes'], [destination_bridge.handler, record]) for record in records]
+
+    raw_proposals = batch_call(destination_web3, [
+        destination_bridge.contract.functions.getProposal(origin_bridge.chain_id, nonce, hash.hex())
+        for nonce, hash in zip(nonces, hashes)
+    ], block_identifier=destination_block, multicall=destination_bridge.multicall_contract(),
+        batch_size=batch_size)
+
+    in_flight = []
+    for nonce, record, raw_proposal in zip(nonces, records, raw_proposals):
+        status = ProposalStatus(raw_proposal[4])
+        if status in (ProposalStatus.Executed, ProposalStatus.Cancelled):
+            continue
+
+        # A deposit nobody voted on yet has an empty proposal, its resource ID only comes with the Deposit event
+        resource_id = HexBytes(raw_proposal[0])
+        if resource_id == HexBytes(EMPTY_BYTES32) and current_state.deposits is not None:
+            deposit = current_state.deposits.lookup(origin_bridge.chain_id, destination_bridge.chain_id, nonce)
+            if deposit is not None:
+                resource_id = deposit.resource_id
+
+        if resource_id == HexBytes(EMPTY_BYTES32):
+            continue
+
+        # Only the deposit data of the ERC20 handler starts with an amount
+        resource = resolve_resource(current_state, origin_bridge, resource_id.hex())
+        if resource is None or resource.handler_address.lower() != origin_bridge.handler.lower():
+            continue
+
+        amount = _erc20_deposit_amount(record)
+        if amount is None:
+            continue
+
+        in_flight.append(InFlightDeposit(
+            origin_chain_id=origin_bridge.chain_id,
+            destination_chain_id=destination_bridge.chain_id,
+            deposit_nonce=nonce,
+            resource_id=resource_id.hex(),
+            amount=amount,
+            decimals=resource.decimals,
+            status=status,
+        ))
+
+    return in_flight
+
+
+def _snapshot_block(current_state: State, bridge: Bridge) -> int:
+    confirmations = int(current_state.config['monitor'].get('imbalance_confirmations', 0))
+    return max(0, bridge.contract.web3.eth.block_number - confirmations)
+
+
+def check_for_imbalances(current_state: State):
     tolerance_config_file = Path('imbalance.json')
     if tolerance_config_file.exists():
         with open(str(tolerance_config_file.absolute()), mode='r') as f:
@@ -559,10 +1477,13 @@ def check_for_imbalances(current_state: State):
     else:
         tolerances = {}
 
-    eth_web3 = current_state.eth_bridge.contract.web3
-    ava_web3 = current_state.ava_bridge.contract.web3
-    for resource_id in current_state.monitor.resource_ids:
-        if resource_id == HexBytes(EMPTY_BYTES32).hex()[2:]:
+    revalidate_resources(current_state, current_state.eth_bridge)
+    revalidate_resources(current_state, current_state.ava_bridge)
+
+    pairs = []
+    # In async mode new resource IDs are saved on another thread while this check runs
+    for resource_id in list(current_state.monitor.resource_ids):
+        if HexBytes(resource_id) == HexBytes(EMPTY_BYTES32):
             continue
 
         tolerance = tolerances.get(resource_id, 0)
@@ -571,93 +1492,471 @@ def check_for_imbalances(current_state: State):
         if tolerance == -1:
             continue  # Ignore this resource
 
-        eth_handler_address = current_state.eth_bridge.contract.functions._resourceIDToHandlerAddress(resource_id).call()
-        ava_handler_address = current_state.ava_bridge.contract.functions._resourceIDToHandlerAddress(resource_id).call()
+        eth_resource = resolve_resource(current_state, current_state.eth_bridge, resource_id)
+        ava_resource = resolve_resource(current_state, current_state.ava_bridge, resource_id)
 
-        if eth_handler_address != ZERO_ADDRESS and ava_handler_address != ZERO_ADDRESS:
-            eth_handler = eth_web3.eth.contract(address=eth_handler_address, abi=handler_abi)
-            ava_handler = ava_web3.eth.contract(address=ava_handler_address, abi=handler_abi)
+        if eth_resource is not None and ava_resource is not None:
+            pairs.append((resource_id, tolerance, eth_resource, ava_resource))
+        else:
+            log_alert(f'Got zero address for resourceId {resource_id}', AlertType.Internal)
 
-            eth_token_address = eth_handler.functions._resourceIDToTokenContractAddress(resource_id).call()
-            ava_token_address = ava_handler.functions._resourceIDToTokenContractAddress(resource_id).call()
+    if len(pairs) == 0:
+        return
 
-            eth_token = eth_web3.eth.contract(address=eth_token_address, abi=erc20_abi)
-            ava_token = ava_web3.eth.contract(address=ava_token_address, abi=erc20_abi)
+    eth_bridge = current_state.eth_bridge
+    ava_bridge = current_state.ava_bridge
+
+    # Every read of a chain is pinned to the same block, so the comparison is between two consistent snapshots
+    eth_block = _snapshot_block(current_state, eth_bridge)
+    ava_block = _snapshot_block(current_state, ava_bridge)
+
+    eth_amounts, _ = read_token_amounts(current_state, eth_bridge, [p[2] for p in pairs], eth_block)
+    ava_amounts, _ = read_token_amounts(current_state, ava_bridge, [p[3] for p in pairs], ava_block)
+
+    in_flight: Dict[str, List[InFlightDeposit]] = {}
+    for deposit in find_in_flight_deposits(current_state, eth_bridge, ava_bridge, eth_block, ava_block) + \
+            find_in_flight_deposits(current_state, ava_bridge, eth_bridge, ava_block, eth_block):
+        in_flight.setdefault(deposit.resource_id, []).append(deposit)
+
+    for (resource_id, tolerance, eth_resource, ava_resource), (eth_handler_balance, eth_supply), \
+            (ava_handler_balance, ava_supply) in zip(pairs, eth_amounts, ava_amounts):
+        eth_balance = eth_handler_balance
+        ava_balance = ava_supply
+
+        if eth_balance == 0 and ava_balance == 0:
+            continue
+
+        if eth_balance == 0:
+            eth_balance = eth_supply
+            ava_balance = ava_handler_balance
+
+        # Amounts are compared in the decimals of the Ethereum token, the Avalanche token may use other decimals
+        normalized_eth_balance = eth_balance
+        normalized_ava_balance = _scale_amount(ava_balance, ava_resource.decimals, eth_resource.decimals)
+
+        # Tokens are locked on the chain where they are native and minted on the other one
+        locked_balance, minted_balance = normalized_eth_balance, normalized_ava_balance
+        if eth_handler_balance == 0:
+            locked_balance, minted_balance = normalized_ava_balance, normalized_eth_balance
+
+        # Deposits in either direction are locked or burned before they are minted or released, so until their
+        # proposals execute they add to the locked side of the comparison
+        resource_in_flight = in_flight.get(HexBytes(resource_id).hex(), [])
+        in_flight_amount = sum(_scale_amount(d.amount, d.decimals, eth_resource.decimals) for d in resource_in_flight)
+        unexplained = locked_balance - minted_balance - in_flight_amount
+
+        if abs(unexplained) > tolerance:
+            difference = abs(normalized_eth_balance - normalized_ava_balance)
+
+            data = {
+                'resource': resource_id,
+                'raw_difference': difference,
+                'difference': difference / (10**eth_resource.decimals),
+                'raw_unexplained_difference': unexplained,
+                'unexplained_difference': unexplained / (10**eth_resource.decimals),
+                'blocks': {
+                    'eth': eth_block,
+                    'ava': ava_block,
+                },
+                'in_flight': {
+                    'raw_amount': in_flight_amount,
+                    'amount': in_flight_amount / (10**eth_resource.decimals),
+                    'deposits': [d.as_dict() for d in resource_in_flight],
+                },
+                'eth': {
+                    'name': eth_resource.name,
+                    'symbol': eth_resource.symbol,
+                    'decimals': eth_resource.decimals,
+                    'balance': eth_balance / (10**eth_resource.decimals),
+                    'raw_balance': eth_balance,
+                    'token': eth_resource.token_address,
+                },
+                'ava': {
+                    'name': ava_resource.name,
+                    'symbol': ava_resource.symbol,
+                    'decimals': ava_resource.decimals,
+                    'balance': ava_balance / (10**ava_resource.decimals),
+                    'raw_balance': ava_balance,
+                    'token': ava_resource.token_address,
+                }
+            }
+
+            alert_type = AlertType.EthImbalance
+            if normalized_ava_balance > normalized_eth_balance:
+                alert_type = AlertType.AvaxImbalance
+
+            log_alert(f'Token {ava_resource.name} (Ethereum Name: {eth_resource.name}) has imbalance!',
+                      alert_type, data)
+
+
+async def _in_thread(executor: Executor, func: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+async def _timed_in_thread(stage: str, executor: Executor, func: Callable, *args, **kwargs) -> Any:
+    with metrics.time_stage(stage):
+        return await _in_thread(executor, func, *args, **kwargs)
 
-            try:
-                eth_name = eth_token.functions.name().call()
-            except OverflowError as e:
-                try:
-                    eth_token = eth_web3.eth.contract(address=eth_token_address, abi=erc20_nonstandard_abi)
-                    eth_name = eth_token.functions.name().call()
-                except Exception as e:
-                    logger.warning(f"Could not decode token name for Ethereum token contract {eth_token_address}")
-                    logger.error(e)
-                    eth_name = "~Unknown~"
 
+async def sync_chain(current_state: State, origin_bridge: Bridge, executor: Executor):
+    """
+    The stages of the pipeline of ``origin_bridge`` that run before new proposals are fetched: the ProposalVote
+    alerts and the Deposit index sync
+    """
+    logger = logging.getLogger('WATCHER')
+
+    chain_name = CHAIN_NAMES[origin_bridge.chain_id]
+
+    try:
+        logger.debug(f"Checking {chain_name} ProposalVote event filters")
+        await _timed_in_thread('vote_events', executor, check_chain_vote_events, current_state, origin_bridge)
+    except Exception as e:
+        logger.error(f"Failed to grab {chain_name} ProposalVote event filters")
+        logger.exception(e)
+
+    logger.debug(f"Syncing {chain_name} Deposit index")
+    await _timed_in_thread('sync_deposit_index', executor, sync_chain_deposit_index, current_state, origin_bridge)
+
+
+async def chain_pipeline(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge,
+                         new_proposals: List[Proposal], executor: Executor):
+    """
+    Run every check that concerns proposals originating on ``origin_bridge`` once ``new_proposals`` were fetched,
+    in the same order as the synchronous loop
+    """
+    proposals = {
+        str(current_state.eth_bridge.chain_id): [],
+        str(current_state.ava_bridge.chain_id): [],
+    }
+    proposals[str(origin_bridge.chain_id)] = new_proposals
+
+    with metrics.time_stage('watch_new_proposals'):
+        expired_proposals(current_state, proposals)
+        watch_active_proposals(current_state, proposals)
+        watch_passed_proposals(current_state, proposals)
+
+    complete_new_proposals(current_state, proposals)
+
+    if tracks_proposal_events(current_state):
+        await _timed_in_thread('proposal_events', executor, track_chain_proposal_events, current_state,
+                               origin_bridge, destination_bridge)
+
+    await _timed_in_thread('check_active_proposals', executor, check_chain_active_proposals, current_state,
+                           origin_bridge, destination_bridge)
+    await _timed_in_thread('check_passed_proposals', executor, check_chain_passed_proposals, current_state,
+                           origin_bridge, destination_bridge)
+
+
+async def run_async(state: State, sleep_time: int):
+    """
+    The asyncio flavour of the monitor loop. The Ethereum and Avalanche pipelines and the imbalance check run
+    concurrently, so a loop takes as long as its slowest stage instead of the sum of all stages. New proposals of
+    both directions are fetched in one step between the two halves of the pipelines, so they share the nonce budget
+    and the proposal workers
+    """
+    logger = logging.getLogger('WATCHER')
+
+    async_workers = int(state.config['monitor'].get('async_workers', 8))
+
+    eth_chain_id = str(state.eth_bridge.chain_id)
+    ava_chain_id = str(state.ava_bridge.chain_id)
+
+    with ThreadPoolExecutor(max_workers=async_workers) as executor:
+        while True:
             try:
-                ava_name = ava_token.functions.name().call()
-            except OverflowError as e:
-                try:
-                    ava_token = ava_web3.eth.contract(address=ava_token_address, abi=erc20_nonstandard_abi)
-                    ava_name = ava_token.functions.name().call()
-                except Exception as e:
-                    logger.warning(f"Could not decode token name for Avalanche token contract {ava_token_address}")
-                    logger.error(e)
-                    ava_name = "~Unknown~"
-
-            eth_balance = eth_token.functions.balanceOf(eth_handler_address).call()
-            ava_balance = ava_token.functions.totalSupply().call()
-
-            if eth_balance == 0 and ava_balance == 0:
+                with metrics.time_stage('loop'):
+                    state.proposal_cache.clear()
+
+                    imbalances = asyncio.ensure_future(_timed_in_thread('check_for_imbalances', executor,
+                                                                        check_for_imbalances, state))
+
+                    errors = await asyncio.gather(
+                        sync_chain(state, state.eth_bridge, executor),
+                        sync_chain(state, state.ava_bridge, executor),
+                        return_exceptions=True
+                    )
+
+                    try:
+                        new_proposals = await _timed_in_thread('find_new_proposals', executor,
+                                                               find_all_new_proposals, state)
+                    except Exception as e:
+                        errors.append(e)
+                        new_proposals = {eth_chain_id: [], ava_chain_id: []}
+
+                    logger.debug(f"Got {len(new_proposals[eth_chain_id])} new Ethereum proposals and {len(new_proposals[ava_chain_id])} new Avalanche proposals")
+
+                    errors += await asyncio.gather(
+                        chain_pipeline(state, state.eth_bridge, state.ava_bridge, new_proposals[eth_chain_id],
+                                       executor),
+                        chain_pipeline(state, state.ava_bridge, state.eth_bridge, new_proposals[ava_chain_id],
+                                       executor),
+                        imbalances,
+                        return_exceptions=True
+                    )
+
+                    logger.debug("Saving current state")
+
+                    with metrics.time_stage('save'):
+                        state.monitor.save()
+
+                    for error in errors:
+                        if isinstance(error, BaseException):
+                            raise error
+
+                logger.debug(f"Restarting loop in {sleep_time} seconds")
+
+                await asyncio.sleep(sleep_time)
+            except Exception as e:
+                logger.error(e)
+                logger.error(f"Swallowing exception, sleeping for {sleep_time} seconds before trying again")
+                await asyncio.sleep(sleep_time)
                 continue
 
-            if eth_balance == 0:
-                eth_balance = eth_token.functions.totalSupply().call()
-                ava_balance = ava_token.functions.balanceOf(ava_handler_address).call()
-
-            if abs(eth_balance - ava_balance) > tolerance:
-                difference = max(eth_balance, ava_balance) - min(eth_balance, ava_balance)
-
-                eth_symbol = eth_token.functions.symbol().call()
-                ava_symbol = ava_token.functions.symbol().call()
-
-                eth_decimals = eth_token.functions.decimals().call()
-                ava_decimals = ava_token.functions.decimals().call()
-
-                data = {
-                    'resource': resource_id,
-                    'raw_difference': difference,
-                    'difference': difference / (10**eth_decimals),
-                    'eth': {
-                        'name': eth_name,
-                        'symbol': eth_symbol,
-                        'decimals': eth_decimals,
-                        'balance': eth_balance / (10**eth_decimals),
-                        'raw_balance': eth_balance,
-                        'token': eth_token_address,
-                    },
-                    'ava': {
-                        'name': ava_name,
-                        'symbol': ava_symbol,
-                        'decimals': ava_decimals,
-                        'balance': ava_balance / (10**ava_decimals),
-                        'raw_balance': ava_balance,
-                        'token': ava_token_address,
-                    }
-                }
 
-                alert_type = AlertType.EthImbalance
-                if ava_balance > eth_balance:
-                    alert_type = AlertType.AvaxImbalance
+def discover_chain_proposals(current_state: State, origin_bridge: Bridge, destination_bridge: Bridge):
+    """
+    Pick up the proposals of the newest unhandled deposits made on ``origin_bridge`` and start watching them, the per-chain equivalent of the discovery stage of the polling loop
+    """
+    sync_chain_deposit_index(current_state, origin_bridge)
 
-                log_alert(f'Token {ava_name} (Ethereum Name: {eth_name}) has imbalance!', alert_type, data)
-        else:
-            log_alert(f'Got zero address for resourceId {resource_id}', AlertType.Internal)
+    new_proposals = find_new_proposals(current_state, origin_bridge, destination_bridge)
+
+    proposals = {
+        str(current_state.eth_bridge.chain_id): [],
+        str(current_state.ava_bridge.chain_id): [],
+    }
+    proposals[str(origin_bridge.chain_id)] = new_proposals
+
+    expired_proposals(current_state, proposals)
+    watch_active_proposals(current_state, proposals)
+    watch_passed_proposals(current_state, proposals)
+
+    complete_new_proposals(current_state, proposals)
+    save_resource_ids(current_state, proposals)
+
+
+def _event_topic(event: Type[ContractEvent]) -> str:
+    return Web3.toHex(event_abi_to_log_topic(event().abi))
+
+
+async def subscribe_chain(current_state: State, bridge: Bridge, other_bridge: Bridge, ws_url: str,
+                          executor: Executor, lock: asyncio.Lock):
+    """
+    Follow ``bridge`` over a WebSocket subscription and run only the checks affected by each log: a Deposit
+    triggers proposal discovery, a ProposalEvent updates the watched proposals and a ProposalVote raises its alert.
+    Notifications only trigger the checks, which read the logs through getLogs from their persisted cursors, so a
+    log is never handled twice and a cursor only moves once every log before it was handled. Every new head runs
+    the vote and ProposalEvent scans as well, which picks up logs whose handling failed or whose notification was
+    missed
+    """
+    logger = logging.getLogger('WATCHER')
+
+    chain_name = CHAIN_NAMES[bridge.chain_id]
+    events = bridge.contract.events
+    handlers = {
+        _event_topic(events.Deposit): events.Deposit,
+        _event_topic(events.ProposalEvent): events.ProposalEvent,
+        _event_topic(events.ProposalVote): events.ProposalVote,
+    }
+
+    # The first indexed argument of all three events is the other chain: the deposit destination or proposal origin
+    other_chain_topic = Web3.toHex(other_bridge.chain_id.to_bytes(32, 'big'))
+
+    subscriptions = [
+        ['newHeads'],
+        ['logs', {'address': bridge.contract.address, 'topics': [list(handlers), other_chain_topic]}],
+    ]
+
+    async def run(stage: str, func: Callable, *args):
+        async with lock:
+            current_state.proposal_cache.clear()
+            await _timed_in_thread(stage, executor, func, *args)
+            await _timed_in_thread('save', executor, current_state.monitor.save)
+
+    def backfill():
+        logger.debug(f'Backfilling {chain_name} logs')
+
+        check_chain_vote_events(current_state, bridge)
+        discover_chain_proposals(current_state, bridge, other_bridge)
+        track_chain_proposal_events(current_state, other_bridge, bridge)
+
+    async def on_connect():
+        await run('backfill', backfill)
+
+    def catch_up():
+        check_chain_vote_events(current_state, bridge)
+        track_chain_proposal_events(current_state, other_bridge, bridge)
+
+    checks = {
+        'Deposit': partial(discover_chain_proposals, current_state, bridge, other_bridge),
+        'ProposalEvent': partial(track_chain_proposal_events, current_state, other_bridge, bridge),
+        'ProposalVote': partial(check_chain_vote_events, current_state, bridge),
+    }
+
+    async def on_notification(index: int, result: Any):
+        try:
+            if index == 0:
+                # The scans move their cursors only after handling every log up to the new head
+                await run('new_head', catch_up)
+                return
+
+            if result.get('removed', False):
+                logger.warning(f'{chain_name} log removed by a reorg: {result}')
+                return
+
+            log = format_log(result)
+            event = handlers[Web3.toHex(log['topics'][0])]().processLog(log)
+
+            logger.debug(f'Got {chain_name} {event.event} log in block {event.blockNumber}')
+
+            await run(f'handle_{event.event}', checks[event.event])
+        except Exception as e:
+            logger.error(f'Failed to handle {chain_name} notification')
+            logger.exception(e)
+
+    await subscribe(ws_url, subscriptions, on_notification, on_connect)
+
+
+async def periodic_checks(current_state: State, sleep_time: int, executor: Executor, lock: asyncio.Lock):
+    """
+    The checks that depend on time rather than on logs: imbalances and proposals that stay active or passed for too
+    long. Run every ``sleep_time`` seconds
+    """
+    logger = logging.getLogger('WATCHER')
+
+    while True:
+        try:
+            async with lock:
+                current_state.proposal_cache.clear()
+
+                await _timed_in_thread('check_for_imbalances', executor, check_for_imbalances, current_state)
+                await _timed_in_thread('check_active_proposals', executor, check_active_proposals, current_state)
+                await _timed_in_thread('check_passed_proposals', executor, check_passed_proposals, current_state)
+                await _timed_in_thread('save', executor, current_state.monitor.save)
+        except Exception as e:
+            logger.error(e)
+            logger.error(f"Swallowing exception, sleeping for {sleep_time} seconds before trying again")
+
+        await asyncio.sleep(sleep_time)
+
+
+async def run_subscribed(state: State, sleep_time: int, eth_ws_url: str, ava_ws_url: str):
+    """
+    The push based flavour of the monitor loop. Bridge logs are received over WebSocket subscriptions as soon as
+    they are mined, so alerts arrive within a block instead of within a polling interval
+    """
+    async_workers = int(state.config['monitor'].get('async_workers', 8))
+
+    # Checks mutate the watched proposals, so they never run at the same time
+    lock = asyncio.Lock()
+
+    with ThreadPoolExecutor(max_workers=async_workers) as executor:
+        await asyncio.gather(
+            subscribe_chain(state, state.eth_bridge, state.ava_bridge, eth_ws_url, executor, lock),
+            subscribe_chain(state, state.ava_bridge, state.eth_bridge, ava_ws_url, executor, lock),
+            periodic_checks(state, sleep_time, executor, lock),
+        )
+
+
+def run_loop(state: State):
+    """
+    One pass of the polling monitor loop, every stage is timed
+    """
+    logger = logging.getLogger('WATCHER')
+
+    state.proposal_cache.clear()
+
+    with metrics.time_stage('vote_events'):
+        try:
+            logger.debug("Checking Ethereum ProposalVote event filters")
+            check_chain_vote_events(state, state.eth_bridge)
+        except Exception as e:
+            logger.error("Failed to grab Ethereum ProposalVote event filters")
+            logger.exception(e)
+
+        try:
+            logger.debug("Checking Avalanche ProposalVote event filters")
+            check_chain_vote_events(state, state.ava_bridge)
+        except Exception as e:
+            logger.error("Failed to grab Avalanche ProposalVote event filters")
+            logger.exception(e)
+
+    logger.debug("Syncing Deposit index")
+
+    with metrics.time_stage('sync_deposit_index'):
+        sync_deposit_index(state)
+
+    logger.debug("Scanning for new proposals")
+
+    with metrics.time_stage('find_new_proposals'):
+        new_proposals = find_all_new_proposals(state)
+
+    logger.debug(f"Got {len(new_proposals['1'])} new Ethereum proposals and {len(new_proposals['2'])} new Avalanche proposals")
+
+    logger.debug("Checking for imbalances")
+
+    with metrics.time_stage('check_for_imbalances'):
+        check_for_imbalances(state)
+
+    with metrics.time_stage('watch_new_proposals'):
+        logger.debug("Looking for expired proposals")
+
+        expired_proposals(state, new_proposals)
+
+        logger.debug("Looking for new active proposals")
+
+        watch_active_proposals(state, new_proposals)
+
+        logger.debug("Looking for new passed proposals")
+
+        watch_passed_proposals(state, new_proposals)
+
+        complete_new_proposals(state, new_proposals)
+
+    if tracks_proposal_events(state):
+        logger.debug("Applying ProposalEvent logs")
+
+        with metrics.time_stage('proposal_events'):
+            track_proposal_events(state)
+
+    logger.debug("Checking active proposals")
+
+    with metrics.time_stage('check_active_proposals'):
+        check_active_proposals(state)
+
+    logger.debug("Checking passed proposals")
+
+    with metrics.time_stage('check_passed_proposals'):
+        check_passed_proposals(state)
+
+    logger.debug("Saving current state")
+
+    with metrics.time_stage('save'):
+        state.monitor.save()
+
+
+def parse_monitor_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--async',
+                        dest='use_async',
+                        action='store_true',
+                        help='Run the Ethereum and Avalanche checks concurrently using asyncio')
+
+    parser.add_argument('--subscribe',
+                        dest='use_subscriptions',
+                        action='store_true',
+                        help='React to bridge logs pushed over WebSocket subscriptions instead of polling')
+
+    args, _ = parser.parse_known_args()
+    return args
 
 
 @script('monitor')
 def execute():
+    args = parse_monitor_args()
+
     config_file = Path('config.ini')
     with open(str(config_file.absolute()), mode='r') as f:
         config_data = f.read()
@@ -690,95 +1989,118 @@ def execute():
 
     eth_bridge_address = config['monitor']['eth_bridge_address']
     ava_bridge_address = config['monitor']['ava_bridge_address']
-    eth_rpc_url = config['monitor']['eth_rpc_url']
-    ava_rpc_url = config['monitor']['ava_rpc_url']
+    eth_rpc_urls = endpoint_list(config['monitor']['eth_rpc_url'])
+    ava_rpc_urls = endpoint_list(config['monitor']['ava_rpc_url'])
     sleep_time = int(config['monitor']['sleep_time'])
     eth_chain_id = int(config['monitor']['eth_chain_id'])
     ava_chain_id = int(config['monitor']['ava_chain_id'])
     eth_handler = config['monitor']['eth_handler']
     ava_handler = config['monitor']['ava_handler']
-
-    ava_session = requests.Session()
+    eth_multicall_address = config['monitor'].get('eth_multicall_address') or None
+    ava_multicall_address = config['monitor'].get('ava_multicall_address') or None
+    max_concurrent_requests = int(config['monitor'].get('max_concurrent_requests', 0))
+    eth_requests_per_second = float(config['monitor'].get('eth_requests_per_second') or 0)
+    ava_requests_per_second = float(config['monitor'].get('ava_requests_per_second') or 0)
+    rpc_max_retries = int(config['monitor'].get('rpc_max_retries', 5))
+    rpc_max_retry_delay = float(config['monitor'].get('rpc_max_retry_delay', 30))
+    http_pool_size = int(config['monitor'].get('http_pool_size', DEFAULT_POOL_SIZE))
+    rpc_hedge = config['monitor'].getboolean('rpc_hedge', fallback=False)
+    rpc_max_block_lag = int(config['monitor'].get('rpc_max_block_lag', 5))
+    rpc_height_check_interval = float(config['monitor'].get('rpc_height_check_interval', 30))
+    worker_count = int(config['monitor']['worker_count'])
+    use_child_processes = config['monitor'].getboolean('use_child_processes')
+    use_async = args.use_async or config['monitor'].getboolean('use_async', fallback=False)
+    use_subscriptions = args.use_subscriptions or config['monitor'].getboolean('use_subscriptions', fallback=False)
+    eth_ws_url = config['monitor'].get('eth_ws_url')
+    ava_ws_url = config['monitor'].get('ava_ws_url')
+    metrics_port = int(config['monitor'].get('metrics_port') or 0)
+    metrics_host = config['monitor'].get('metrics_host', '127.0.0.1')
+
+    if metrics_port > 0:
+        logger.debug(f'Serving metrics on {metrics_host}:{metrics_port}')
+        metrics.MetricsServer(metrics_port, metrics_host).start()
+
+    # Limits apply to every endpoint of a chain on its own, each is assumed to be a separate provider plan
+    for rpc_url in eth_rpc_urls + ava_rpc_urls:
+        if max_concurrent_requests > 0:
+            set_concurrency_limit(rpc_url, max_concurrent_requests)
+
+    for rpc_url in eth_rpc_urls:
+        if eth_requests_per_second > 0:
+            set_rate_limit(rpc_url, eth_requests_per_second)
+    for rpc_url in ava_rpc_urls:
+        if ava_requests_per_second > 0:
+            set_rate_limit(rpc_url, ava_requests_per_second)
+    set_retry_policy(RetryPolicy(max_retries=rpc_max_retries, max_delay=rpc_max_retry_delay))
+
+    configure_sessions(http_pool_size)
 
     logger.debug('Connecting to ETH Web3')
-    eth_web3 = Web3(Web3.HTTPProvider(eth_rpc_url))
+    eth_web3 = connect(eth_rpc_urls, hedge=rpc_hedge, max_block_lag=rpc_max_block_lag,
+                       height_check_interval=rpc_height_check_interval)
     logger.debug('Connecting to AVA Web3')
-    ava_web3 = Web3(Web3.HTTPProvider(ava_rpc_url, session=ava_session))
+    ava_web3 = connect(ava_rpc_urls, hedge=rpc_hedge, max_block_lag=rpc_max_block_lag,
+                       height_check_interval=rpc_height_check_interval)
 
     logger.debug('Building contract instances')
     eth_bridge_contract = eth_web3.eth.contract(address=eth_bridge_address, abi=bridge_abi)
     ava_bridge_contract = ava_web3.eth.contract(address=ava_bridge_address, abi=bridge_abi)
 
     logger.debug("Building ETH Bridge Data")
-    eth_bridge = Bridge(contract=eth_bridge_contract, chain_id=eth_chain_id, handler=eth_handler)
+    eth_bridge = Bridge(contract=eth_bridge_contract, chain_id=eth_chain_id, handler=eth_handler,
+                        multicall_address=eth_multicall_address)
 
     logger.debug("Building AVA Bridge Data")
-    ava_bridge = Bridge(contract=ava_bridge_contract, chain_id=ava_chain_id, handler=ava_handler)
-
-    monitor_state = load_or_new_state()
-
-    state = State(monitor=monitor_state, eth_bridge=eth_bridge, ava_bridge=ava_bridge, config=config)
-
-    eth_fromBlock = 'latest'
-    ava_fromBlock = 'latest'
-
-    while True:
-        try:
-            logger.debug("Setting up Proposal Voted Event filter on Ethereum")
-
-            eth_vote_events = eth_bridge.contract.events.ProposalVote.getLogs(fromBlock=eth_fromBlock, toBlock='latest')
-            ava_vote_events = ava_bridge.contract.events.ProposalVote.getLogs(fromBlock=ava_fromBlock, toBlock='latest')
-
-            try:
-                logger.debug("Checking Ethereum ProposalVote event filters")
-                check_vote_event(state, eth_vote_events)
-            except Exception as e:
-                logger.error("Failed to grab Ethereum ProposalVote event filters")
-                logger.exception(e)
-
-            try:
-                logger.debug("Checking Avalanche ProposalVote event filters")
-                check_vote_event(state, ava_vote_events)
-            except Exception as e:
-                logger.error("Failed to grab Avalanche ProposalVote event filters")
-                logger.exception(e)
-
-            eth_fromBlock = eth_web3.eth.block_number
-            ava_fromBlock = ava_web3.eth.block_number
-
-            logger.debug("Scanning for new proposals")
-
-            new_proposals = find_all_new_proposals(state)
-
-            logger.debug(f"Got {len(new_proposals['1'])} new Ethereum proposals and {len(new_proposals['2'])} new Avalanche proposals")
-
-            logger.debug("Checking for imbalances")
-
-            check_for_imbalances(state)
+    ava_bridge = Bridge(contract=ava_bridge_contract, chain_id=ava_chain_id, handler=ava_handler,
+                        multicall_address=ava_multicall_address)
 
-            logger.debug("Looking for expired proposals")
+    state_store_path = config['monitor'].get('state_store', '.state.sqlite')
 
-            expired_proposals(state, new_proposals)
+    logger.debug("Loading monitor state")
+    state_store = StateStore(state_store_path, json_encoder=BytesEncoder) if state_store_path else None
+    monitor_state = load_or_new_state(state_store)
 
-            logger.debug("Looking for new active proposals")
+    logger.debug("Opening Deposit index")
+    deposit_index = DepositIndex(config['monitor'].get('deposit_index', '.deposits.sqlite'))
 
-            watch_active_proposals(state, new_proposals)
+    logger.debug("Opening resource registry")
+    resources = ResourceRegistry(config['monitor'].get('resource_cache', '.resources.sqlite'))
 
-            logger.debug("Looking for new passed proposals")
+    scanner = LogScanner(chunk_size=int(config['monitor'].get('log_chunk_size', 2000)),
+                         max_chunk_size=int(config['monitor'].get('log_max_chunk_size', 100000)),
+                         max_workers=int(config['monitor'].get('log_scan_workers', 1)))
 
-            watch_passed_proposals(state, new_proposals)
+    logger.debug("Starting proposal workers")
+    workers = ProposalWorkers([eth_bridge, ava_bridge], worker_count, use_child_processes, deposit_index)
 
-            logger.debug("Checking active proposals")
+    state = State(monitor=monitor_state, eth_bridge=eth_bridge, ava_bridge=ava_bridge, config=config,
+                  deposits=deposit_index, workers=workers, scanner=scanner, resources=resources)
 
-            check_active_proposals(state)
-
-            logger.debug("Checking passed proposals")
-
-            check_passed_proposals(state)
+    if use_subscriptions or use_async:
+        try:
+            if use_subscriptions:
+                if not eth_ws_url or not ava_ws_url:
+                    raise ValueError('eth_ws_url and ava_ws_url must be set to use subscriptions')
 
-            logger.debug("Saving current state")
+                logger.debug("Running monitor in subscription mode")
+                asyncio.run(run_subscribed(state, sleep_time, eth_ws_url, ava_ws_url))
+            else:
+                logger.debug("Running monitor in async mode")
+                asyncio.run(run_async(state, sleep_time))
+        except KeyboardInterrupt:
+            pass
+        state.monitor.save()
+        workers.close()
+        deposit_index.close()
+        resources.close()
+        if state_store is not None:
+            state_store.close()
+        return
 
-            state.monitor.save()
+    while True:
+        try:
+            with metrics.time_stage('loop'):
+                run_loop(state)
 
             logger.debug(f"Restarting loop in {sleep_time} seconds")
 
@@ -791,3 +2113,8 @@ def execute():
             time.sleep(sleep_time)
             continue
     state.monitor.save()
+    workers.close()
+    deposit_index.close()
+    resources.close()
+    if state_store is not None:
+        state_store.close()
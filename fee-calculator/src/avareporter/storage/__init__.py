@@ -0,0 +1,12 @@
+from avareporter.storage.deposits import DepositIndex, DepositRecord
+from avareporter.storage.resources import ResourceRegistry, ResourceRecord, canonical_resource_id
+from avareporter.storage.state import StateStore
+
+__all__ = [
+    'DepositIndex',
+    'DepositRecord',
+    'ResourceRegistry',
+    'ResourceRecord',
+    'StateStore',
+    'canonical_resource_id',
+]
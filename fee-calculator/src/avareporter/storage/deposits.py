@@ -0,0 +1,246 @@
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Optional, List
+
+from hexbytes import HexBytes
+from web3.contract import Contract
+from web3.types import EventData
+
+from avareporter.rpc import BlockCursor, LogScanner
+from avareporter.rpc.cursor import DEFAULT_TAIL_SIZE
+
+DEFAULT_SYNC_CHUNK_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deposits (
+    origin_chain_id INTEGER NOT NULL,
+    destination_chain_id INTEGER NOT NULL,
+    deposit_nonce INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (origin_chain_id, destination_chain_id, deposit_nonce)
+);
+
+CREATE TABLE IF NOT EXISTS deposit_cursors (
+    origin_chain_id INTEGER PRIMARY KEY,
+    last_block INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS deposit_block_hashes (
+    origin_chain_id INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    PRIMARY KEY (origin_chain_id, block_number)
+);
+"""
+
+
+@dataclass
+class DepositRecord:
+    origin_chain_id: int
+    destination_chain_id: int
+    deposit_nonce: int
+    block_number: int
+    transaction_hash: str
+    resource_id: HexBytes
+    occurrences: int = 1
+
+    @classmethod
+    def from_event(cls, origin_chain_id: int, event: EventData) -> 'DepositRecord':
+        return cls(
+            origin_chain_id=origin_chain_id,
+            destination_chain_id=event.args.destinationChainID,
+            deposit_nonce=event.args.depositNonce,
+            block_number=event.blockNumber,
+            transaction_hash=HexBytes(event.transactionHash).hex(),
+            resource_id=HexBytes(event.args.resourceID),
+        )
+
+
+class DepositIndex:
+    """
+    An on-disk index of every Deposit event emitted by the bridge contracts, keyed by
+    (origin chain, destination chain, deposit nonce). The index is synced incrementally from the last indexed block
+    so the full history only has to be scanned once, after which looking up a deposit is a single primary key read
+    """
+
+    def __init__(self, path: str = '.deposits.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._lock = threading.Lock()
+        self._connect()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def last_block(self, origin_chain_id: int) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute('SELECT last_block FROM deposit_cursors WHERE origin_chain_id = ?',
+                                     (origin_chain_id,)).fetchone()
+
+        return row[0] if row is not None else None
+
+    def cursor(self, origin_chain_id: int) -> Optional[BlockCursor]:
+        """
+        The last indexed block of the origin chain with the hashes of the last indexed blocks, None when nothing has
+        been indexed yet
+        """
+        last_block = self.last_block(origin_chain_id)
+        if last_block is None:
+            return None
+
+        with self._lock:
+            rows = self._conn.execute('SELECT block_number, block_hash FROM deposit_block_hashes '
+                                      'WHERE origin_chain_id = ?', (origin_chain_id,)).fetchall()
+
+        return BlockCursor(block=last_block, hashes={number: block_hash for number, block_hash in rows})
+
+    def lookup(self, origin_chain_id: int, destination_chain_id: int, nonce: int) -> Optional[DepositRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT block_number, transaction_hash, resource_id, occurrences FROM deposits '
+                'WHERE origin_chain_id = ? AND destination_chain_id = ? AND deposit_nonce = ?',
+                (origin_chain_id, destination_chain_id, nonce)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return DepositRecord(
+            origin_chain_id=origin_chain_id,
+            destination_chain_id=destination_chain_id,
+            deposit_nonce=nonce,
+            block_number=row[0],
+            transaction_hash=row[1],
+            resource_id=HexBytes(row[2]),
+            occurrences=row[3],
+        )
+
+    def add(self, records: List[DepositRecord], origin_chain_id: int, last_block: int,
+            block_hash: Optional[str] = None):
+        """
+        Store a batch of deposits and move the origin chain's cursor to ``last_block`` in the same transaction, so
+        an interrupted sync resumes exactly where the last committed batch ended. ``block_hash`` is the hash of
+        ``last_block``, remembered to detect a reorg of the indexed blocks
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT INTO deposits (origin_chain_id, destination_chain_id, deposit_nonce, block_number, '
+                    'transaction_hash, resource_id) VALUES (?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (origin_chain_id, destination_chain_id, deposit_nonce) DO UPDATE SET '
+                    'occurrences = occurrences + 1 WHERE transaction_hash != excluded.transaction_hash',
+                    [(r.origin_chain_id, r.destination_chain_id, r.deposit_nonce, r.block_number,
+                      r.transaction_hash, r.resource_id.hex()) for r in records]
+                )
+                self._conn.execute(
+                    'INSERT INTO deposit_cursors (origin_chain_id, last_block) VALUES (?, ?) '
+                    'ON CONFLICT (origin_chain_id) DO UPDATE SET last_block = excluded.last_block',
+                    (origin_chain_id, last_block)
+                )
+
+                if block_hash is not None:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO deposit_block_hashes (origin_chain_id, block_number, block_hash) '
+                        'VALUES (?, ?, ?)', (origin_chain_id, last_block, HexBytes(block_hash).hex())
+                    )
+                    self._conn.execute(
+                        'DELETE FROM deposit_block_hashes WHERE origin_chain_id = ? AND block_number NOT IN ('
+                        'SELECT block_number FROM deposit_block_hashes WHERE origin_chain_id = ? '
+                        'ORDER BY block_number DESC LIMIT ?)', (origin_chain_id, origin_chain_id, DEFAULT_TAIL_SIZE)
+                    )
+
+    def rewind(self, origin_chain_id: int, last_block: int) -> int:
+        """
+        Drop the deposits indexed after ``last_block`` and move the origin chain's cursor back to it, used when the
+        blocks after it were replaced by a reorg
+
+        Returns
+        -------
+        int
+            The number of deposits dropped
+        """
+        with self._lock:
+            with self._conn:
+                dropped = self._conn.execute('DELETE FROM deposits WHERE origin_chain_id = ? AND block_number > ?',
+                                             (origin_chain_id, last_block)).rowcount
+                self._conn.execute('DELETE FROM deposit_block_hashes WHERE origin_chain_id = ? AND block_number > ?',
+                                   (origin_chain_id, last_block))
+                self._conn.execute('UPDATE deposit_cursors SET last_block = ? WHERE origin_chain_id = ?',
+                                   (last_block, origin_chain_id))
+
+        return dropped
+
+    def sync(self, contract: Contract, origin_chain_id: int, end_block: Optional[int] = None, start_block: int = 0,
+             scanner: Optional[LogScanner] = None, confirmations: int = 0) -> int:
+        """
+        Index all Deposit events emitted by ``contract`` between the last indexed block (or ``start_block`` on the
+        first run) and ``end_block``. When the last indexed blocks were replaced by a reorg, their deposits are
+        dropped and the blocks are indexed again
+
+        Parameters
+        ----------
+        contract
+            The bridge contract on the origin chain
+        origin_chain_id
+            The bridge chain ID of the origin chain
+        end_block
+            The last block to index, defaults to ``confirmations`` blocks behind the latest block
+        start_block
+            The block to start from when nothing has been indexed yet, usually the bridge deployment block
+        scanner
+            The LogScanner used to walk the block range, a default scanner is used when omitted
+        confirmations
+            The number of blocks behind the head left out of the index when ``end_block`` is omitted
+
+        Returns
+        -------
+        int
+            The number of new deposits indexed
+        """
+        logger = logging.getLogger('deposit_index')
+
+        if scanner is None:
+            scanner = LogScanner(chunk_size=DEFAULT_SYNC_CHUNK_SIZE)
+
+        web3 = contract.web3
+
+        cursor = self.cursor(origin_chain_id)
+        if cursor is not None and cursor.rewind(web3):
+            dropped = self.rewind(origin_chain_id, cursor.block)
+            logger.warning(f'Dropped {dropped} reorganized deposits for chain {origin_chain_id} after block '
+                           f'{cursor.block}')
+
+        if end_block is None:
+            end_block = web3.eth.block_number - confirmations
+
+        from_block = start_block if cursor is None else cursor.block + 1
+
+        count = 0
+        for _, to_block, events in scanner.scan(contract.events.Deposit, from_block, end_block):
+            records = [DepositRecord.from_event(origin_chain_id, event) for event in events]
+            self.add(records, origin_chain_id, to_block, web3.eth.get_block(to_block)['hash'])
+
+            count += len(records)
+
+        if count > 0:
+            logger.debug(f'Indexed {count} new deposits for chain {origin_chain_id} up to block {end_block}')
+
+        return count
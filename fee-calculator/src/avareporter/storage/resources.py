@@ -0,0 +1,109 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    chain_id INTEGER NOT NULL,
+    resource_id TEXT NOT NULL,
+    handler_address TEXT NOT NULL,
+    token_address TEXT NOT NULL,
+    abi_variant TEXT NOT NULL,
+    name TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    decimals INTEGER NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (chain_id, resource_id)
+);
+"""
+
+# Entries written before resource IDs were normalised may lack the 0x prefix
+_MIGRATE_RESOURCE_IDS = """
+UPDATE OR REPLACE resources SET resource_id = '0x' || lower(resource_id) WHERE substr(resource_id, 1, 2) != '0x';
+UPDATE OR REPLACE resources SET resource_id = lower(resource_id) WHERE resource_id != lower(resource_id);
+"""
+
+
+def canonical_resource_id(resource_id: str) -> str:
+    """
+    The form resource IDs are stored under: lowercase hex with a 0x prefix
+    """
+    resource_id = resource_id.lower()
+    if resource_id.startswith('0x'):
+        resource_id = resource_id[2:]
+    return '0x' + resource_id
+
+
+@dataclass
+class ResourceRecord:
+    """
+    Everything the monitor needs to know about a bridged token on one chain. ``abi_variant`` is the ERC20 ABI the
+    token could be decoded with (``standard`` or ``nonstandard``) and ``checked_at`` is when the handler and token
+    addresses were last confirmed on chain
+    """
+    chain_id: int
+    resource_id: str
+    handler_address: str
+    token_address: str
+    abi_variant: str
+    name: str
+    symbol: str
+    decimals: int
+    checked_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self.resource_id = canonical_resource_id(self.resource_id)
+
+
+class ResourceRegistry:
+    """
+    An on-disk cache of bridge resource metadata keyed by (chain, resource ID). Resource mappings only change when
+    an admin re-registers a resource, so entries are kept until they are explicitly invalidated. All entries are
+    held in memory, the database only makes them survive restarts. Resource IDs may be passed with or without the
+    0x prefix, they are always looked up in their canonical form
+    """
+
+    def __init__(self, path: str = '.resources.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.executescript(_MIGRATE_RESOURCE_IDS)
+        self._conn.commit()
+
+        rows = self._conn.execute('SELECT chain_id, resource_id, handler_address, token_address, abi_variant, name, '
+                                  'symbol, decimals, checked_at FROM resources').fetchall()
+        self._records: Dict[Tuple[int, str], ResourceRecord] = {
+            (row[0], row[1]): ResourceRecord(*row) for row in rows
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, chain_id: int, resource_id: str) -> Optional[ResourceRecord]:
+        return self._records.get((chain_id, canonical_resource_id(resource_id)))
+
+    def records(self) -> List[ResourceRecord]:
+        return list(self._records.values())
+
+    def put(self, record: ResourceRecord):
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO resources (chain_id, resource_id, handler_address, token_address, '
+                    'abi_variant, name, symbol, decimals, checked_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (record.chain_id, record.resource_id, record.handler_address, record.token_address,
+                     record.abi_variant, record.name, record.symbol, record.decimals, record.checked_at)
+                )
+            self._records[(record.chain_id, record.resource_id)] = record
+
+    def invalidate(self, chain_id: int, resource_id: str):
+        resource_id = canonical_resource_id(resource_id)
+        with self._lock:
+            with self._conn:
+                self._conn.execute('DELETE FROM resources WHERE chain_id = ? AND resource_id = ?',
+                                   (chain_id, resource_id))
+            self._records.pop((chain_id, resource_id), None)
@@ -0,0 +1,144 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS proposals (
+    watch TEXT NOT NULL,
+    origin_chain_id INTEGER NOT NULL,
+    deposit_nonce INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (watch, origin_chain_id, deposit_nonce)
+);
+
+CREATE TABLE IF NOT EXISTS resource_ids (
+    resource_id TEXT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cursors (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS nonce_backlogs (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+# (watch list, origin chain ID, deposit nonce)
+ProposalKey = Tuple[str, int, int]
+
+
+class StateStore:
+    """
+    A transactional SQLite store for the monitor state. Every ``apply`` only writes what changed since the last one,
+    in a single transaction, so a crash leaves either the previous or the new state on disk. The database runs in
+    WAL mode, so commits are appends to the write-ahead log rather than rewrites of the whole state
+
+    Parameters
+    ----------
+    path
+        The database file
+    json_encoder
+        The encoder used to serialize proposals
+    """
+
+    def __init__(self, path: str = '.state.sqlite', json_encoder: Type[json.JSONEncoder] = json.JSONEncoder):
+        self.path = path
+        self.json_encoder = json_encoder
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute('SELECT EXISTS (SELECT 1 FROM counters)').fetchone()
+
+        return row[0] == 0
+
+    def load(self) -> dict:
+        """
+        Read the whole state, in the same layout as the JSON state file
+
+        Returns
+        -------
+        dict
+            The ``active_proposals`` and ``passed_proposals`` (proposal dicts per origin chain ID string),
+            ``resource_ids``, the block ``cursors``, the ``nonce_backlogs`` and every counter
+        """
+        with self._lock:
+            proposals = self._conn.execute(
+                'SELECT watch, origin_chain_id, data FROM proposals ORDER BY deposit_nonce').fetchall()
+            resource_ids = self._conn.execute('SELECT resource_id FROM resource_ids').fetchall()
+            counters = self._conn.execute('SELECT name, value FROM counters').fetchall()
+            cursors = self._conn.execute('SELECT name, data FROM cursors').fetchall()
+            nonce_backlogs = self._conn.execute('SELECT name, data FROM nonce_backlogs').fetchall()
+
+        data = {
+            'active_proposals': {},
+            'passed_proposals': {},
+            'resource_ids': [row[0] for row in resource_ids],
+            'cursors': {name: json.loads(cursor) for name, cursor in cursors},
+            'nonce_backlogs': {name: json.loads(backlog) for name, backlog in nonce_backlogs},
+        }
+
+        for watch, origin_chain_id, proposal in proposals:
+            data[f'{watch}_proposals'].setdefault(str(origin_chain_id), []).append(json.loads(proposal))
+
+        data.update(counters)
+
+        return data
+
+    def apply(self, upserts: Iterable[Tuple[ProposalKey, dict]] = (), deletes: Iterable[ProposalKey] = (),
+              resource_ids: Iterable[str] = (), counters: Optional[Dict[str, int]] = None,
+              cursors: Optional[Dict[str, dict]] = None, nonce_backlogs: Optional[Dict[str, dict]] = None):
+        """
+        Persist a set of changes in a single transaction
+
+        Parameters
+        ----------
+        upserts
+            The proposals to insert or replace, with their key
+        deletes
+            The keys of the proposals that are no longer watched
+        resource_ids
+            New resource IDs
+        counters
+            Counters to set, e.g. the deposit counts
+        cursors
+            Block cursors to set, as dicts
+        nonce_backlogs
+            Deposit nonce backlogs to set, as dicts
+        """
+        upsert_rows: List[tuple] = [(key[0], key[1], key[2], json.dumps(data, cls=self.json_encoder))
+                                    for key, data in upserts]
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany('DELETE FROM proposals WHERE watch = ? AND origin_chain_id = ? '
+                                       'AND deposit_nonce = ?', list(deletes))
+                self._conn.executemany('INSERT OR REPLACE INTO proposals (watch, origin_chain_id, deposit_nonce, '
+                                       'data) VALUES (?, ?, ?, ?)', upsert_rows)
+                self._conn.executemany('INSERT OR IGNORE INTO resource_ids (resource_id) VALUES (?)',
+                                       [(r,) for r in resource_ids])
+                self._conn.executemany('INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)',
+                                       list((counters or {}).items()))
+                self._conn.executemany('INSERT OR REPLACE INTO cursors (name, data) VALUES (?, ?)',
+                                       [(name, json.dumps(cursor)) for name, cursor in (cursors or {}).items()])
+                self._conn.executemany('INSERT OR REPLACE INTO nonce_backlogs (name, data) VALUES (?, ?)',
+                                       [(name, json.dumps(backlog))
+                                        for name, backlog in (nonce_backlogs or {}).items()])
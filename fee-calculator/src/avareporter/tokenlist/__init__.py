@@ -1,9 +1,9 @@
-import requests
+from avareporter.utils.http import shared_session
 from avareporter.tokenlist.models import TokenList, TokenReuslt, Token, AllTokenResults
 
 
 def token_list_from(url: str) -> TokenList:
-    resp = requests.get(url)
+    resp = shared_session().get(url)
     data = resp.json()
 
     return TokenList(**data)
\ No newline at end of file
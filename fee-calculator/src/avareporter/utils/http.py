@@ -0,0 +1,71 @@
+import os
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept open per host, should cover the number of threads sending requests to the same host
+DEFAULT_POOL_SIZE = 32
+# Hosts a session keeps a connection pool for
+DEFAULT_POOL_HOSTS = 16
+# Seconds to wait for a response, the web3 default
+DEFAULT_TIMEOUT = 10
+
+_pool_size = DEFAULT_POOL_SIZE
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def new_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    A session keeping up to ``pool_size`` connections alive per host, so requests reuse an open TCP+TLS connection
+    instead of paying the handshake again
+    """
+    pool_size = pool_size or _pool_size
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_HOSTS, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def configure_sessions(pool_size: int = DEFAULT_POOL_SIZE):
+    """
+    Set the pool size of the shared session, the current one is replaced on next use
+    """
+    global _pool_size, _session
+
+    with _lock:
+        _pool_size = pool_size
+        _session = None
+
+
+def shared_session() -> requests.Session:
+    """
+    The session shared by every API client and RPC provider of this process. Child processes get their own, open
+    connections are never shared with a forked process
+    """
+    global _session, _session_pid
+
+    with _lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = new_session(_pool_size)
+            _session_pid = os.getpid()
+
+        return _session
+
+
+def post(url: str, data: bytes, **kwargs: Any) -> bytes:
+    """
+    POST ``data`` through the shared session, raising ``requests.exceptions.HTTPError`` on error statuses
+    """
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+
+    response = shared_session().post(url, data=data, **kwargs)
+    response.raise_for_status()
+
+    return response.content
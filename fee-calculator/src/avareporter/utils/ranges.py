@@ -0,0 +1,115 @@
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Generic, Iterator, Tuple, TypeVar
+
+__all__ = [
+    'AdaptiveRangeFetcher'
+]
+
+T = TypeVar('T')
+
+
+class AdaptiveRangeFetcher(Generic[T]):
+    """
+    Fetch a large integer range (usually blocks) by walking it in windows. A window whose fetch fails with an error
+    accepted by ``should_split`` is split in half and retried, while a fully successful round grows the window size
+    again. Up to ``max_workers`` windows are fetched concurrently, results are always yielded in range order
+
+    Parameters
+    ----------
+    fetch
+        Called with the (inclusive) start and end of a window, returns that window's result
+    should_split
+        Called with the exception raised by ``fetch``, returns whether the window should be split and retried
+    chunk_size
+        The initial window size
+    min_chunk_size
+        A failing window of this size or smaller is not split, its error is raised instead
+    max_chunk_size
+        The largest window size to grow to
+    growth
+        The factor the window size grows by after a fully successful round
+    max_workers
+        The number of windows fetched concurrently
+    """
+
+    def __init__(self, fetch: Callable[[int, int], T], should_split: Callable[[Exception], bool],
+                 chunk_size: int, min_chunk_size: int = 1, max_chunk_size: int = 2 ** 32, growth: float = 2.0,
+                 max_workers: int = 1):
+        self.fetch = fetch
+        self.should_split = should_split
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.growth = growth
+        self.max_workers = max_workers
+
+    def scan(self, start: int, end: int) -> Iterator[Tuple[int, int, T]]:
+        """
+        Fetch the inclusive range [start, end]
+
+        Returns
+        -------
+        Iterator[Tuple[int, int, T]]
+            One (window start, window end, result) tuple per window, in order. Every value of the range is covered
+            by exactly one window
+        """
+        logger = logging.getLogger('range_fetcher')
+
+        cursor = start
+        next_start = start
+        pending = deque()
+        completed: Dict[int, Tuple[int, T]] = {}
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+
+        try:
+            while next_start <= end:
+                windows = []
+                while len(windows) < self.max_workers and (len(pending) > 0 or cursor <= end):
+                    if len(pending) > 0:
+                        windows.append(pending.popleft())
+                    else:
+                        window_end = min(cursor + self.chunk_size - 1, end)
+                        windows.append((cursor, window_end))
+                        cursor = window_end + 1
+
+                if executor is not None:
+                    futures = [executor.submit(self.fetch, window_start, window_end)
+                               for window_start, window_end in windows]
+                else:
+                    futures = None
+
+                failed = []
+                for i, (window_start, window_end) in enumerate(windows):
+                    try:
+                        if futures is not None:
+                            result = futures[i].result()
+                        else:
+                            result = self.fetch(window_start, window_end)
+                        completed[window_start] = (window_end, result)
+                    except Exception as e:
+                        size = window_end - window_start + 1
+                        if size <= self.min_chunk_size or not self.should_split(e):
+                            raise
+
+                        middle = window_start + size // 2 - 1
+                        failed.extend([(window_start, middle), (middle + 1, window_end)])
+
+                        logger.debug(f'Splitting range {window_start}-{window_end} after error: {e!r}')
+
+                if len(failed) > 0:
+                    pending.extendleft(reversed(failed))
+                    self.chunk_size = max(self.min_chunk_size, min(e - s + 1 for s, e in failed))
+                else:
+                    self.chunk_size = min(self.max_chunk_size, max(self.chunk_size + 1,
+                                                                   int(self.chunk_size * self.growth)))
+
+                while next_start in completed:
+                    window_end, result = completed.pop(next_start)
+                    yield next_start, window_end, result
+                    next_start = window_end + 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
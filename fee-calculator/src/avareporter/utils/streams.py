@@ -0,0 +1,76 @@
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+__all__ = [
+    'prefetch'
+]
+
+T = TypeVar('T')
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch(iterable: Iterable[T], depth: int = 2) -> Iterator[T]:
+    """
+    Consume ``iterable`` on a background thread, keeping at most ``depth`` items buffered ahead of the caller. This
+    lets a slow producer (usually paged network requests) run while the previous items are being processed. Errors
+    raised by the producer are re-raised to the caller
+
+    Parameters
+    ----------
+    iterable
+        The items to produce
+    depth
+        The maximum number of items produced but not yet consumed
+
+    Returns
+    -------
+    Iterator[T]
+        The items of ``iterable``, in order
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+
+    def consume() -> Iterator[T]:
+        try:
+            while True:
+                item = buffer.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stopped.set()
+            thread.join()
+
+    # The producer starts right away rather than on the first ``next``, so several streams can be prefetched at once
+    return consume()
@@ -0,0 +1,98 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from avareporter.graphql import iter_transaction_records_by_address, iter_transactions_by_address
+
+ADDRESS = '0x' + 'ab' * 20
+
+
+def _row(block: int, index: int = 0) -> dict:
+    return {
+        'block': str(block),
+        'hash': f'0x{block:060x}{index:04x}',
+        'createdAt': '2021-01-01T00:00:00Z',
+        'nonce': '0',
+        'gasPrice': '225000000000',
+        'gasLimit': '21000',
+        'blockGasUsed': '21000',
+        'blockGasLimit': '8000000',
+        'blockNonce': '0',
+        'blockHash': f'0x{block:064x}',
+        'recipient': ADDRESS,
+        'value': '0',
+        'input': '0x',
+        'toAddr': ADDRESS,
+        'fromAddr': '0x' + 'cd' * 20,
+        'v': '0x0',
+        'r': '0x0',
+        's': '0x0',
+    }
+
+
+class _Response:
+    def __init__(self, data: dict):
+        self._data = data
+
+    def json(self) -> dict:
+        return self._data
+
+
+class FakeExplorer:
+    """
+    Serves ``rows`` like the explorer's ctransactions endpoint. blockEnd is inclusive, windows wider than
+    ``max_window`` blocks are answered without a Transactions field, and ``repeated`` rows are sent twice
+    """
+
+    def __init__(self, rows, max_window=None, repeated=()):
+        self.rows = rows
+        self.max_window = max_window
+        self.repeated = set(repeated)
+        self.requests = []
+
+    def get(self, url: str) -> _Response:
+        query = parse_qs(urlparse(url).query)
+        start = int(query['blockStart'][0])
+        end = int(query['blockEnd'][0])
+        self.requests.append((start, end))
+
+        if self.max_window is not None and end - start + 1 > self.max_window:
+            return _Response({'error': 'range too wide'})
+
+        rows = []
+        for row in self.rows:
+            if start <= int(row['block']) <= end:
+                rows.append(row)
+                if row['hash'] in self.repeated:
+                    rows.append(row)
+
+        return _Response({'Transactions': rows})
+
+
+def test_default_options_stream_the_whole_range():
+    rows = [_row(block) for block in range(100, 200, 7)]
+    session = FakeExplorer(rows)
+
+    pages = list(iter_transactions_by_address(ADDRESS, 100, 199, session=session))
+
+    assert [t.hash for page in pages for t in page] == [row['hash'] for row in rows]
+    # One window covering the whole range, plus the extra block asked for
+    assert session.requests == [(100, 200)]
+
+
+def test_end_block_is_required():
+    with pytest.raises(TypeError):
+        iter_transactions_by_address(ADDRESS, 100)
+
+
+def test_split_windows_yield_every_transaction_once():
+    rows = [_row(block, index) for block in range(100, 164) for index in range(2)]
+    repeated = [rows[10]['hash'], rows[-1]['hash']]
+    session = FakeExplorer(rows, max_window=10, repeated=repeated)
+
+    records = [r for page in iter_transaction_records_by_address(ADDRESS, 100, 163, max_workers=1,
+                                                                 session=session)
+               for r in page]
+
+    assert [r.hash for r in records] == [row['hash'] for row in rows]
+    assert all(100 <= r.block_number <= 163 for r in records)
@@ -0,0 +1,77 @@
+import avareporter.etherscan as es
+from avareporter.etherscan import MAX_RESULTS, TransactionCache, iter_transaction_records_by_account
+
+ADDRESS = '0x' + 'ab' * 20
+
+
+def _row(block: int, index: int = 0) -> dict:
+    return {
+        'blockNumber': str(block),
+        'hash': f'0x{block:060x}{index:04x}',
+        'transactionIndex': str(index),
+        'from': '0x' + 'cd' * 20,
+        'to': ADDRESS,
+        'value': '0',
+        'gas': '21000',
+        'gasUsed': '21000',
+        'input': '0x',
+    }
+
+
+class FakeEtherscan:
+    """
+    Serves ``rows`` like the txlist endpoint, failing like Etherscan does when a page reaches past the result cap
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def __call__(self, params: dict, rate_limit: float) -> dict:
+        start, end = int(params['startblock']), int(params['endblock'])
+        page, offset = params['page'], params['offset']
+        self.requests.append((start, end, page, offset))
+
+        assert page * offset <= MAX_RESULTS, 'Result window is too large'
+
+        rows = [row for row in self.rows if start <= int(row['blockNumber']) <= end]
+        rows = rows[(page - 1) * offset:page * offset]
+        if len(rows) == 0:
+            return {'status': '0', 'message': 'No transactions found', 'result': []}
+        return {'status': '1', 'message': 'OK', 'result': rows}
+
+
+def _hashes(pages) -> list:
+    return [r.hash for page in pages for r in page]
+
+
+def test_unconfirmed_tail_is_refetched_and_not_cached(monkeypatch, tmp_path):
+    rows = [_row(block) for block in range(100, 200, 5)]
+    etherscan = FakeEtherscan(rows)
+    monkeypatch.setattr(es, '_rate_limited_get', etherscan)
+    cache = TransactionCache(str(tmp_path))
+
+    pages = iter_transaction_records_by_account(ADDRESS, 100, 199, cache=cache, confirmed_block=179)
+    assert _hashes(pages) == [row['hash'] for row in rows]
+    assert cache.ranges(ADDRESS) == [(100, 179)]
+
+    # A transaction indexed late in the unconfirmed tail shows up on the next run, without refetching the
+    # confirmed part
+    late = _row(192, 1)
+    etherscan.rows = sorted(rows + [late], key=lambda r: (int(r['blockNumber']), r['hash']))
+    etherscan.requests = []
+
+    pages = iter_transaction_records_by_account(ADDRESS, 100, 199, cache=cache, confirmed_block=179)
+    assert _hashes(pages) == [row['hash'] for row in etherscan.rows]
+    assert [(start, end) for start, end, _, _ in etherscan.requests] == [(180, 199)]
+
+
+def test_pages_stay_within_the_result_cap(monkeypatch):
+    rows = [_row(block) for block in range(12000)]
+    etherscan = FakeEtherscan(rows)
+    monkeypatch.setattr(es, '_rate_limited_get', etherscan)
+
+    pages = iter_transaction_records_by_account(ADDRESS, 0, 11999, page_size=3000)
+
+    assert _hashes(pages) == [row['hash'] for row in rows]
+    assert all(page * offset <= MAX_RESULTS for _, _, page, offset in etherscan.requests)
@@ -0,0 +1,41 @@
+import sqlite3
+
+from avareporter.storage import ResourceRecord, ResourceRegistry
+
+RESOURCE_ID = '00' * 31 + 'ab'
+
+
+def _record(resource_id: str) -> ResourceRecord:
+    return ResourceRecord(chain_id=1, resource_id=resource_id, handler_address='0x' + '11' * 20,
+                          token_address='0x' + '22' * 20, abi_variant='standard', name='Token', symbol='TKN',
+                          decimals=18)
+
+
+def test_prefixed_and_bare_resource_ids_share_an_entry(tmp_path):
+    registry = ResourceRegistry(str(tmp_path / 'resources.sqlite'))
+
+    registry.put(_record(RESOURCE_ID))
+
+    assert registry.get(1, '0x' + RESOURCE_ID.upper()) is registry.get(1, RESOURCE_ID)
+    assert len(registry.records()) == 1
+
+    registry.invalidate(1, '0x' + RESOURCE_ID)
+    assert registry.get(1, RESOURCE_ID) is None
+
+
+def test_entries_without_prefix_are_migrated(tmp_path):
+    path = str(tmp_path / 'resources.sqlite')
+    ResourceRegistry(path).close()
+
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("INSERT INTO resources VALUES (1, ?, '', '', 'standard', 'Token', 'TKN', 18, 0)",
+                     (RESOURCE_ID,))
+    conn.close()
+
+    registry = ResourceRegistry(path)
+    registry.put(_record('0x' + RESOURCE_ID))
+
+    assert [r.resource_id for r in registry.records()] == ['0x' + RESOURCE_ID]
+    registry.close()
+    assert sqlite3.connect(path).execute('SELECT resource_id FROM resources').fetchall() == [('0x' + RESOURCE_ID,)]
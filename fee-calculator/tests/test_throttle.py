@@ -0,0 +1,57 @@
+import pytest
+import requests
+
+from avareporter.bench.chain import build_chain
+from avareporter.bench.server import FakeRPCServer
+from avareporter.rpc import RetryPolicy, connect, retry_policy, set_retry_policy
+
+
+@pytest.fixture
+def no_retries():
+    policy = retry_policy()
+    set_retry_policy(RetryPolicy(max_retries=0))
+    yield
+    set_retry_policy(policy)
+
+
+@pytest.fixture
+def retries():
+    policy = retry_policy()
+    set_retry_policy(RetryPolicy(max_retries=3, base_delay=0.05, max_delay=0.1))
+    yield
+    set_retry_policy(policy)
+
+
+def _hits(server: FakeRPCServer) -> int:
+    stats = server.stats.as_dict()
+    return stats['requests'] + stats['rate_limited']
+
+
+def test_refused_requests_are_not_resent_by_web3(no_retries):
+    with FakeRPCServer(build_chain(1, 1), rate_limit=2) as server:
+        web3 = connect(server.url)
+
+        failures = 0
+        for _ in range(6):
+            try:
+                web3.eth.block_number
+            except requests.exceptions.HTTPError:
+                failures += 1
+
+        assert failures > 0
+        # Every call reaches the server exactly once, nothing retries behind the retry policy
+        assert _hits(server) == 6
+
+
+def test_refused_requests_follow_the_retry_policy(retries):
+    with FakeRPCServer(build_chain(1, 1), rate_limit=2) as server:
+        web3 = connect(server.url)
+
+        for _ in range(4):
+            try:
+                web3.eth.block_number
+            except requests.exceptions.HTTPError:
+                pass
+
+        # At most the first attempt and max_retries retries per call
+        assert _hits(server) <= 4 * (1 + 3)